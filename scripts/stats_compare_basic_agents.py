@@ -11,7 +11,6 @@ import gym
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-from tqdm import tqdm
 
 import social_distancing_sim.agent as agent
 import social_distancing_sim.environment as env
@@ -120,7 +119,8 @@ if __name__ == "__main__":
 
     # Create all Agent, Environments, Sims, and MultiSims. The MultiSim will run the Sim multiple times without
     # visualisations
-    for n_act, agt in np.array(np.meshgrid(n_actions, agents)).T.reshape(-1, 2):
+    for config in sim.grid(n_act=n_actions, agt=agents):
+        n_act, agt = config["n_act"], config["agt"]
         agt_ = agt(actions_per_turn=n_act, name=f"{agt.__name__} - {n_act} actions")
         sim_ = sim.Sim(env_spec=env_spec, agent=agt_, n_steps=125)
 
@@ -128,9 +128,8 @@ if __name__ == "__main__":
             sim.MultiSim(sim_, name="basic agent comparison", n_reps=300, n_jobs=60)
         )
 
-    # Run all the sims. No need to parallelize here as it's done across n reps in MultiSim.run()
-    for ms in tqdm(multi_sims):
-        ms.run()
+    # Run all the sims. Reps from all the MultiSims are run on one pool, so no need to parallelize here.
+    sim.ExperimentScheduler(multi_sims, n_jobs=60).run()
 
     fig = plot_dists(multi_sims, "Overall score")
     plt.show()
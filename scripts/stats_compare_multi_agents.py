@@ -11,7 +11,6 @@ import gym
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
-from tqdm import tqdm
 
 import social_distancing_sim.environment as env
 import social_distancing_sim.sim as sim
@@ -111,9 +110,8 @@ def run_multi_sims():
             sim.MultiSim(sim_, n_jobs=30, name="policy agent comparison", n_reps=300)
         )
 
-    # Run all the sims. No need to parallelize here as it's done across n reps in MultiSim.run()
-    for ms in tqdm(multi_sims):
-        ms.run()
+    # Run all the sims. Reps from all the MultiSims are run on one pool, so no need to parallelize here.
+    sim.ExperimentScheduler(multi_sims, n_jobs=30).run()
 
     return multi_sims
 
@@ -0,0 +1,57 @@
+from functools import partial
+
+import gym
+from reinforcement_learning_keras.agents.components.helpers.virtual_gpu import (
+    VirtualGPU,
+)
+
+from social_distancing_sim.agent.rl_agents.q_learning.actor_learner import (
+    ActorLearnerDQNTrainer,
+)
+from social_distancing_sim.agent.rl_agents.q_learning.dqn_untargeted import (
+    DQNUntargeted,
+)
+from social_distancing_sim.agent.rl_agents.rlk_agent_configs import RLKAgentConfigs
+from social_distancing_sim.environment.gym.wrappers.flatten_obs_wrapper import (
+    FlattenObsWrapper,
+)
+from social_distancing_sim.environment.gym.wrappers.limit_obs_wrapper import (
+    LimitObsWrapper,
+)
+from social_distancing_sim.sim import MultiSim, Sim
+from social_distancing_sim.templates.gym.register import register_template_envs
+from social_distancing_sim.templates.gym.sds_746 import SDS746
+
+if __name__ == "__main__":
+    gpu = VirtualGPU(gpu_memory_limit=2048, gpu_device_id=0)
+    register_template_envs()
+
+    config_dict = RLKAgentConfigs(
+        agent_name="flat_obs_dqn_actor_learner",
+        env_spec="SDS-746-v0",
+        expected_obs_shape=(746 * 6,),
+        env_wrappers=(partial(LimitObsWrapper, output=2), FlattenObsWrapper),
+        n_actions=5,
+        plot_during_training=False,
+    ).build_for_dqn_untargeted()
+    agent = DQNUntargeted(**config_dict)
+
+    # Actors only need the env class and the model's weights, so don't import TensorFlow. The learner (this process)
+    # trains the agent's models in place.
+    trainer = ActorLearnerDQNTrainer.from_agent(
+        agent, env=SDS746, n_actors=6, envs_per_actor=4, n_steps=200
+    )
+    history = trainer.train(n_updates=20000)
+    print(f"Trained on {len(history['episode_rewards'])} episodes")
+
+    # Eval with the NumPy version of the agent, which is cheap to send to the MultiSim workers
+    ms = MultiSim(
+        Sim(
+            env_spec=gym.make("SDS-746-v0").spec,
+            agent=agent.to_numpy(),
+            n_steps=200,
+        ),
+        name="actor learner dqn",
+        n_reps=20,
+    )
+    ms.run()
@@ -1,3 +1,36 @@
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    IsolationArrayAgent as IsolationArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    MaskingArrayAgent as MaskingArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    TreatmentArrayAgent as TreatmentArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    VaccinationArrayAgent as VaccinationArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.policy_array_agents import (
+    DistancingPolicyArrayAgent as DistancingPolicyArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.policy_array_agents import (
+    MaskingPolicyArrayAgent as MaskingPolicyArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.policy_array_agents import (
+    TreatmentPolicyArrayAgent as TreatmentPolicyArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.policy_array_agents import (
+    VaccinationPolicyArrayAgent as VaccinationPolicyArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.targeted_agents import (
+    TargetedIsolationAgent as TargetedIsolationAgent,
+)
+from social_distancing_sim.agent.array_agents.targeted_agents import (
+    TargetedMaskingAgent as TargetedMaskingAgent,
+)
+from social_distancing_sim.agent.array_agents.targeted_agents import (
+    TargetedVaccinationAgent as TargetedVaccinationAgent,
+)
 from social_distancing_sim.agent.basic_agents.dummy_agent import (
     DummyAgent as DummyAgent,
 )
@@ -19,6 +52,10 @@ from social_distancing_sim.agent.basic_agents.vaccination_agent import (
 from social_distancing_sim.agent.multi_agents.multi_agent import (
     MultiAgent as MultiAgent,
 )
+from social_distancing_sim.agent.planning_agents.mcts_agent import (
+    MCTSAgent as MCTSAgent,
+)
+from social_distancing_sim.agent.planning_agents.mpc_agent import MPCAgent as MPCAgent
 from social_distancing_sim.agent.policy_agents.distancing_policy_agent import (
     DistancingPolicyAgent as DistancingPolicyAgent,
 )
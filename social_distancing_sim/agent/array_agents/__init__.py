@@ -0,0 +1 @@
+"""Heuristic agents that select targets from observation arrays, for single envs or batches of envs."""
@@ -0,0 +1,153 @@
+import abc
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
+from social_distancing_sim.environment.status import Status
+
+# Column of each status in the nodes component of the observation, see Status.state
+COLUMNS: Dict[str, int] = {
+    name: i for i, name in enumerate(Status().state_features_names)
+}
+
+
+class ArrayAgentBase(NonLearningAgentBase):
+    """
+    Base for heuristic agents that select targets from the nodes component of the observation, rather than from the
+    observation space's lists of nodes.
+
+    The nodes array is (N, 6) with a boolean column for each status in COLUMNS, for a single env, or (K, N, 6) for a
+    batch of K envs (eg. from VecEnv). Node ids are the row indexes. Subclasses define a boolean mask of potential
+    targets for each of their actions (see ._target_masks), and targets are drawn without replacement from each mask
+    by giving every node a key and keeping the n smallest keys in the mask. Keys are random unless ._priority is
+    overloaded. This is vectorised over envs, so .get_batch_actions selects actions for all K envs at once.
+
+    Each turn, each of the actions_per_turn actions is drawn from the active actions, and given a distinct target, if
+    enough are available. Actions are always active unless timed is True, in which case start_step and end_step apply,
+    as for the policy agents.
+
+    Can be used in place of the list based agents in Sim and MultiSim, with .get_actions. If the state isn't given, or
+    doesn't contain the nodes component (eg. with SummaryObservationWrapper), the nodes array is read from the
+    attached env.
+    """
+
+    timed = False
+
+    @abc.abstractmethod
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        """
+        Boolean masks of potential targets for each available action.
+
+        :param nodes: (K, N, 6) boolean nodes arrays.
+        :return: Dict of (K, N) masks, keyed by action id, in the order of .available_actions.
+        """
+        pass
+
+    def _active(self, steps: np.ndarray) -> np.ndarray:
+        """(K, n available actions) mask of actions active on each env's step."""
+        if not self.timed:
+            return np.ones((len(steps), len(self.available_actions)), dtype=bool)
+
+        start = np.array([self._start_step.get(a, 0) for a in self.available_actions])
+        end = np.array([self._end_step.get(a, np.inf) for a in self.available_actions])
+
+        return (steps[:, None] >= start) & (steps[:, None] <= end)
+
+    def _priority(self, mask: np.ndarray) -> np.ndarray:
+        """(K, N) keys ordering the nodes for selection, lowest first. Random by default."""
+        return self._random_state.uniform(size=mask.shape)
+
+    def _choose(self, mask: np.ndarray, n: int) -> np.ndarray:
+        """Indexes of the n lowest priority nodes in each row of a (K, N) mask. Rows with fewer fill with junk."""
+        if n == 0:
+            return np.zeros((mask.shape[0], 0), dtype=int)
+
+        keys = np.where(mask, self._priority(mask), np.inf)
+        idx = np.argpartition(keys, n - 1, axis=1)[:, 0:n]
+
+        return np.take_along_axis(
+            idx, np.argsort(np.take_along_axis(keys, idx, axis=1), axis=1), axis=1
+        )
+
+    def get_batch_actions(
+        self, nodes: np.ndarray, steps: Optional[np.ndarray] = None
+    ) -> List[Tuple[List[int], List[int]]]:
+        """
+        Select actions and targets for a batch of envs.
+
+        :param nodes: (K, N, 6) nodes arrays, eg. the third component of VecEnv observations.
+        :param steps: (K,) step of each env, used for timed agents. If None, all envs are assumed to be on the agent's
+                      current step, and the agent's step is advanced.
+        :return: List of K ([actions], [targets]) tuples, as accepted by VecEnv.step.
+        """
+        nodes = np.asarray(nodes, dtype=bool)
+        n_envs = nodes.shape[0]
+        if steps is None:
+            steps = np.full(n_envs, self._step)
+            self._step += 1
+        active = self._active(np.asarray(steps))
+
+        # Draw an active action for each of the actions_per_turn slots, and count the slots per action
+        n_available = len(self.available_actions)
+        keys = np.where(
+            active[:, None, :],
+            self._random_state.uniform(
+                size=(n_envs, self.actions_per_turn, n_available)
+            ),
+            np.inf,
+        )
+        slot_actions = keys.argmin(axis=2)
+        counts = (slot_actions[..., None] == np.arange(n_available)).sum(
+            axis=1
+        ) * active
+
+        actions = [[] for _ in range(n_envs)]
+        targets = [[] for _ in range(n_envs)]
+        for a_i, (action, mask) in enumerate(self._target_masks(nodes).items()):
+            n = np.minimum(counts[:, a_i], mask.sum(axis=1))
+            chosen = self._choose(mask, int(n.max(initial=0)))
+            for k in np.flatnonzero(n):
+                actions[k].extend([action] * n[k])
+                targets[k].extend(chosen[k, 0 : n[k]].tolist())
+
+        return list(zip(actions, targets))
+
+    def _nodes(
+        self,
+        state: Union[None, np.ndarray, Sequence] = None,
+    ) -> np.ndarray:
+        if isinstance(state, np.ndarray) and (state.ndim == 2):
+            return state
+        if isinstance(state, Sequence) and (len(state) == 3) and (state[2] is not None):
+            return state[2]
+
+        return self.env.sds_env.observation_space.state_nodes()
+
+    def _select_actions_targets(self) -> Dict[int, int]:
+        ((actions, targets),) = self.get_batch_actions(
+            self._nodes()[None], steps=np.array([self._step])
+        )
+
+        return dict(zip(targets, actions))
+
+    def get_actions(
+        self,
+        state: Union[None, np.ndarray, Sequence] = None,
+        training: bool = False,
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Get next set of actions and targets for a single env and track.
+
+        :param state: Either the (N, 6) nodes array or an observation containing it, otherwise read from the env.
+        """
+        if (self.env is None) and (state is None):
+            raise AttributeError("No env set, set with agent.attach_to_env()")
+
+        ((actions, targets),) = self.get_batch_actions(
+            self._nodes(state)[None], steps=np.array([self._step])
+        )
+        self._step += 1
+
+        return actions, targets
@@ -0,0 +1,61 @@
+from typing import Dict, List
+
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.array_agent_base import (
+    COLUMNS,
+    ArrayAgentBase,
+)
+
+
+class VaccinationArrayAgent(ArrayAgentBase):
+    """Array version of VaccinationAgent, randomly vaccinates clear nodes that aren't immune."""
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [1]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        return {1: nodes[..., COLUMNS["clear"]] & ~nodes[..., COLUMNS["immune"]]}
+
+
+class MaskingArrayAgent(ArrayAgentBase):
+    """Array version of MaskingAgent, randomly provides masks to alive nodes."""
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [5]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        return {5: nodes[..., COLUMNS["alive"]]}
+
+
+class TreatmentArrayAgent(ArrayAgentBase):
+    """Array version of TreatmentAgent, randomly treats infected nodes."""
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [4]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        return {4: nodes[..., COLUMNS["infected"]]}
+
+
+class IsolationArrayAgent(ArrayAgentBase):
+    """
+    Array version of IsolationAgent, either isolates known infected, connected nodes, or reconnects known clear,
+    isolated nodes.
+
+    Unlike IsolationAgent, targets are drawn without replacement, so actions aren't lost to duplicate targets.
+    """
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [2, 3]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        isolated = nodes[..., COLUMNS["isolated"]]
+        return {
+            2: nodes[..., COLUMNS["infected"]] & ~isolated,
+            3: nodes[..., COLUMNS["clear"]] & isolated,
+        }
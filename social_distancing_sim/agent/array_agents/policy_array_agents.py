@@ -0,0 +1,54 @@
+from typing import Dict, List
+
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.array_agent_base import (
+    COLUMNS,
+    ArrayAgentBase,
+)
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    MaskingArrayAgent,
+    TreatmentArrayAgent,
+)
+
+
+class VaccinationPolicyArrayAgent(ArrayAgentBase):
+    """Array version of VaccinationPolicyAgent, vaccinates any clear node during the active period."""
+
+    timed = True
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [1]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        return {1: nodes[..., COLUMNS["clear"]]}
+
+
+class MaskingPolicyArrayAgent(MaskingArrayAgent):
+    """Array version of MaskingPolicyAgent, provides masks to alive nodes during the active period."""
+
+    timed = True
+
+
+class TreatmentPolicyArrayAgent(TreatmentArrayAgent):
+    """Array version of TreatmentPolicyAgent, treats infected nodes during the active period."""
+
+    timed = True
+
+
+class DistancingPolicyArrayAgent(ArrayAgentBase):
+    """
+    Array version of DistancingPolicyAgent, isolates any connected clear node and reconnects any isolated node, during
+    their active periods.
+    """
+
+    timed = True
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [2, 3]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        isolated = nodes[..., COLUMNS["isolated"]]
+        return {2: nodes[..., COLUMNS["clear"]] & ~isolated, 3: isolated}
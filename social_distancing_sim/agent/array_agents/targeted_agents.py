@@ -0,0 +1,74 @@
+from typing import Dict, List
+
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.array_agent_base import (
+    COLUMNS,
+    ArrayAgentBase,
+)
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    VaccinationArrayAgent,
+)
+from social_distancing_sim.environment.centrality import MEASURES
+
+
+class TargetedAgentBase(ArrayAgentBase):
+    """
+    Base for array agents that target the most central nodes first, rather than random nodes.
+
+    Nodes are ranked by the centrality index of the attached env's graph (see Graph.centrality), which is maintained
+    as nodes are isolated and reconnected. Ties are broken randomly. For batches (see .get_batch_actions), every env
+    is ranked by the attached env's graph, which suits batches of envs sharing a fixed graph.
+    """
+
+    def __init__(self, *args, measure: str = "degree", **kwargs) -> None:
+        """
+        :param measure: Centrality measure to rank targets by, one of "degree", "betweenness" or "eigenvector".
+
+        Other args as NonLearningAgentBase.
+        """
+        if measure not in MEASURES:
+            raise ValueError(
+                f"Unknown centrality measure {measure}, use one of {MEASURES}."
+            )
+        self.measure = measure
+        super().__init__(*args, **kwargs)
+
+    def _priority(self, mask: np.ndarray) -> np.ndarray:
+        scores = self.env.sds_env.observation_space.graph.centrality.scores(
+            self.measure
+        )
+        tie_break = self._random_state.uniform(size=mask.shape)
+        order = np.lexsort((tie_break, np.broadcast_to(-scores, mask.shape)), axis=1)
+        ranks = np.empty_like(order)
+        np.put_along_axis(
+            ranks, order, np.broadcast_to(np.arange(mask.shape[1]), mask.shape), axis=1
+        )
+
+        return ranks
+
+
+class TargetedVaccinationAgent(TargetedAgentBase, VaccinationArrayAgent):
+    """Vaccinates the most central clear nodes that aren't immune."""
+
+
+class TargetedMaskingAgent(TargetedAgentBase):
+    """Provides masks to the most central clear nodes that aren't already masked."""
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [5]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        return {5: nodes[..., COLUMNS["clear"]] & ~nodes[..., COLUMNS["masked"]]}
+
+
+class TargetedIsolationAgent(TargetedAgentBase):
+    """Isolates the most central clear nodes that aren't already isolated, to cut the main routes of transmission."""
+
+    @property
+    def available_actions(self) -> List[int]:
+        return [2]
+
+    def _target_masks(self, nodes: np.ndarray) -> Dict[int, np.ndarray]:
+        return {2: nodes[..., COLUMNS["clear"]] & ~nodes[..., COLUMNS["isolated"]]}
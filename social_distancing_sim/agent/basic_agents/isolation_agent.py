@@ -1,5 +1,7 @@
 from typing import Dict, List
 
+import numpy as np
+
 from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
 
 
@@ -11,19 +13,20 @@ class IsolationAgent(NonLearningAgentBase):
         return [2, 3]
 
     @property
-    def available_targets(self) -> Dict[int, List[int]]:
+    def available_targets(self) -> Dict[int, np.ndarray]:
+        obs = self.env.sds_env.observation_space
         return {
-            2: list(
-                set(
-                    self.env.sds_env.observation_space.current_infected_nodes
-                ).difference(self.env.sds_env.observation_space.current_isolated_nodes)
+            2: self._target_pool(
+                "infected_not_isolated",
+                lambda: set(obs.current_infected_nodes).difference(
+                    obs.current_isolated_nodes
+                ),
             ),
-            3: list(
-                set(
-                    self.env.sds_env.observation_space.current_clear_nodes
-                ).intersection(
-                    self.env.sds_env.observation_space.current_isolated_nodes
-                )
+            3: self._target_pool(
+                "clear_isolated",
+                lambda: set(obs.current_clear_nodes).intersection(
+                    obs.current_isolated_nodes
+                ),
             ),
         }
 
@@ -33,9 +36,10 @@ class IsolationAgent(NonLearningAgentBase):
             self.available_actions, replace=True, size=self.actions_per_turn
         )
 
+        available_targets = self.available_targets
         available_actions = {}
         for ac in actions:
-            available_targets_for_this_action = self.available_targets[ac]
+            available_targets_for_this_action = available_targets[ac]
             if len(available_targets_for_this_action) > 0:
                 available_actions.update(
                     {self._random_state.choice(available_targets_for_this_action): ac}
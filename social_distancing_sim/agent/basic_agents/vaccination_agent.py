@@ -1,5 +1,7 @@
 from typing import Dict, List
 
+import numpy as np
+
 from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
 
 
@@ -11,11 +13,11 @@ class VaccinationAgent(NonLearningAgentBase):
         return [1]
 
     @property
-    def available_targets(self) -> List[int]:
-        return list(
-            set(self.env.sds_env.observation_space.current_clear_nodes).difference(
-                self.env.sds_env.observation_space.current_immune_nodes
-            )
+    def available_targets(self) -> np.ndarray:
+        obs = self.env.sds_env.observation_space
+        return self._target_pool(
+            "clear_not_immune",
+            lambda: set(obs.current_clear_nodes).difference(obs.current_immune_nodes),
         )
 
     def _select_actions_targets(self) -> Dict[int, int]:
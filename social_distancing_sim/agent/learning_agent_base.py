@@ -59,6 +59,10 @@ class LearningAgentBase(metaclass=abc.ABCMeta):
 
         return clone
 
+    def reseed(self, seed: Union[None, int]) -> None:
+        """RLK agents manage their own random state, nothing to reseed."""
+        pass
+
     def attach_to_env(
         self, env_or_spec: Union[GymEnv, str, gym.envs.registration.EnvSpec]
     ) -> None:
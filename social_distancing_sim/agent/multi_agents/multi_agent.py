@@ -4,6 +4,7 @@ import gym
 
 from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
 from social_distancing_sim.environment.gym.gym_env import GymEnv
+from social_distancing_sim.environment.seeding import derive_seeds
 
 
 class MultiAgent(NonLearningAgentBase):
@@ -32,6 +33,17 @@ class MultiAgent(NonLearningAgentBase):
         for agt in self.agents:
             agt.attach_to_env(self.env)
 
+    def reset(self):
+        super().reset()
+        for agt in self.agents:
+            agt.reset()
+
+    def reseed(self, seed: Union[None, int]) -> None:
+        """Set a new seed, and derive independent seeds for each of the child agents."""
+        for agt, child_seed in zip(self.agents, derive_seeds(seed, len(self.agents))):
+            agt.seed = child_seed
+        super().reseed(seed)
+
     def _select_actions_targets(self) -> Dict[int, int]:
         """Ask each agent for their actions. They handle n and availability"""
 
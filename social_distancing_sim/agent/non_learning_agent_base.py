@@ -1,6 +1,6 @@
 import abc
 import copy
-from typing import Dict, List, Tuple, Union
+from typing import Callable, Dict, Iterable, List, Tuple, Union
 
 import gym
 import numpy as np
@@ -147,6 +147,25 @@ class NonLearningAgentBase(metaclass=abc.ABCMeta):
         """
         return self.env.sds_env.observation_space.current_alive_nodes
 
+    def _target_pool(self, name: str, build: Callable[[], Iterable[int]]) -> np.ndarray:
+        """
+        Get a pool of potential targets, building it at most once per env step.
+
+        Pools are cached on the env's observation space keyed by env step and name, so agents attached to the same env
+        (eg. the children of a MultiAgent) share them. The cache is cleared at the start of each step.
+
+        :param name: Name of the pool, eg. "clear_not_isolated". Agents using the same name must build the same pool.
+        :param build: Returns the targets, called if the pool isn't cached for this step.
+        """
+        sds_env = self.env.sds_env
+        key = (sds_env._step, name)
+        pool = sds_env.observation_space.target_pools.get(key)
+        if pool is None:
+            pool = np.asarray(list(build()), dtype=int)
+            sds_env.observation_space.target_pools[key] = pool
+
+        return pool
+
     def _check_available_targets(self) -> int:
         """
         Check there are enough available targets to perform requested actions, if not limit n actions.
@@ -210,3 +229,8 @@ class NonLearningAgentBase(metaclass=abc.ABCMeta):
     def reset(self):
         self._step = 0
         self._prepare_random_state()
+
+    def reseed(self, seed: Union[None, int]) -> None:
+        """Set a new seed and reset."""
+        self.seed = seed
+        self.reset()
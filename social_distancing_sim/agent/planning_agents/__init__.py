@@ -0,0 +1 @@
+"""Agents that plan by simulating candidate actions on copies of the environment."""
@@ -0,0 +1,343 @@
+import math
+import pickle
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+
+from social_distancing_sim.agent.array_agents.array_agent_base import ArrayAgentBase
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    TreatmentArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.targeted_agents import (
+    TargetedIsolationAgent,
+    TargetedMaskingAgent,
+    TargetedVaccinationAgent,
+)
+from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
+from social_distancing_sim.agent.planning_agents.mpc_agent import _ROLLOUT_LOGGER
+from social_distancing_sim.environment.environment import Environment
+from social_distancing_sim.environment.seeding import derive_seeds
+
+
+@dataclass
+class _EnvView:
+    """Stands in for a GymEnv around an Environment, for macro agents that read the env (eg. targeted agents)."""
+
+    sds_env: Environment
+
+
+@dataclass
+class _Tree:
+    """
+    Search tree stored in flat arrays. Node 0 is the root, and children[node, macro] is the id of the node reached by
+    applying macro at node, or -1 if it's not expanded yet. Arrays are doubled in size when full.
+    """
+
+    n_macros: int
+    capacity: int = 64
+
+    def __post_init__(self) -> None:
+        self.children = np.full((self.capacity, self.n_macros), -1, dtype=np.int32)
+        self.visits = np.zeros(self.capacity, dtype=np.int64)
+        self.value_sum = np.zeros(self.capacity)
+        self.n_nodes = 1
+
+    def add(self, parent: int, macro: int) -> int:
+        if self.n_nodes == self.capacity:
+            self.capacity *= 2
+            self.children = np.concatenate(
+                (self.children, np.full_like(self.children, -1))
+            )
+            self.visits = np.concatenate((self.visits, np.zeros_like(self.visits)))
+            self.value_sum = np.concatenate(
+                (self.value_sum, np.zeros_like(self.value_sum))
+            )
+
+        node = self.n_nodes
+        self.children[parent, macro] = node
+        self.n_nodes += 1
+
+        return node
+
+    def root_stats(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(n macros,) visits and value sums of the root's children, 0 for unexpanded children."""
+        kids = self.children[0]
+        expanded = kids >= 0
+
+        return (
+            np.where(expanded, self.visits[kids], 0),
+            np.where(expanded, self.value_sum[kids], 0.0),
+        )
+
+    def subtree(self, root: int) -> "_Tree":
+        """Copy of the subtree below root, renumbered breadth first so root becomes node 0."""
+        order = [root]
+        for node in order:
+            order.extend(int(c) for c in self.children[node] if c >= 0)
+
+        new_ids = np.full(self.n_nodes, -1, dtype=np.int32)
+        new_ids[order] = np.arange(len(order))
+        tree = _Tree(self.n_macros, capacity=max(64, 2 * len(order)))
+        children = self.children[order]
+        tree.children[0 : len(order)] = np.where(children >= 0, new_ids[children], -1)
+        tree.visits[0 : len(order)] = self.visits[order]
+        tree.value_sum[0 : len(order)] = self.value_sum[order]
+        tree.n_nodes = len(order)
+
+        return tree
+
+
+def _macro_actions(
+    agent: Optional[ArrayAgentBase], sds_env: Environment
+) -> Tuple[List[int], List[int]]:
+    """Actions and targets of a macro on the env's current observation. None is doing nothing."""
+    if agent is None:
+        return [], []
+
+    agent.env = _EnvView(sds_env)
+    try:
+        ((actions, targets),) = agent.get_batch_actions(
+            sds_env.observation_space.state_nodes()[None],
+            steps=np.array([sds_env._step]),
+        )
+    finally:
+        agent.env = None
+
+    return actions, targets
+
+
+def _rollout(
+    env_bytes: bytes,
+    macros: List[Optional[ArrayAgentBase]],
+    sequence: List[int],
+    seed: int,
+) -> np.ndarray:
+    """
+    Apply a sequence of macros, one per step, to a fork of the pickled env.
+
+    :return: (len(sequence),) true turn score of each step.
+    """
+    fork = pickle.loads(env_bytes)
+    fork.logger = _ROLLOUT_LOGGER
+    fork.reseed(seed)
+    for agent, agent_seed in zip(macros, derive_seeds(seed, len(macros))):
+        if agent is not None:
+            agent.reseed(agent_seed)
+
+    scores = np.zeros(len(sequence))
+    for h, macro in enumerate(sequence):
+        info, _, _ = fork.step(*_macro_actions(macros[macro], fork))
+        scores[h] = info["turn_score"]
+
+    return scores
+
+
+def _uct(tree: _Tree, node: int, exploration: float) -> int:
+    """UCT choice of macro at a fully expanded node, with mean values min-max normalised over its children."""
+    kids = tree.children[node]
+    visits = tree.visits[kids]
+    q = tree.value_sum[kids] / visits
+    span = q.max() - q.min()
+    q = (q - q.min()) / span if span > 0 else np.zeros_like(q)
+
+    return int(np.argmax(q + exploration * np.sqrt(np.log(tree.visits[node]) / visits)))
+
+
+def _search(
+    tree: _Tree,
+    env_bytes: bytes,
+    macros: List[Optional[ArrayAgentBase]],
+    seed: int,
+    n_simulations: int,
+    horizon: int,
+    exploration: float,
+    deadline: Optional[float] = None,
+) -> _Tree:
+    """
+    Grow the tree with up to n_simulations simulations, stopping at the (time.time()) deadline after at least one.
+
+    Each simulation selects macros with UCT down to a node with unexpanded children, expands one of them, then
+    continues with uniformly random macros to the horizon. The macro sequence is rolled out on a fork of the env, and
+    each node on the path is credited with the total score from its step onwards.
+    """
+    random_state = np.random.RandomState(seed)
+    for i in range(n_simulations):
+        if (i > 0) and (deadline is not None) and (time.time() > deadline):
+            break
+
+        path, sequence = [0], []
+        while len(sequence) < horizon:
+            node = path[-1]
+            unexpanded = np.flatnonzero(tree.children[node] < 0)
+            if len(unexpanded) > 0:
+                macro = int(random_state.choice(unexpanded))
+                path.append(tree.add(node, macro))
+                sequence.append(macro)
+                break
+            macro = _uct(tree, node, exploration)
+            path.append(int(tree.children[node, macro]))
+            sequence.append(macro)
+
+        sequence.extend(
+            random_state.randint(len(macros), size=horizon - len(sequence)).tolist()
+        )
+        scores = _rollout(env_bytes, macros, sequence, int(random_state.randint(2**31)))
+
+        # Node at depth d >= 1 was reached by the macro at step d - 1, root is credited with the full return
+        returns = np.cumsum(scores[::-1])[::-1]
+        tree.visits[path] += 1
+        tree.value_sum[path] += returns[[0] + list(range(len(path) - 1))]
+
+    return tree
+
+
+class MCTSAgent(NonLearningAgentBase):
+    """
+    Monte Carlo tree search agent, planning over coarse macro actions rather than individual node actions.
+
+    Each macro is an array agent (eg. "vaccinate the highest degree nodes") that proposes this turn's actions from the
+    current nodes observation, or None for doing nothing. The tree branches on which macro to apply each step, up to
+    horizon steps ahead. Simulations select macros with UCT, expand one new node, then finish the horizon with
+    uniformly random macros on a fork of the env (pickled once per turn, unpickled per simulation), scored with the
+    true turn score. The macro with the most visits at the root is applied to the real env.
+
+    The tree is open loop (nodes are macro sequences, not env states), so its statistics are still valid after the
+    env moves on: the subtree below the applied macro is kept and searched further on the next turn, as long as the
+    env has advanced by exactly one step. Tree statistics are kept in flat arrays.
+
+    Simulations stop at n_simulations or once time_budget seconds of wall clock time have passed since the turn
+    started (at least one simulation is always run per tree). With n_jobs > 1, each process searches its own copy of
+    the tree with a different seed and the simulations split between them (root parallelisation). Root statistics
+    are summed over the copies to select the macro, and the first copy's subtree is kept for the next turn.
+
+    :param macros: Macro agents to plan over, None being doing nothing. Agents are attached to the env (or a fork)
+                   only while selecting actions. Defaults to doing nothing, degree targeted isolation, vaccination and
+                   masking, and treatment, with the same actions_per_turn.
+    :param horizon: Number of steps simulated ahead, including this turn's.
+    :param n_simulations: Maximum number of simulations per turn.
+    :param time_budget: Optional wall clock time in seconds per turn, after which no more simulations are started.
+    :param exploration: UCT exploration constant, applied to mean values normalised to [0, 1] between siblings.
+    :param n_jobs: Number of processes to search on. 1 searches in this process.
+    :param reuse_tree: Keep the subtree below the applied macro for the next turn.
+
+    Other args as NonLearningAgentBase.
+    """
+
+    def __init__(
+        self,
+        *args,
+        macros: Optional[List[Optional[ArrayAgentBase]]] = None,
+        horizon: int = 5,
+        n_simulations: int = 64,
+        time_budget: Optional[float] = None,
+        exploration: float = 1.0,
+        n_jobs: int = 1,
+        reuse_tree: bool = True,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+
+        if macros is None:
+            macros = [None] + [
+                agent(actions_per_turn=self.actions_per_turn)
+                for agent in [
+                    TargetedIsolationAgent,
+                    TargetedVaccinationAgent,
+                    TargetedMaskingAgent,
+                    TreatmentArrayAgent,
+                ]
+            ]
+        self.macros = macros
+        self.horizon = horizon
+        self.n_simulations = n_simulations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.n_jobs = n_jobs
+        self.reuse_tree = reuse_tree
+
+        self.last_visits: np.ndarray = np.zeros(len(macros), dtype=int)
+        self.last_values: np.ndarray = np.zeros(len(macros))
+        self._tree: Optional[_Tree] = None
+        self._tree_step: Optional[int] = None
+
+    def reset(self):
+        super().reset()
+        self._tree = None
+        self._tree_step = None
+
+    def clone(self) -> "MCTSAgent":
+        """Clone a fresh object with same seed (could be None), without the search tree."""
+        clone = super().clone()
+        clone._tree = None
+        clone._tree_step = None
+
+        return clone
+
+    @property
+    def available_actions(self) -> List[int]:
+        return sorted(
+            {
+                a
+                for agent in self.macros
+                if agent is not None
+                for a in agent.available_actions
+            }
+        )
+
+    def _grow(
+        self, tree: _Tree, env_bytes: bytes, deadline: Optional[float]
+    ) -> Tuple[_Tree, np.ndarray, np.ndarray]:
+        """Search from the tree, returning the tree to keep and the root visits and value sums of each macro."""
+        seeds = derive_seeds(int(self._random_state.randint(2**31)), self.n_jobs)
+        args = (self.horizon, self.exploration, deadline)
+        if self.n_jobs == 1:
+            tree = _search(
+                tree, env_bytes, self.macros, seeds[0], self.n_simulations, *args
+            )
+            visits, value_sum = tree.root_stats()
+
+            return tree, visits, value_sum
+
+        per_job = math.ceil(self.n_simulations / self.n_jobs)
+        trees = Parallel(n_jobs=self.n_jobs, backend="loky")(
+            delayed(_search)(tree, env_bytes, self.macros, s, per_job, *args)
+            for s in seeds
+        )
+        prior_visits, prior_value_sum = tree.root_stats()
+        stats = [t.root_stats() for t in trees]
+        visits = prior_visits + sum(v - prior_visits for v, _ in stats)
+        value_sum = prior_value_sum + sum(s - prior_value_sum for _, s in stats)
+
+        return trees[0], visits, value_sum
+
+    def _select_actions_targets(self) -> Dict[int, int]:
+        deadline = None if self.time_budget is None else time.time() + self.time_budget
+        sds_env = self.env.sds_env
+
+        if len(self.macros) == 1:
+            best = 0
+        else:
+            tree = self._tree
+            if (tree is None) or (self._tree_step != sds_env._step):
+                tree = _Tree(len(self.macros))
+            env_bytes = pickle.dumps(sds_env, protocol=pickle.HIGHEST_PROTOCOL)
+            tree, self.last_visits, value_sum = self._grow(tree, env_bytes, deadline)
+            self.last_values = value_sum / np.maximum(self.last_visits, 1)
+            # Ties go to the earliest macro, ie. doing nothing if it's first
+            best = int(np.argmax(self.last_visits))
+
+            child = tree.children[0, best]
+            self._tree = (
+                tree.subtree(child) if self.reuse_tree and (child >= 0) else None
+            )
+            self._tree_step = sds_env._step + 1
+
+        agent = self.macros[best]
+        if agent is not None:
+            agent.reseed(int(self._random_state.randint(2**31)))
+        actions, targets = _macro_actions(agent, sds_env)
+
+        return dict(zip(targets, actions))
@@ -0,0 +1,243 @@
+import copy
+import logging
+import pickle
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import gym
+import numpy as np
+from joblib import Parallel, delayed
+
+from social_distancing_sim.agent.array_agents.array_agent_base import ArrayAgentBase
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    IsolationArrayAgent,
+    MaskingArrayAgent,
+    TreatmentArrayAgent,
+    VaccinationArrayAgent,
+)
+from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
+from social_distancing_sim.environment.gym.gym_env import GymEnv
+from social_distancing_sim.environment.seeding import derive_seeds
+
+# Forks share their parent env's logger name, so log to this instead to keep rollouts out of the env's log
+_ROLLOUT_LOGGER = logging.getLogger("social_distancing_sim.rollouts")
+_ROLLOUT_LOGGER.setLevel(logging.WARNING)
+
+
+def _rollout(
+    env_bytes: bytes,
+    candidates: List[Tuple[List[int], List[int]]],
+    seed: int,
+    horizon: int,
+    rollout_agent: Optional[ArrayAgentBase] = None,
+) -> np.ndarray:
+    """
+    Total score of each candidate over one rollout.
+
+    Each candidate is applied to its own fork of the pickled env, then the forks are stepped in lockstep for the rest
+    of the horizon, with actions for all the forks selected in one batch by the rollout agent (or no actions). All
+    forks are reseeded with the same seed, so candidates are compared on common random numbers.
+
+    :return: (n candidates,) sum of the true turn scores over the horizon.
+    """
+    forks = [pickle.loads(env_bytes) for _ in candidates]
+    for fork in forks:
+        fork.logger = _ROLLOUT_LOGGER
+        fork.reseed(seed)
+    if rollout_agent is not None:
+        rollout_agent.reseed(seed)
+
+    scores = np.zeros(len(candidates))
+    actions_targets = candidates
+    for h in range(horizon):
+        for i, (fork, (actions, targets)) in enumerate(zip(forks, actions_targets)):
+            info, _, _ = fork.step(actions, targets)
+            scores[i] += info["turn_score"]
+
+        if h < horizon - 1:
+            if rollout_agent is None:
+                actions_targets = [([], [])] * len(forks)
+            else:
+                actions_targets = rollout_agent.get_batch_actions(
+                    np.stack([f.observation_space.state_nodes() for f in forks]),
+                    steps=np.array([f._step for f in forks]),
+                )
+
+    return scores
+
+
+class MPCAgent(NonLearningAgentBase):
+    """
+    Model predictive control agent, picks the candidate set of actions that scores best in simulated rollouts.
+
+    Each turn, the candidate agents each propose a set of actions and targets from the current nodes observation (plus
+    doing nothing, if include_no_action). The env is forked (pickled once, then unpickled into a copy per candidate),
+    each candidate is applied to its fork and the forks are rolled forward with the rollout agent for the rest of the
+    horizon. This is repeated for up to n_rollouts rounds with different seeds, and the candidate with the best mean
+    total score is returned.
+
+    Forks are full copies of the env, so rollouts use its true state (including unknown infections) and are scored
+    with the true turn score. Rollouts within a round share a seed (common random numbers), so differences between
+    candidates aren't swamped by noise, and each round's rollout agent actions are selected for all forks in one
+    batch. Rounds can be spread over n_jobs processes, and stop early once time_budget is used up (at least one round
+    is always run).
+
+    :param candidate_agents: Array agents proposing the candidates. These are attached to the same env as this agent.
+                             Defaults to vaccination, isolation, treatment and masking array agents with the same
+                             actions_per_turn.
+    :param rollout_agent: Array agent selecting actions after the first step of each rollout, via .get_batch_actions.
+                          It's reseeded each round and not attached to an env. If None, no further actions are taken.
+    :param horizon: Number of steps in each rollout, including the candidate's.
+    :param n_rollouts: Maximum number of rollout rounds per turn.
+    :param time_budget: Optional time in seconds per turn, after which no more rounds are started.
+    :param n_jobs: Number of processes to run rounds on. 1 runs them in this process.
+    :param include_no_action: Include doing nothing as a candidate.
+
+    Other args as NonLearningAgentBase.
+    """
+
+    def __init__(
+        self,
+        *args,
+        candidate_agents: Optional[List[ArrayAgentBase]] = None,
+        rollout_agent: Optional[ArrayAgentBase] = None,
+        horizon: int = 5,
+        n_rollouts: int = 8,
+        time_budget: Optional[float] = None,
+        n_jobs: int = 1,
+        include_no_action: bool = True,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+
+        if candidate_agents is None:
+            candidate_agents = [
+                agent(actions_per_turn=self.actions_per_turn, seed=seed)
+                for agent, seed in zip(
+                    [
+                        VaccinationArrayAgent,
+                        IsolationArrayAgent,
+                        TreatmentArrayAgent,
+                        MaskingArrayAgent,
+                    ],
+                    derive_seeds(self.seed, 4),
+                )
+            ]
+        self.candidate_agents = candidate_agents
+        self.rollout_agent = rollout_agent
+        self.horizon = horizon
+        self.n_rollouts = n_rollouts
+        self.time_budget = time_budget
+        self.n_jobs = n_jobs
+        self.include_no_action = include_no_action
+
+        self.last_candidates: List[Tuple[List[int], List[int]]] = []
+        self.last_scores: np.ndarray = np.zeros((0, 0))
+
+        if self.env is not None:
+            self.attach_to_env(self.env)
+
+    def attach_to_env(
+        self, env_or_spec: Union[GymEnv, str, gym.envs.registration.EnvSpec]
+    ) -> None:
+        super().attach_to_env(env_or_spec)
+
+        for agent in self.candidate_agents:
+            agent.attach_to_env(self.env)
+
+    def reset(self):
+        super().reset()
+        for agent in self.candidate_agents:
+            agent.reset()
+
+    def clone(self) -> "MPCAgent":
+        """
+        Clone a fresh object with same seed (could be None).
+
+        The clone and its candidate agents are detached from any env, and the candidates are reseeded from the clone's
+        seed. This agent and its candidates stay attached.
+        """
+        attached = [self, *self.candidate_agents]
+        if self.rollout_agent is not None:
+            attached.append(self.rollout_agent)
+        clone = copy.deepcopy(self, memo={id(agent.env): None for agent in attached})
+        clone.reseed(clone.seed)
+
+        return clone
+
+    def reseed(self, seed: Union[None, int]) -> None:
+        """Set a new seed, and derive independent seeds for each of the candidate agents."""
+        for agent, child_seed in zip(
+            self.candidate_agents, derive_seeds(seed, len(self.candidate_agents))
+        ):
+            agent.seed = child_seed
+        super().reseed(seed)
+
+    @property
+    def available_actions(self) -> List[int]:
+        return sorted(
+            {a for agent in self.candidate_agents for a in agent.available_actions}
+        )
+
+    def _candidates(self) -> List[Tuple[List[int], List[int]]]:
+        nodes = self.env.sds_env.observation_space.state_nodes()[None]
+
+        candidates = [([], [])] if self.include_no_action else []
+        for agent in self.candidate_agents:
+            ((actions, targets),) = agent.get_batch_actions(
+                nodes, steps=np.array([self._step])
+            )
+            if (len(actions) > 0) and ((actions, targets) not in candidates):
+                candidates.append((actions, targets))
+
+        return candidates
+
+    def _rollout_rounds(
+        self, env_bytes: bytes, candidates: List[Tuple[List[int], List[int]]]
+    ) -> np.ndarray:
+        """Run rounds of rollouts, n_jobs at a time, until n_rollouts or the time budget is reached."""
+        t0 = time.perf_counter()
+        seeds = derive_seeds(int(self._random_state.randint(2**31)), self.n_rollouts)
+        wave_size = max(1, self.n_jobs)
+
+        scores = []
+        for w in range(0, self.n_rollouts, wave_size):
+            wave_seeds = seeds[w : w + wave_size]
+            if self.n_jobs == 1:
+                scores.extend(
+                    _rollout(env_bytes, candidates, s, self.horizon, self.rollout_agent)
+                    for s in wave_seeds
+                )
+            else:
+                scores.extend(
+                    Parallel(n_jobs=self.n_jobs, backend="loky")(
+                        delayed(_rollout)(
+                            env_bytes, candidates, s, self.horizon, self.rollout_agent
+                        )
+                        for s in wave_seeds
+                    )
+                )
+
+            if (self.time_budget is not None) and (
+                time.perf_counter() - t0 > self.time_budget
+            ):
+                break
+
+        return np.stack(scores, axis=1)
+
+    def _select_actions_targets(self) -> Dict[int, int]:
+        candidates = self._candidates()
+        scores = np.zeros((len(candidates), 0))
+        if len(candidates) > 1:
+            env_bytes = pickle.dumps(self.env.sds_env, protocol=pickle.HIGHEST_PROTOCOL)
+            scores = self._rollout_rounds(env_bytes, candidates)
+        self.last_candidates = candidates
+        self.last_scores = scores
+
+        if len(candidates) == 0:
+            return {}
+        # Ties go to the earliest candidate, ie. doing nothing if it's included
+        best = int(np.argmax(scores.mean(axis=1))) if scores.shape[1] > 0 else 0
+        actions, targets = candidates[best]
+
+        return dict(zip(targets, actions))
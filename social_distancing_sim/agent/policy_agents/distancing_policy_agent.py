@@ -1,5 +1,7 @@
 from typing import Dict, List
 
+import numpy as np
+
 from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
 
 
@@ -20,15 +22,17 @@ class DistancingPolicyAgent(NonLearningAgentBase):
         return [2, 3]
 
     @property
-    def available_targets(self) -> Dict[int, List[int]]:
+    def available_targets(self) -> Dict[int, np.ndarray]:
         """Slightly different IsolationAgent - also isolates clear nodes and reconnects any isolated node."""
+        obs = self.env.sds_env.observation_space
         return {
-            2: list(
-                set(self.env.sds_env.observation_space.current_clear_nodes).difference(
-                    self.env.sds_env.observation_space.current_isolated_nodes
-                )
+            2: self._target_pool(
+                "clear_not_isolated",
+                lambda: set(obs.current_clear_nodes).difference(
+                    obs.current_isolated_nodes
+                ),
             ),
-            3: self.env.sds_env.observation_space.current_isolated_nodes,
+            3: self._target_pool("isolated", lambda: obs.current_isolated_nodes),
         }
 
     def _select_actions_targets(self) -> Dict[int, str]:
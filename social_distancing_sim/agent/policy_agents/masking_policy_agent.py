@@ -1,5 +1,7 @@
 from typing import Dict, List
 
+import numpy as np
+
 from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
 
 
@@ -19,8 +21,10 @@ class MaskingPolicyAgent(NonLearningAgentBase):
         return [5]
 
     @property
-    def available_targets(self) -> List[int]:
-        return list(self.env.sds_env.observation_space.current_alive_nodes)
+    def available_targets(self) -> np.ndarray:
+        return self._target_pool(
+            "alive", lambda: self.env.sds_env.observation_space.current_alive_nodes
+        )
 
     def _select_actions_targets(self) -> Dict[int, int]:
         if len(self.currently_active_actions) > 0:
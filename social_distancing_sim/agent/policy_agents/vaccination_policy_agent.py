@@ -1,5 +1,7 @@
 from typing import Dict, List
 
+import numpy as np
+
 from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
 
 
@@ -20,9 +22,11 @@ class VaccinationPolicyAgent(NonLearningAgentBase):
         return [1]
 
     @property
-    def available_targets(self) -> List[int]:
-        """Same as VaccinationAgent."""
-        return list(self.env.sds_env.observation_space.current_clear_nodes)
+    def available_targets(self) -> np.ndarray:
+        """Any clear node."""
+        return self._target_pool(
+            "clear", lambda: self.env.sds_env.observation_space.current_clear_nodes
+        )
 
     def _select_actions_targets(self) -> Dict[int, int]:
         if len(self.currently_active_actions) > 0:
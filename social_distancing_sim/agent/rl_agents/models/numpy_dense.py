@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping
+
+import numpy as np
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+_ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+    "softmax": _softmax,
+}
+
+
+@dataclass
+class NumpyDense:
+    """
+    A stack of dense layers as plain NumPy arrays, for inference without TensorFlow.
+
+    Exported from a trained Keras model (eg. an UntargetedNN) with .from_keras, and saved to/loaded from a single .npz
+    file. The forward pass matches the Keras model's, in float32.
+
+    :param kernels: (n in, n out) weight matrix of each layer.
+    :param biases: (n out,) bias of each layer.
+    :param activations: Name of each layer's activation, one of "linear", "relu", "tanh", "sigmoid" or "softmax".
+    """
+
+    kernels: List[np.ndarray]
+    biases: List[np.ndarray]
+    activations: List[str]
+
+    def __post_init__(self) -> None:
+        if not (len(self.kernels) == len(self.biases) == len(self.activations)):
+            raise ValueError("Need a kernel, bias and activation for each layer.")
+        for activation in self.activations:
+            if activation not in _ACTIVATIONS:
+                raise ValueError(
+                    f"Unsupported activation {activation}, use one of {list(_ACTIVATIONS)}."
+                )
+
+        self.kernels = [np.asarray(k, dtype=np.float32) for k in self.kernels]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in self.biases]
+
+    @classmethod
+    def from_keras(cls, model: Any) -> "NumpyDense":
+        """
+        Export the weights of a Keras model made up of dense layers.
+
+        Only uses the model's .layers, and the layers' .get_weights and .get_config, so TensorFlow isn't imported here.
+        Layers without weights (eg. the input layer) are skipped.
+        """
+        return cls.from_layers(model.layers)
+
+    @classmethod
+    def from_layers(cls, layers: Iterable[Any]) -> "NumpyDense":
+        """Export a sequence of Keras dense layers, see .from_keras."""
+        kernels, biases, activations = [], [], []
+        for layer in layers:
+            weights = layer.get_weights()
+            if len(weights) == 0:
+                continue
+            if (len(weights) != 2) or (np.ndim(weights[0]) != 2):
+                raise ValueError(
+                    f"Layer {layer.name} isn't a dense layer, only dense layers can be exported."
+                )
+            kernels.append(weights[0])
+            biases.append(weights[1])
+            activations.append(layer.get_config().get("activation") or "linear")
+
+        return cls(kernels=kernels, biases=biases, activations=activations)
+
+    @property
+    def n_inputs(self) -> int:
+        return self.kernels[0].shape[0]
+
+    @property
+    def n_outputs(self) -> int:
+        return self.kernels[-1].shape[1]
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """Forward pass over a (n, n inputs) batch, returning (n, n outputs)."""
+        x = np.asarray(x, dtype=np.float32)
+        for kernel, bias, activation in zip(
+            self.kernels, self.biases, self.activations
+        ):
+            x = _ACTIVATIONS[activation](x @ kernel + bias)
+
+        return x
+
+    def arrays(self, prefix: str = "") -> Dict[str, np.ndarray]:
+        """Named arrays of the layers, as saved. Prefix allows several stacks to be saved in the same file."""
+        arrays = {f"{prefix}activations": np.array(self.activations)}
+        arrays.update({f"{prefix}kernel_{i}": k for i, k in enumerate(self.kernels)})
+        arrays.update({f"{prefix}bias_{i}": b for i, b in enumerate(self.biases)})
+
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: Mapping[str, np.ndarray], prefix: str = ""
+    ) -> "NumpyDense":
+        activations = arrays[f"{prefix}activations"].tolist()
+        return cls(
+            kernels=[arrays[f"{prefix}kernel_{i}"] for i in range(len(activations))],
+            biases=[arrays[f"{prefix}bias_{i}"] for i in range(len(activations))],
+            activations=activations,
+        )
+
+    def save(self, fn: str) -> None:
+        np.savez(fn, **self.arrays())
+
+    @classmethod
+    def load(cls, fn: str) -> "NumpyDense":
+        with np.load(fn) as arrays:
+            return cls.from_arrays(arrays)
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+
+
+@dataclass
+class NumpyTargetedNN:
+    """
+    NumPy version of TargetedNN, giving action values for every (node, action) pair in one batched forward pass.
+
+    The state embedding is computed once per env and broadcast against the per-node embeddings, so a batch of K envs
+    with N nodes costs K state passes and one (K, N) node pass, rather than a forward pass per node.
+
+    :param state_net: Layers embedding the state, ending in a linear layer.
+    :param node_net: Layer embedding each node's features, linear and the same size as the state embedding.
+    :param head: Layers applied to each node after the (relu of the) sum of the embeddings, giving the action values.
+    """
+
+    state_net: NumpyDense
+    node_net: NumpyDense
+    head: NumpyDense
+
+    @classmethod
+    def from_keras(cls, model: Any) -> "NumpyTargetedNN":
+        """Export a TargetedNN Keras model, splitting its layers by name, see TargetedNN."""
+        return cls(
+            state_net=NumpyDense.from_layers(
+                [layer for layer in model.layers if layer.name.startswith("state_")]
+            ),
+            node_net=NumpyDense.from_layers(
+                [layer for layer in model.layers if layer.name.startswith("node_")]
+            ),
+            head=NumpyDense.from_layers(
+                [
+                    layer
+                    for layer in model.layers
+                    if layer.name.startswith("q_") or (layer.name == "output")
+                ]
+            ),
+        )
+
+    @property
+    def n_actions(self) -> int:
+        return self.head.n_outputs
+
+    def predict(self, states: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """
+        Action values for a batch of envs.
+
+        :param states: (K, state size) states.
+        :param nodes: (K, N, n node features) features of each node.
+        :return: (K, N, n actions) values.
+        """
+        state_embedding = self.state_net.predict(
+            np.asarray(states).reshape(len(states), -1)
+        )
+        node_embedding = self.node_net.predict(nodes)
+
+        return self.head.predict(
+            np.maximum(state_embedding[:, None, :] + node_embedding, 0)
+        )
+
+    def save(self, fn: str) -> None:
+        np.savez(
+            fn,
+            **self.state_net.arrays("state_"),
+            **self.node_net.arrays("node_"),
+            **self.head.arrays("head_"),
+        )
+
+    @classmethod
+    def load(cls, fn: str) -> "NumpyTargetedNN":
+        with np.load(fn) as arrays:
+            return cls(
+                state_net=NumpyDense.from_arrays(arrays, "state_"),
+                node_net=NumpyDense.from_arrays(arrays, "node_"),
+                head=NumpyDense.from_arrays(arrays, "head_"),
+            )
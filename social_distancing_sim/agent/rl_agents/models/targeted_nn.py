@@ -5,26 +5,50 @@ from tensorflow import keras
 
 
 class TargetedNN(ModelBase):
+    """
+    Action values for every (node, action) pair from a single forward pass.
+
+    The state (eg. the summary observation) is embedded once, and added to an embedding of each node's features (eg.
+    the nodes observation, with a row per node). This is the same as concatenating the state embedding to each node's
+    features and applying a dense layer, without repeating the state. The remaining dense layers are applied to each
+    node, giving (n nodes, n actions) values. Layers are named "state_", "node_" and "q_"/"output" for export with
+    NumpyTargetedNN.from_keras.
+    """
+
+    n_node_features: int = 6
 
     def _model_architecture(
         self,
     ) -> Tuple[Tuple[keras.layers.Layer, keras.layers.Layer], keras.layers.Layer]:
         n_units = 128 * self.unit_scale
 
-        state_input = keras.layers.Input(name="input", shape=self.observation_shape)
-        target_input = keras.layers.Input(name="input", shape=(1,))
-        concat_1 = keras.layers.Concatenate()[state_input, target_input]
-        fc1 = keras.layers.Dense(units=int(n_units + 1), name="fc1", activation="relu")(
-            concat_1
+        state_input = keras.layers.Input(
+            name="state_input", shape=self.observation_shape
+        )
+        node_input = keras.layers.Input(
+            name="node_input", shape=(None, self.n_node_features)
+        )
+
+        state_fc1 = keras.layers.Dense(
+            units=int(n_units), name="state_fc1", activation="relu"
+        )(state_input)
+        state_embedding = keras.layers.Dense(
+            units=int(n_units / 2), name="state_embedding", activation="linear"
+        )(state_fc1)
+        # (1, units), broadcast over the nodes when added
+        state_embedding = keras.layers.Reshape((1, int(n_units / 2)))(state_embedding)
+        node_embedding = keras.layers.Dense(
+            units=int(n_units / 2), name="node_embedding", activation="linear"
+        )(node_input)
+
+        joint = keras.layers.Activation("relu")(
+            keras.layers.Add()([state_embedding, node_embedding])
         )
-        fc2 = keras.layers.Dense(
-            units=int(n_units / 2 + 1), name="fc2", activation="relu"
-        )(fc1)
-        fc3 = keras.layers.Dense(
-            units=int(n_units / 4 + 1), name="fc3", activation="relu"
-        )(fc2)
+        q_fc1 = keras.layers.Dense(
+            units=int(n_units / 4), name="q_fc1", activation="relu"
+        )(joint)
         action_output = keras.layers.Dense(
             units=self.n_actions, name="output", activation=self.output_activation
-        )(fc3)
+        )(q_fc1)
 
-        return (state_input, target_input), action_output
+        return (state_input, node_input), action_output
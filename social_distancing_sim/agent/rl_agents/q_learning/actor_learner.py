@@ -0,0 +1,321 @@
+import multiprocessing
+import queue
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+from gym.envs.registration import EnvSpec
+
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+from social_distancing_sim.agent.rl_agents.q_learning.vec_dqn_trainer import (
+    DQNTrainerBase,
+    flatten_nodes,
+)
+from social_distancing_sim.agent.rl_agents.replay_buffer import ReplayBuffer
+from social_distancing_sim.environment.gym.gym_env import GymEnv
+from social_distancing_sim.environment.gym.vec_env import VecEnv
+from social_distancing_sim.environment.seeding import derive_seeds
+
+
+@dataclass
+class Actor:
+    """
+    Collects experience from a VecEnv with a NumPy copy of the policy, for ActorLearnerDQNTrainer.
+
+    The policy is a NumpyDense built from the learner model's weights (alternating kernels and biases, as
+    keras.Model.get_weights gives for a stack of dense layers), so actors never need TensorFlow.
+
+    :param env: Registered env id, EnvSpec or GymEnv class, see VecEnv.
+    :param n_envs: Number of envs in the actor's VecEnv.
+    :param activations: Activation of each layer of the policy.
+    :param eps: Exploration rate.
+    :param steps_per_push: VecEnv steps collected by each call to .collect.
+    :param n_steps: Episode length, see VecEnv.
+    :param actions_per_turn: Number of times the selected action is repeated each turn.
+    :param observation: Maps the stacked VecEnv observations to policy inputs, see VecDQNTrainer.
+    :param seed: Seed for the VecEnv and exploration.
+    """
+
+    env: Union[str, EnvSpec, Type[GymEnv]]
+    n_envs: int
+    activations: List[str]
+    eps: float = 0.1
+    steps_per_push: int = 10
+    n_steps: Optional[int] = None
+    actions_per_turn: int = 1
+    observation: Callable[[Tuple[np.ndarray, ...]], np.ndarray] = flatten_nodes
+    seed: Optional[int] = None
+
+    policy: Optional[NumpyDense] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._random_state = np.random.RandomState(self.seed)
+        self.vec_env = VecEnv(
+            self.env,
+            n_envs=self.n_envs,
+            n_steps=self.n_steps,
+            include_graph=False,
+            seed=self.seed,
+        )
+        self._obs = self.observation(self.vec_env.reset())
+        self._episode_rewards = np.zeros(self.n_envs)
+
+    def set_weights(self, weights: Sequence[np.ndarray]) -> None:
+        self.policy = NumpyDense(
+            kernels=list(weights[0::2]),
+            biases=list(weights[1::2]),
+            activations=self.activations,
+        )
+
+    def collect(self) -> Dict[str, np.ndarray]:
+        """
+        Step the VecEnv steps_per_push times.
+
+        :return: Dict of the n_envs * steps_per_push transitions, as ReplayBuffer.add args, and the total rewards of
+                 any episodes completed.
+        """
+        transitions = {
+            k: [] for k in ("obs", "actions", "rewards", "dones", "next_obs")
+        }
+        episode_rewards = []
+        for _ in range(self.steps_per_push):
+            actions = self.policy.predict(self._obs).argmax(axis=1)
+            explore = self._random_state.uniform(size=self.n_envs) < self.eps
+            actions[explore] = self._random_state.randint(
+                0, self.policy.n_outputs, size=explore.sum()
+            )
+
+            obs, rewards, dones, _, _ = self.vec_env.step(
+                np.repeat(actions[:, None], self.actions_per_turn, axis=1)
+            )
+            next_obs = self.observation(obs)
+            for k, v in zip(
+                transitions, (self._obs, actions, rewards, dones, next_obs)
+            ):
+                transitions[k].append(v)
+            self._obs = next_obs
+
+            self._episode_rewards += rewards
+            episode_rewards.extend(self._episode_rewards[dones].tolist())
+            self._episode_rewards[dones] = 0
+
+        batch = {k: np.concatenate(v) for k, v in transitions.items()}
+        batch["episode_rewards"] = np.array(episode_rewards)
+
+        return batch
+
+
+def _latest(q: multiprocessing.Queue) -> Optional[Any]:
+    """Drain a queue, returning the most recent item, or None if it was empty."""
+    item = None
+    while True:
+        try:
+            item = q.get_nowait()
+        except queue.Empty:
+            return item
+
+
+def _run_actor(
+    actor_kwargs: Dict[str, Any],
+    weights_queue: multiprocessing.Queue,
+    transitions_queue: multiprocessing.Queue,
+    stop: multiprocessing.Event,
+) -> None:
+    """Actor process loop: collect with the latest weights and push to the learner, until stopped."""
+    actor = Actor(**actor_kwargs)
+    actor.set_weights(weights_queue.get())
+    while not stop.is_set():
+        weights = _latest(weights_queue)
+        if weights is not None:
+            actor.set_weights(weights)
+
+        batch = actor.collect()
+        # Block while the learner is behind, but not past a stop
+        while not stop.is_set():
+            try:
+                transitions_queue.put(batch, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+
+@dataclass
+class ActorLearnerDQNTrainer(DQNTrainerBase):
+    """
+    Train a Q model with experience collected by parallel actor processes.
+
+    Each of n_actors processes runs a VecEnv of envs_per_actor envs, acting with a NumPy copy of the model (see Actor)
+    and its own exploration rate (spaced from eps_initial to eps_min across actors). Actors push batches of
+    transitions to the learner, this process, through a bounded queue. The learner adds them to a ReplayBuffer and
+    makes updates_per_push DQN updates per batch (see dqn_update), and sends the model's weights to the actors every
+    sync_every updates. Only the learner needs the model's framework (eg. TensorFlow).
+
+    The model should be a stack of dense layers with .get_weights as kernel, bias pairs (eg. UntargetedNN), and with
+    .predict_on_batch, .train_on_batch and .set_weights, as VecDQNTrainer.
+
+    Actors are started with mp_context (spawn by default, which is safe with TensorFlow in the learner), so env should
+    be an EnvSpec or GymEnv class, or an id registered on import in the actors.
+
+    :param env: Env to collect experience from, see VecEnv.
+    :param model: Q model to train.
+    :param target_model: Model used for the next observation values. If None, model is used.
+    :param activations: Activation of each layer of the model. If None, read from the model, see NumpyDense.from_keras.
+    :param n_actors: Number of actor processes.
+    :param envs_per_actor: Number of envs in each actor's VecEnv.
+    :param steps_per_push: VecEnv steps in each batch pushed by the actors.
+    :param updates_per_push: Updates made by the learner for each batch received, once learning has started.
+    :param sync_every: Updates between sending the weights to the actors.
+    :param n_steps: Episode length, see VecEnv.
+    :param observation: Maps the stacked VecEnv observations to model inputs, see VecDQNTrainer.
+    :param buffer_size: Capacity of the replay buffer, in transitions.
+    :param memmap_dir: Optional dir to memory map the replay buffer in.
+    :param gamma: Discount factor.
+    :param batch_size: Minibatch size.
+    :param target_update_every: Updates between copying the model's weights to the target model.
+    :param learning_starts: Transitions to collect before training starts.
+    :param eps_initial: Exploration rate of the first actor.
+    :param eps_min: Exploration rate of the last actor.
+    :param actions_per_turn: Number of times the selected action is repeated each turn.
+    :param seed: Seed for the actors and minibatch sampling.
+    :param mp_context: Multiprocessing start method for the actors.
+    """
+
+    env: Union[str, EnvSpec, Type[GymEnv]]
+    model: Any
+    target_model: Optional[Any] = None
+    activations: Optional[List[str]] = None
+    n_actors: int = max(1, multiprocessing.cpu_count() - 2)
+    envs_per_actor: int = 4
+    steps_per_push: int = 10
+    updates_per_push: int = 4
+    sync_every: int = 20
+    n_steps: Optional[int] = None
+    observation: Callable[[Tuple[np.ndarray, ...]], np.ndarray] = flatten_nodes
+    buffer_size: int = 100000
+    memmap_dir: Optional[str] = None
+    gamma: float = 0.99
+    batch_size: int = 32
+    target_update_every: int = 100
+    learning_starts: int = 1000
+    eps_initial: float = 0.4
+    eps_min: float = 0.01
+    actions_per_turn: int = 1
+    seed: Optional[int] = None
+    mp_context: str = "spawn"
+
+    buffer: Optional[ReplayBuffer] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        if self.activations is None:
+            self.activations = NumpyDense.from_keras(self.model).activations
+        seeds = derive_seeds(self.seed, self.n_actors + 1)
+        self._random_state = np.random.RandomState(seeds[0])
+        self._actor_seeds = seeds[1:]
+        self._n_updates = 0
+
+    @property
+    def actor_eps(self) -> np.ndarray:
+        if self.n_actors == 1:
+            return np.array([self.eps_initial])
+
+        return np.geomspace(self.eps_initial, self.eps_min, self.n_actors)
+
+    def _actor_kwargs(self, i: int) -> Dict[str, Any]:
+        return {
+            "env": self.env,
+            "n_envs": self.envs_per_actor,
+            "activations": self.activations,
+            "eps": float(self.actor_eps[i]),
+            "steps_per_push": self.steps_per_push,
+            "n_steps": self.n_steps,
+            "actions_per_turn": self.actions_per_turn,
+            "observation": self.observation,
+            "seed": self._actor_seeds[i],
+        }
+
+    def _weights(self) -> List[np.ndarray]:
+        return [np.asarray(w) for w in self.model.get_weights()]
+
+    @staticmethod
+    def _get(
+        transitions_queue: multiprocessing.Queue,
+        actors: List[multiprocessing.Process],
+    ) -> Dict[str, np.ndarray]:
+        """Wait for the next batch, raising an error if an actor has died rather than waiting forever."""
+        while True:
+            try:
+                return transitions_queue.get(timeout=1)
+            except queue.Empty:
+                dead = [a for a in actors if not a.is_alive()]
+                if len(dead) > 0:
+                    raise RuntimeError(
+                        f"Actor process exited with code {dead[0].exitcode}."
+                    )
+
+    def train(self, n_updates: int) -> Dict[str, List[float]]:
+        """
+        Start the actors, and train until n_updates updates have been made. Can be called repeatedly to continue
+        training, the buffer is kept but actors are restarted.
+
+        :return: Dict with the total rewards of the episodes completed by the actors and the losses of the updates.
+        """
+        ctx = multiprocessing.get_context(self.mp_context)
+        stop = ctx.Event()
+        transitions_queue = ctx.Queue(maxsize=2 * self.n_actors)
+        weights_queues = [ctx.Queue() for _ in range(self.n_actors)]
+        actors = [
+            ctx.Process(
+                target=_run_actor,
+                args=(
+                    self._actor_kwargs(i),
+                    weights_queues[i],
+                    transitions_queue,
+                    stop,
+                ),
+                daemon=True,
+            )
+            for i in range(self.n_actors)
+        ]
+        for actor in actors:
+            actor.start()
+
+        history = {"episode_rewards": [], "losses": []}
+        target = self._n_updates + n_updates
+        try:
+            weights = self._weights()
+            for q in weights_queues:
+                q.put(weights)
+
+            while self._n_updates < target:
+                batch = self._get(transitions_queue, actors)
+                history["episode_rewards"].extend(batch.pop("episode_rewards").tolist())
+                if self.buffer is None:
+                    self.buffer = ReplayBuffer(
+                        capacity=self.buffer_size,
+                        obs_shape=batch["obs"].shape[1:],
+                        obs_dtype=batch["obs"].dtype,
+                        memmap_dir=self.memmap_dir,
+                    )
+                self.buffer.add(**batch)
+
+                if len(self.buffer) < self.learning_starts:
+                    continue
+                for _ in range(min(self.updates_per_push, target - self._n_updates)):
+                    history["losses"].append(self._update())
+                    if self._n_updates % self.sync_every == 0:
+                        weights = self._weights()
+                        for q in weights_queues:
+                            q.put(weights)
+        finally:
+            stop.set()
+            # Actors can't exit while their last batch is stuck in the queue's pipe
+            while any(a.is_alive() for a in actors):
+                _latest(transitions_queue)
+                for actor in actors:
+                    actor.join(timeout=0.1)
+            # Unread weights can be dropped, don't wait to flush them on exit
+            for q in weights_queues:
+                q.cancel_join_thread()
+                q.close()
+
+        return history
@@ -4,6 +4,10 @@ import numpy as np
 from reinforcement_learning_keras.agents.q_learning.deep_q_agent import DeepQAgent
 
 from social_distancing_sim.agent.learning_agent_base import LearningAgentBase
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+from social_distancing_sim.agent.rl_agents.q_learning.numpy_dqn_untargeted import (
+    NumpyDQNUntargeted,
+)
 
 
 class DQNUntargeted(LearningAgentBase):
@@ -27,3 +31,18 @@ class DQNUntargeted(LearningAgentBase):
         actions = [self.rlk_agent.get_best_action(state)] * self.actions_per_turn
 
         return actions, []
+
+    def to_numpy(self) -> NumpyDQNUntargeted:
+        """
+        Export the action model to an inference only NumpyDQNUntargeted, with the same wrappers and actions per turn.
+
+        The exported agent doesn't need rlk or TensorFlow, so is much cheaper to send to MultiSim workers.
+        """
+        self.rlk_agent.check_ready()
+
+        return NumpyDQNUntargeted(
+            NumpyDense.from_keras(self.rlk_agent._action_model),
+            env_wrappers=self.rlk_agent.env_wrappers,
+            name=self.name,
+            actions_per_turn=self.actions_per_turn,
+        )
@@ -0,0 +1,132 @@
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.array_agent_base import COLUMNS
+from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
+from social_distancing_sim.agent.rl_agents.models.numpy_targeted_nn import (
+    NumpyTargetedNN,
+)
+
+# Valid targets for each action, from (..., 6) boolean nodes arrays. As Environment.select_reasonable_targets, but
+# skipping nodes the action wouldn't change.
+_TARGET_MASKS: Dict[int, Callable[[np.ndarray], np.ndarray]] = {
+    1: lambda n: n[..., COLUMNS["clear"]] & ~n[..., COLUMNS["immune"]],
+    2: lambda n: n[..., COLUMNS["infected"]] & ~n[..., COLUMNS["isolated"]],
+    3: lambda n: n[..., COLUMNS["clear"]] & n[..., COLUMNS["isolated"]],
+    4: lambda n: n[..., COLUMNS["infected"]],
+    5: lambda n: n[..., COLUMNS["alive"]] & ~n[..., COLUMNS["masked"]],
+    6: lambda n: n[..., COLUMNS["masked"]],
+}
+
+
+class NumpyDQNTargeted(NonLearningAgentBase):
+    """
+    Inference only targeted Q agent, picking the best (action, target) pairs from a TargetedNN's values.
+
+    Values for every node and action are computed in one batched forward pass (see NumpyTargetedNN), from the summary
+    and nodes components of the observation. Each node's best valid action is taken, and the actions_per_turn nodes
+    with the highest values are targeted, so targets are distinct. Nodes with no valid actions are never targeted.
+
+    Export a trained TargetedNN model with .from_keras, or load one saved with .save.
+    """
+
+    def __init__(
+        self,
+        model: NumpyTargetedNN,
+        *args,
+        actions: Tuple[int, ...] = (1, 2, 3, 4, 5),
+        **kwargs,
+    ) -> None:
+        """
+        :param model: Exported TargetedNN.
+        :param actions: Action id of each of the model's outputs.
+
+        Other args as NonLearningAgentBase.
+        """
+        if len(actions) != model.n_actions:
+            raise ValueError(
+                f"Model has {model.n_actions} outputs, but {len(actions)} actions were given."
+            )
+        self.model = model
+        self.actions = tuple(actions)
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def from_keras(cls, model: Any, *args, **kwargs) -> "NumpyDQNTargeted":
+        return cls(NumpyTargetedNN.from_keras(model), *args, **kwargs)
+
+    @property
+    def available_actions(self) -> List[int]:
+        return list(self.actions)
+
+    def get_batch_actions(
+        self, summaries: np.ndarray, nodes: np.ndarray
+    ) -> List[Tuple[List[int], List[int]]]:
+        """
+        Select actions and targets for a batch of envs.
+
+        :param summaries: (K, 7) summary observations.
+        :param nodes: (K, N, 6) nodes observations.
+        :return: List of K ([actions], [targets]) tuples, as accepted by VecEnv.step.
+        """
+        nodes = np.asarray(nodes, dtype=bool)
+        values = self.model.predict(summaries, nodes)
+        valid = np.stack([_TARGET_MASKS[a](nodes) for a in self.actions], axis=-1)
+        values = np.where(valid, values, -np.inf)
+
+        best_action = values.argmax(axis=2)
+        node_values = values.max(axis=2)
+        n = min(self.actions_per_turn, nodes.shape[1])
+        order = np.argsort(-node_values, axis=1, kind="stable")[:, 0:n]
+
+        actions_targets = []
+        for k, targets in enumerate(order):
+            targets = targets[np.isfinite(node_values[k, targets])]
+            actions_targets.append(
+                ([self.actions[a] for a in best_action[k, targets]], targets.tolist())
+            )
+
+        return actions_targets
+
+    def _select_actions_targets(self) -> Dict[int, int]:
+        obs = self.env.sds_env.observation_space
+        ((actions, targets),) = self.get_batch_actions(
+            obs.state_summary()[None], obs.state_nodes()[None]
+        )
+
+        return dict(zip(targets, actions))
+
+    def get_actions(
+        self,
+        state: Optional[Union[Sequence, Tuple[np.ndarray, ...]]] = None,
+        training: bool = False,
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Get next set of actions and targets for a single env and track.
+
+        :param state: A (summary, graph, nodes) observation. If None, or without the summary and nodes components (eg.
+                      from a wrapped env), they're read from the attached env.
+        """
+        if (
+            isinstance(state, Sequence)
+            and (len(state) == 3)
+            and (state[0] is not None)
+            and (state[2] is not None)
+        ):
+            ((actions, targets),) = self.get_batch_actions(
+                np.asarray(state[0])[None], np.asarray(state[2])[None]
+            )
+            self._step += 1
+            return actions, targets
+
+        return super().get_actions(state, training=training)
+
+    def save(self, fn: str) -> None:
+        self.model.save(fn)
+
+    @classmethod
+    def load(cls, fn: str, **kwargs) -> "NumpyDQNTargeted":
+        """Load a model saved with .save. kwargs (eg. actions, actions_per_turn) are passed to init."""
+        return cls(NumpyTargetedNN.load(fn), **kwargs)
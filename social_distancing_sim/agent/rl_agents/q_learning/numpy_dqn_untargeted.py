@@ -0,0 +1,106 @@
+from functools import reduce
+from typing import Callable, Dict, Iterable, List, Tuple, Union
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+from social_distancing_sim.environment.gym.gym_env import GymEnv
+
+
+class NumpyDQNUntargeted(NonLearningAgentBase):
+    """
+    Inference only version of a trained DQNUntargeted, with the model's forward pass in NumPy.
+
+    Doesn't import rlk or TensorFlow, and is cheap to clone and pickle, so is suited to evaluation with Sim and
+    MultiSim workers. Export from a trained agent with DQNUntargeted.to_numpy, or load a model saved with .save.
+
+    As with DQNUntargeted, the best action is repeated actions_per_turn times, and targets are left to the env. The env
+    is wrapped with the same env_wrappers the model was trained with when attached, so states match its inputs.
+    """
+
+    def __init__(
+        self,
+        model: NumpyDense,
+        *args,
+        env_wrappers: Iterable[Union[Callable, gym.Wrapper]] = (),
+        **kwargs,
+    ) -> None:
+        """
+        :param model: Exported action model.
+        :param env_wrappers: Wrappers the agent was trained with, applied to the env in order when it's attached.
+
+        Other args as NonLearningAgentBase.
+        """
+        self.model = model
+        self.env_wrappers = env_wrappers
+        super().__init__(*args, **kwargs)
+
+    def attach_to_env(
+        self, env_or_spec: Union[GymEnv, str, gym.envs.registration.EnvSpec]
+    ) -> None:
+        super().attach_to_env(env_or_spec)
+        self.env = reduce(
+            lambda inner_env, wrapper: wrapper(inner_env), self.env_wrappers, self.env
+        )
+
+    @property
+    def available_actions(self) -> List[int]:
+        return list(range(self.model.n_outputs))
+
+    def get_batch_actions(
+        self, states: np.ndarray
+    ) -> List[Tuple[List[int], List[int]]]:
+        """Best actions for a batch of (wrapped) states, eg. from a VecEnv, in one forward pass."""
+        best = self.model.predict(np.asarray(states).reshape(len(states), -1)).argmax(
+            axis=1
+        )
+
+        return [([int(a)] * self.actions_per_turn, []) for a in best]
+
+    def _wrapped_state(self) -> np.ndarray:
+        """The attached env's current observation, passed through its observation wrappers."""
+        wrappers = []
+        env = self.env
+        while isinstance(env, gym.Wrapper):
+            wrappers.append(env)
+            env = env.env
+
+        state = env.state
+        for wrapper in reversed(wrappers):
+            if isinstance(wrapper, gym.ObservationWrapper):
+                state = wrapper.observation(state)
+
+        return state
+
+    def _select_actions_targets(self) -> Dict[int, int]:
+        ((actions, _),) = self.get_batch_actions(
+            np.asarray(self._wrapped_state())[None]
+        )
+
+        # Targets are left to the env, as for untargeted actions passed to step
+        return self.env.unwrapped.sds_env.select_reasonable_targets(actions)
+
+    def get_actions(
+        self,
+        state: np.ndarray = None,
+        training: bool = False,
+    ) -> Tuple[List[int], List[int]]:
+        """Get next set of actions from the (wrapped) state, and track. If state is None, it's read from the env."""
+        if state is None:
+            return super().get_actions(training=training)
+
+        ((actions, targets),) = self.get_batch_actions(np.asarray(state)[None])
+        self._step += 1
+
+        return actions, targets
+
+    def save(self, fn: str) -> None:
+        """Save the model's weights to .npz. Wrappers aren't saved."""
+        self.model.save(fn)
+
+    @classmethod
+    def load(cls, fn: str, **kwargs) -> "NumpyDQNUntargeted":
+        """Load a model saved with .save. kwargs (eg. env_wrappers, actions_per_turn) are passed to init."""
+        return cls(NumpyDense.load(fn), **kwargs)
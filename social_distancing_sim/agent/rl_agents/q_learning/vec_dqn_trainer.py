@@ -0,0 +1,202 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.replay_buffer import ReplayBuffer
+from social_distancing_sim.environment.gym.vec_env import VecEnv
+
+
+def flatten_nodes(
+    obs: Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]
+) -> np.ndarray:
+    """(K, N * 6) flattened nodes of stacked VecEnv observations, as LimitObsWrapper(output=2) + FlattenObsWrapper."""
+    return obs[2].reshape(len(obs[2]), -1)
+
+
+def dqn_update(
+    model: Any, target_model: Optional[Any], batch: Dict[str, np.ndarray], gamma: float
+) -> float:
+    """
+    Train the model on a minibatch sampled from a ReplayBuffer, towards the DQN targets.
+
+    :param model: Model to train, with .predict_on_batch and .train_on_batch.
+    :param target_model: Model giving the values of the next observations. If None, model is used.
+    :param batch: Minibatch, see ReplayBuffer.sample.
+    :param gamma: Discount factor.
+    :return: Mean loss.
+    """
+    obs = batch["obs"].astype(np.float32)
+    target_model = model if target_model is None else target_model
+
+    targets = np.array(model.predict_on_batch(obs), dtype=np.float32)
+    next_values = np.asarray(
+        target_model.predict_on_batch(batch["next_obs"].astype(np.float32))
+    ).max(axis=1)
+    targets[np.arange(len(obs)), batch["actions"]] = batch["rewards"] + (
+        gamma * next_values * ~batch["dones"]
+    )
+
+    return float(np.mean(model.train_on_batch(obs, targets)))
+
+
+class DQNTrainerBase:
+    """
+    Learner side of the DQN trainers: minibatch updates from the replay buffer, with target model syncing, and
+    construction from an rlk agent.
+
+    Subclasses are dataclasses with model, target_model, gamma, batch_size, target_update_every and buffer fields, and
+    set ._random_state and ._n_updates in __post_init__.
+    """
+
+    @classmethod
+    def from_agent(cls, agent: Any, *args, **kwargs) -> "DQNTrainerBase":
+        """
+        Train the Keras models of an rlk based DQNUntargeted in place, with its gamma, minibatch size and actions per
+        turn. args (eg. the env) and kwargs are passed to init.
+        """
+        rlk_agent = agent.rlk_agent
+        rlk_agent.check_ready()
+        kwargs = {
+            "gamma": rlk_agent.gamma,
+            "batch_size": rlk_agent.replay_buffer_samples,
+            "actions_per_turn": agent.actions_per_turn,
+            **kwargs,
+        }
+
+        return cls(
+            *args,
+            model=rlk_agent._action_model,
+            target_model=rlk_agent._target_model,
+            **kwargs,
+        )
+
+    def _update(self) -> float:
+        batch = self.buffer.sample(self.batch_size, random_state=self._random_state)
+        loss = dqn_update(self.model, self.target_model, batch, gamma=self.gamma)
+
+        self._n_updates += 1
+        if (self.target_model is not None) and (
+            self._n_updates % self.target_update_every == 0
+        ):
+            self.target_model.set_weights(self.model.get_weights())
+
+        return loss
+
+
+@dataclass
+class VecDQNTrainer(DQNTrainerBase):
+    """
+    Train a Q model with experience collected from a batch of envs, stored in a NumPy ReplayBuffer.
+
+    Each step, actions for all K envs of the VecEnv are selected epsilon-greedily from a single batched prediction,
+    the envs are stepped, and the K transitions are written to the buffer in one go. Every train_every steps, a
+    minibatch is sampled and the model is trained towards the DQN targets, with the values of the next observations
+    from the target model. The target model's weights are copied from the model every target_update_every updates.
+
+    The models only need .predict_on_batch, .train_on_batch, .get_weights and .set_weights, so an rlk DQNUntargeted's
+    Keras models can be trained directly (see DQNTrainerBase.from_agent), and used with the agent afterwards.
+
+    Episodes end after the VecEnv's n_steps, and ends are treated as terminal (no bootstrapping), as by rlk's
+    DeepQAgent. Use a VecEnv with include_graph=False unless the observation function needs the graph.
+
+    :param vec_env: Batch of envs to collect experience from.
+    :param model: Q model to train, taking (B, obs size) float32 inputs and giving (B, n actions) values.
+    :param target_model: Model used for the next observation values. If None, model is used.
+    :param observation: Maps the stacked VecEnv observations to (K, obs size) model inputs. Defaults to the flattened
+                        nodes component.
+    :param buffer_size: Capacity of the replay buffer, in transitions.
+    :param memmap_dir: Optional dir to memory map the replay buffer in, see ReplayBuffer.
+    :param gamma: Discount factor.
+    :param batch_size: Minibatch size.
+    :param train_every: Env steps (of all K envs) between each minibatch update.
+    :param target_update_every: Updates between copying the model's weights to the target model.
+    :param learning_starts: Transitions to collect before training starts.
+    :param eps_initial: Initial exploration rate.
+    :param eps_min: Minimum exploration rate.
+    :param eps_decay: Multiplicative decay of the exploration rate per env step.
+    :param actions_per_turn: Number of times the selected action is repeated each turn, as DQNUntargeted.
+    :param seed: Seed for exploration and minibatch sampling.
+    """
+
+    vec_env: VecEnv
+    model: Any
+    target_model: Optional[Any] = None
+    observation: Callable[[Tuple[np.ndarray, ...]], np.ndarray] = flatten_nodes
+    buffer_size: int = 50000
+    memmap_dir: Optional[str] = None
+    gamma: float = 0.99
+    batch_size: int = 32
+    train_every: int = 1
+    target_update_every: int = 100
+    learning_starts: int = 1000
+    eps_initial: float = 0.3
+    eps_min: float = 0.01
+    eps_decay: float = 0.999
+    actions_per_turn: int = 1
+    seed: Optional[int] = None
+
+    buffer: Optional[ReplayBuffer] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        self._random_state = np.random.RandomState(self.seed)
+        self.eps = self.eps_initial
+        self._n_steps = 0
+        self._n_updates = 0
+        self._obs: Optional[np.ndarray] = None
+        self._episode_rewards = np.zeros(self.vec_env.n_envs)
+
+    def _prepare_buffer(self, obs: np.ndarray) -> None:
+        if self.buffer is None:
+            self.buffer = ReplayBuffer(
+                capacity=self.buffer_size,
+                obs_shape=obs.shape[1:],
+                obs_dtype=obs.dtype,
+                memmap_dir=self.memmap_dir,
+            )
+
+    def _select_actions(self, obs: np.ndarray) -> np.ndarray:
+        values = np.asarray(self.model.predict_on_batch(obs.astype(np.float32)))
+        actions = values.argmax(axis=1)
+        explore = self._random_state.uniform(size=len(actions)) < self.eps
+        actions[explore] = self._random_state.randint(
+            0, values.shape[1], size=explore.sum()
+        )
+
+        return actions
+
+    def train(self, n_steps: int) -> Dict[str, List[float]]:
+        """
+        Collect and train for n_steps steps of the VecEnv (n_steps * K transitions). Can be called repeatedly to
+        continue training.
+
+        :return: Dict with the total rewards of the episodes completed and the losses of the updates made.
+        """
+        if self._obs is None:
+            self._obs = self.observation(self.vec_env.reset())
+            self._prepare_buffer(self._obs)
+
+        history = {"episode_rewards": [], "losses": []}
+        for _ in range(n_steps):
+            actions = self._select_actions(self._obs)
+            obs, rewards, dones, _, _ = self.vec_env.step(
+                np.repeat(actions[:, None], self.actions_per_turn, axis=1)
+            )
+            next_obs = self.observation(obs)
+            # On done, next_obs is the first of the next episode, but it isn't bootstrapped from
+            self.buffer.add(self._obs, actions, rewards, dones, next_obs)
+            # Without copies, the VecEnv overwrites its observation buffers on the next step
+            self._obs = next_obs if self.vec_env.copy else next_obs.copy()
+
+            self._episode_rewards += rewards
+            history["episode_rewards"].extend(self._episode_rewards[dones].tolist())
+            self._episode_rewards[dones] = 0
+
+            self._n_steps += 1
+            self.eps = max(self.eps_min, self.eps * self.eps_decay)
+            if (len(self.buffer) >= self.learning_starts) and (
+                self._n_steps % self.train_every == 0
+            ):
+                history["losses"].append(self._update())
+
+        return history
@@ -0,0 +1,106 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class ReplayBuffer:
+    """
+    Fixed size ring buffer of (obs, action, reward, done, next obs) transitions, in preallocated NumPy arrays.
+
+    Observations are stored in a compact dtype (the int8 of the nodes observation, by default) rather than as objects,
+    and batches of transitions (eg. one from each env in a VecEnv) are written with a single slice assignment. Once
+    full, the oldest transitions are overwritten. Minibatches are sampled with index arrays.
+
+    For buffers too large for memory, set memmap_dir to back the arrays with .npy files there (see np.memmap), which
+    the OS pages in and out as needed.
+
+    :param capacity: Maximum number of transitions.
+    :param obs_shape: Shape of a single observation, eg. (N * 6,) for flattened nodes.
+    :param obs_dtype: Observation dtype.
+    :param memmap_dir: Optional dir to create the memory mapped arrays in.
+    """
+
+    capacity: int
+    obs_shape: Tuple[int, ...]
+    obs_dtype: np.dtype = np.int8
+    memmap_dir: Optional[str] = None
+
+    _next: int = field(init=False, default=0)
+    _size: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.obs_shape = tuple(self.obs_shape)
+        self.obs = self._array("obs", self.obs_shape, self.obs_dtype)
+        self.next_obs = self._array("next_obs", self.obs_shape, self.obs_dtype)
+        self.actions = self._array("actions", (), np.int16)
+        self.rewards = self._array("rewards", (), np.float32)
+        self.dones = self._array("dones", (), bool)
+
+    def _array(self, name: str, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        shape = (self.capacity,) + shape
+        if self.memmap_dir is None:
+            return np.zeros(shape, dtype=dtype)
+
+        os.makedirs(self.memmap_dir, exist_ok=True)
+        return np.lib.format.open_memmap(
+            os.path.join(self.memmap_dir, f"{name}.npy"),
+            mode="w+",
+            dtype=dtype,
+            shape=shape,
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def add(
+        self,
+        obs: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        dones: np.ndarray,
+        next_obs: np.ndarray,
+    ) -> None:
+        """Add a batch of B transitions, each arg has a leading dimension of B."""
+        n = len(actions)
+        if n > self.capacity:
+            # Only the last capacity would survive anyway
+            obs, actions, rewards, dones, next_obs = (
+                a[-self.capacity :] for a in (obs, actions, rewards, dones, next_obs)
+            )
+            n = self.capacity
+
+        idx = (self._next + np.arange(n)) % self.capacity
+        self.obs[idx] = obs
+        self.next_obs[idx] = next_obs
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.dones[idx] = dones
+
+        self._next = int((self._next + n) % self.capacity)
+        self._size = min(self._size + n, self.capacity)
+
+    def sample(
+        self, n: int, random_state: Optional[np.random.RandomState] = None
+    ) -> Dict[str, np.ndarray]:
+        """Sample n transitions uniformly, with replacement."""
+        if self._size == 0:
+            raise ValueError("Can't sample from an empty buffer.")
+        if random_state is None:
+            random_state = np.random
+
+        idx = random_state.randint(0, self._size, size=n)
+
+        return {
+            "obs": self.obs[idx],
+            "actions": self.actions[idx],
+            "rewards": self.rewards[idx],
+            "dones": self.dones[idx],
+            "next_obs": self.next_obs[idx],
+        }
@@ -1,10 +1,16 @@
 from social_distancing_sim.environment.action_space import ActionSpace as ActionSpace
+from social_distancing_sim.environment.centrality import (
+    CentralityIndex as CentralityIndex,
+)
 from social_distancing_sim.environment.disease import Disease as Disease
 from social_distancing_sim.environment.environment import Environment as Environment
 from social_distancing_sim.environment.environment_plotting import (
     EnvironmentPlotting as EnvironmentPlotting,
 )
 from social_distancing_sim.environment.graph import Graph as Graph
+from social_distancing_sim.environment.graph_rasterizer import (
+    GraphRasterizer as GraphRasterizer,
+)
 from social_distancing_sim.environment.healthcare import Healthcare as Healthcare
 from social_distancing_sim.environment.history import History as History
 from social_distancing_sim.environment.observation_space import (
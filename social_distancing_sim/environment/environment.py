@@ -1,3 +1,4 @@
+import dataclasses
 import logging
 import os
 import pprint
@@ -16,6 +17,7 @@ from social_distancing_sim.environment.healthcare import Healthcare
 from social_distancing_sim.environment.history import History
 from social_distancing_sim.environment.observation_space import ObservationSpace
 from social_distancing_sim.environment.scoring import Scoring
+from social_distancing_sim.environment.seeding import derive_named_seeds
 
 
 @dataclass
@@ -36,6 +38,15 @@ class Environment:
 
     _log_to_file: bool = field(init=False)
 
+    # Components given independent seeds by .reseed. Append new components, so existing ones keep their seeds.
+    seed_components = (
+        "environment",
+        "disease",
+        "action_space",
+        "observation_space",
+        "graph",
+    )
+
     def __post_init__(self) -> None:
         # Output path is only used for log file, so it's prepared along with the logger
         # (Plot path is handled in EnvironmentPlotting)
@@ -107,6 +118,44 @@ class Environment:
     def _prepare_random_state(self) -> None:
         self._random_state = np.random.RandomState(seed=self.seed)
 
+    def reseed(self, seed: Optional[int], regenerate_graph: bool = False) -> None:
+        """
+        Reseed all the random components of the environment from a single seed.
+
+        Seeds for each of the components in .seed_components are derived from the seed with a SeedSequence tree (see
+        seeding.derive_named_seeds), so they're independent of each other and reproducible from the single seed. Envs
+        reseeded with the same seed draw the same graph, disease, testing and random infection streams, regardless of
+        how they're acted on (common random numbers). The graph structure is kept unless regenerate_graph is True, as
+        regenerating it is expensive.
+
+        Should be called before the first step.
+
+        :param seed: Seed to derive component seeds from. If None, seeds are derived from fresh entropy.
+        :param regenerate_graph: If True, also generate a new graph (with the same parameters) from the derived seed.
+        """
+        seeds = derive_named_seeds(seed, self.seed_components)
+
+        self.seed = seeds["environment"]
+        self._prepare_random_state()
+        self.disease.seed = seeds["disease"]
+        self.disease._prepare_random_state()
+        self.action_space.seed = seeds["action_space"]
+        self.action_space._prepare_random_state()
+
+        if regenerate_graph:
+            self.observation_space.graph = dataclasses.replace(
+                self.observation_space.graph, seed=seeds["graph"]
+            )
+            self.observation_space._attach_status_to_graph()
+            self.total_population = self.observation_space.graph.total_population
+        else:
+            self.observation_space.graph._random_state = np.random.RandomState(
+                seed=seeds["graph"]
+            )
+        self.observation_space.seed = seeds["observation_space"]
+        self.observation_space._prepare_random_state()
+        self.observation_space.reset_cached_values()
+
     def _infect_random(self) -> None:
         """Infect a random node, if possible."""
         if len(self.observation_space.graph.current_clear_nodes) > 0:
@@ -10,6 +10,7 @@ import numpy as np
 import seaborn as sns
 from matplotlib import pyplot as plt
 
+from social_distancing_sim.environment.graph_rasterizer import GraphRasterizer
 from social_distancing_sim.environment.healthcare import Healthcare
 from social_distancing_sim.environment.history import History
 from social_distancing_sim.environment.observation_space import ObservationSpace
@@ -17,6 +18,15 @@ from social_distancing_sim.environment.observation_space import ObservationSpace
 
 @dataclass
 class EnvironmentPlotting:
+    """
+    Handles plotting of environment state and time series, and replay.
+
+    :param render_mode: How to draw the network graph. "networkx" draws each node and edge with networkx. "raster"
+                        renders into a fixed size image with GraphRasterizer, which is much faster for large
+                        populations (cost is bounded by image size rather than edge count).
+    :param raster_resolution: Width and height of the image used in "raster" render mode, in pixels.
+    """
+
     name: str = None
     both: bool = True
     auto_lim_x: bool = True
@@ -25,6 +35,8 @@ class EnvironmentPlotting:
     ts_fields_g2: List[str] = None
     ts_obs_fields_g1: List[str] = None
     ts_obs_fields_g2: List[str] = None
+    render_mode: str = "networkx"
+    raster_resolution: int = 512
 
     output_path: str = field(init=False)
     graph_path: str = field(init=False)
@@ -33,6 +45,12 @@ class EnvironmentPlotting:
         self.output_path: Union[str, None] = None
         self.graph_path: Union[str, None] = None
 
+        if self.render_mode not in ("networkx", "raster"):
+            raise ValueError(
+                f"Invalid render mode {self.render_mode}, pick from 'networkx' or 'raster'."
+            )
+        self._rasterizer = GraphRasterizer(resolution=self.raster_resolution)
+
         sns.set()
 
     def set_output_path(self, path: str) -> None:
@@ -184,14 +202,26 @@ class EnvironmentPlotting:
                     show=False,
                 )
 
+    def _plot_graph(
+        self,
+        obs: ObservationSpace,
+        ax: plt.Axes,
+        colours: Dict[str, str] = None,
+        god_mode: bool = True,
+    ) -> None:
+        if self.render_mode == "raster":
+            self._rasterizer.plot(obs, ax=ax, colours=colours, god_mode=god_mode)
+        else:
+            obs.plot(ax=ax, colours=colours, god_mode=god_mode)
+
     def plot_graphs(
         self, obs: ObservationSpace, title: str, colours: Dict[str, str] = None
     ):
-        obs.plot(ax=self._graph_ax[0], colours=colours, god_mode=True)
+        self._plot_graph(obs, ax=self._graph_ax[0], colours=colours, god_mode=True)
         self._graph_ax[0].set_title(f"Full sim: {title}", fontsize=14)
 
         if (obs.test_rate < 1) & self.both:
-            obs.plot(ax=self._graph_ax[1], colours=colours, god_mode=False)
+            self._plot_graph(obs, ax=self._graph_ax[1], colours=colours, god_mode=False)
             self._graph_ax[1].set_title(f"Observed: {title}")
 
     def plot_matrices(self):
@@ -6,6 +6,8 @@ import networkx as nx
 import numpy as np
 import seaborn as sns
 
+from social_distancing_sim.environment.centrality import CentralityIndex
+
 
 @dataclass
 class Graph:
@@ -29,6 +31,7 @@ class Graph:
     _current_alive_nodes: Optional[List[int]] = field(init=False, default=None)
     _current_dead_nodes: Optional[List[int]] = field(init=False, default=None)
     _current_masked_nodes: Optional[List[int]] = field(init=False, default=None)
+    _centrality: Optional[CentralityIndex] = field(init=False, default=None)
 
     def __post_init__(self):
         self._prepare_random_state()
@@ -67,7 +70,7 @@ class Graph:
 
     def state_graph(self) -> np.ndarray:
         """Node x node matrix representing graph."""
-        return nx.convert_matrix.to_numpy_array(self.g_, dtype=np.int16)
+        return nx.convert_matrix.to_numpy_array(self.g_, dtype=np.int8)
 
     def state_nodes(self) -> np.ndarray:
         """Node x node_state matrix."""
@@ -82,6 +85,18 @@ class Graph:
         """.state_nodes + .state_graph"""
         return np.concatenate([self.state_nodes(), self.state_graph()], axis=1)
 
+    @property
+    def centrality(self) -> CentralityIndex:
+        """
+        Centrality index of the graph. Built on first access, then updated as nodes are isolated and reconnected.
+
+        Unlike the cached node lists, this isn't reset each step.
+        """
+        if self._centrality is None:
+            self._centrality = CentralityIndex.from_graph(self.g_)
+
+        return self._centrality
+
     @property
     def total_population(self) -> int:
         return len(self.g_.nodes)
@@ -94,6 +109,7 @@ class Graph:
             p_out=self.community_p_out,
             seed=self.seed,
         )
+        self._centrality = None
 
         for _, nv in self.g_.nodes.data():
             nv["infected"] = 0
@@ -203,6 +219,8 @@ class Graph:
         node["_edges"] += to_remove
 
         self.g_.remove_edges_from(to_remove)
+        if self._centrality is not None:
+            self._centrality.remove_edges(to_remove)
 
     def reconnect_node(self, node_id: int, effectiveness: float = 0.95) -> None:
         """
@@ -223,6 +241,8 @@ class Graph:
                 leave.append(uv)
 
         self.g_.add_edges_from(to_add)
+        if self._centrality is not None:
+            self._centrality.add_edges(to_add)
         node["_edges"] = leave
         if len(node["_edges"]) == 0:
             node["isolated"] = False
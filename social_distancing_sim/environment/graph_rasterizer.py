@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+from matplotlib.colors import to_rgb
+
+from social_distancing_sim.environment.graph import Graph
+from social_distancing_sim.environment.observation_space import ObservationSpace
+
+
+@dataclass
+class GraphRasterizer:
+    """
+    Render the network graph into a fixed resolution image buffer, rather than drawing with networkx.
+
+    Edges are accumulated into a 2D histogram of points sampled along each edge and shaded by (log) density. Nodes are
+    drawn as small coloured squares on top, in the same order and with the same colours as ObservationSpace.plot. The
+    cost of drawing is bounded by the image size rather than the number of edges, which makes it usable for
+    populations where drawing each edge as a line is unreadable and very slow.
+
+    :param resolution: Width and height of the image buffer, in pixels.
+    :param edge_samples: Number of points sampled along each edge when accumulating edge density.
+    :param node_radius: Half width of the square drawn for each node, in pixels. 0 draws single pixels.
+    :param edge_colour: Colour used to shade edge density.
+    :param edge_max_alpha: Opacity of edge shading in the densest pixel.
+    :param chunk_size: Number of edges to sample at once. Limits memory use for very large graphs.
+    """
+
+    resolution: int = 512
+    edge_samples: int = 16
+    node_radius: int = 1
+    edge_colour: str = "k"
+    edge_max_alpha: float = 0.6
+    chunk_size: int = 2**16
+
+    def _layout(self, graph: Graph) -> Dict[int, np.ndarray]:
+        """
+        Position nodes, but only if they haven't been before.
+
+        Shares the position cache with ObservationSpace.plot, so switching render modes doesn't move nodes. If no
+        positions are available, uses a cheap community layout: communities are placed on a circle and their members
+        are scattered in a disk around the community centre. This is O(n), unlike spring_layout.
+        """
+        if graph.g_pos_ is None:
+            partition: List[set] = graph.g_.graph.get(
+                "partition", [set(graph.g_.nodes)]
+            )
+            state = np.random.RandomState(seed=graph.seed)
+            angles = np.linspace(0, 2 * np.pi, len(partition), endpoint=False)
+            community_radius = np.pi / max(len(partition), 2)
+
+            pos = {}
+            for angle, community in zip(angles, partition):
+                nodes = sorted(community)
+                r = community_radius * np.sqrt(state.uniform(size=len(nodes)))
+                theta = state.uniform(0, 2 * np.pi, size=len(nodes))
+                xy = np.stack(
+                    [
+                        np.cos(angle) + r * np.cos(theta),
+                        np.sin(angle) + r * np.sin(theta),
+                    ],
+                    axis=1,
+                )
+                pos.update(dict(zip(nodes, xy)))
+
+            graph.g_pos_ = pos
+
+        return graph.g_pos_
+
+    def _pixel_coords(self, graph: Graph) -> Tuple[np.ndarray, Dict[int, int]]:
+        """Return (n_nodes, 2) integer pixel coordinates, and a map from node id to row."""
+        pos = self._layout(graph)
+        node_ids = list(graph.g_.nodes)
+        index = {n: i for i, n in enumerate(node_ids)}
+        xy = np.array([pos[n] for n in node_ids], dtype=float).reshape(-1, 2)
+
+        if len(xy) > 0:
+            lo = xy.min(axis=0)
+            span = np.maximum(xy.max(axis=0) - lo, 1e-9)
+            # Leave a margin so nodes on the edge are fully drawn
+            margin = self.node_radius + 1
+            xy = (xy - lo) / span * (self.resolution - 1 - 2 * margin) + margin
+
+        return np.round(xy).astype(np.int32), index
+
+    def _edge_density(
+        self, g: nx.Graph, coords: np.ndarray, index: Dict[int, int]
+    ) -> np.ndarray:
+        """Accumulate points sampled along each edge into a (resolution, resolution) histogram."""
+        density = np.zeros((self.resolution, self.resolution), dtype=np.float64)
+        edges = np.array(
+            [(index[u], index[v]) for u, v in g.edges], dtype=np.int64
+        ).reshape(-1, 2)
+        t = np.linspace(0, 1, self.edge_samples).reshape(1, -1, 1)
+
+        for start in range(0, len(edges), self.chunk_size):
+            chunk = edges[start : start + self.chunk_size]
+            a = coords[chunk[:, 0]][:, None, :]
+            b = coords[chunk[:, 1]][:, None, :]
+            points = np.round(a + (b - a) * t).astype(np.int64).reshape(-1, 2)
+            density += np.bincount(
+                points[:, 1] * self.resolution + points[:, 0],
+                minlength=self.resolution**2,
+            ).reshape(self.resolution, self.resolution)
+
+        return density
+
+    def _draw_nodes(
+        self,
+        image: np.ndarray,
+        coords: np.ndarray,
+        colour: Union[str, Tuple[float, ...]],
+        radius: int,
+    ) -> None:
+        if len(coords) == 0:
+            return
+
+        offsets = np.arange(-radius, radius + 1)
+        dx, dy = np.meshgrid(offsets, offsets)
+        xs = np.clip(coords[:, 0:1] + dx.reshape(1, -1), 0, self.resolution - 1)
+        ys = np.clip(coords[:, 1:2] + dy.reshape(1, -1), 0, self.resolution - 1)
+        image[ys.ravel(), xs.ravel()] = to_rgb(colour)
+
+    def rasterize(
+        self,
+        obs: ObservationSpace,
+        colours: Dict[str, str] = None,
+        god_mode: bool = True,
+    ) -> np.ndarray:
+        """
+        Render the full or observed network graph into an RGB image buffer.
+
+        :param obs: ObservationSpace to render.
+        :param colours: Colours to use for plots, for example, from defaults set in history, if available.
+        :param god_mode: If True, by-pass observation space filters and render the whole environments state. If False,
+                         render the observable graph only.
+        :return: (resolution, resolution, 3) float array with values in [0, 1]. Row 0 is the bottom of the image.
+        """
+        if colours is None:
+            colours = {}
+
+        coords, index = self._pixel_coords(obs.graph)
+
+        # Background and edge shading
+        image = np.ones((self.resolution, self.resolution, 3), dtype=np.float64)
+        density = self._edge_density(obs.graph.g_, coords, index)
+        if density.max() > 0:
+            alpha = np.log1p(density) / np.log1p(density.max()) * self.edge_max_alpha
+            image = (
+                image * (1 - alpha[..., None])
+                + np.array(to_rgb(self.edge_colour)) * alpha[..., None]
+            )
+
+        def rows(nodes: List[int]) -> np.ndarray:
+            return coords[np.array([index[n] for n in nodes], dtype=np.int64)]
+
+        if god_mode:
+            info_source = obs.graph
+        else:
+            info_source = obs
+            self._draw_nodes(
+                image,
+                rows(obs.unknown_nodes),
+                colours.get("Unknown", "#bdbcbb"),
+                self.node_radius,
+            )
+
+        # Draw in the same order as ObservationSpace.plot, later sets are drawn on top
+        for pk, pv in {
+            "Known current clear": (info_source.current_clear_nodes, "#1f77b4"),
+            "Known total immune": (info_source.current_immune_nodes, "#9467bd"),
+            "Known current infections": (info_source.current_infected_nodes, "#d62728"),
+            "Total deaths": (obs.graph.current_dead_nodes, "k"),
+        }.items():
+            self._draw_nodes(
+                image, rows(pv[0]), colours.get(pk, pv[1]), self.node_radius
+            )
+
+        # Mask indicators
+        self._draw_nodes(image, rows(info_source.current_masked_nodes), "k", 0)
+
+        return image
+
+    def plot(
+        self,
+        obs: ObservationSpace,
+        ax: Union[None, plt.Axes] = None,
+        colours: Dict[str, str] = None,
+        god_mode: bool = True,
+    ) -> plt.Axes:
+        """Rasterize and draw the image on an axis. See .rasterize for parameters."""
+        if ax is None:
+            ax = plt.gca()
+
+        ax.imshow(
+            self.rasterize(obs, colours=colours, god_mode=god_mode),
+            origin="lower",
+            interpolation="nearest",
+        )
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.grid(False)
+
+        return ax
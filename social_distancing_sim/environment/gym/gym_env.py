@@ -1,11 +1,12 @@
 import copy
 import os
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import gym
 import numpy as np
 
 from social_distancing_sim.environment import Environment
+from social_distancing_sim.environment.gym.lazy_observation import LazyObservation
 from social_distancing_sim.templates.template_base import TemplateBase
 
 
@@ -14,6 +15,8 @@ class GymEnv(gym.Env):
 
     template: TemplateBase
     sds_env: Environment
+    # Indexes of the observation components to build, set by observation wrappers. None builds all.
+    observation_components: Optional[Tuple[int, ...]] = None
 
     def __init__(self, env: Union[Environment, None] = None, save_dir: str = ""):
         """
@@ -31,12 +34,15 @@ class GymEnv(gym.Env):
         self._set_internal_env(env)
         self._set_observation_space()
         self._set_action_space()
+        self._set_state()
 
     def _set_internal_env(self, env: Union[Environment, None] = None) -> None:
         """Can either build using custom supplied env, or from set in child template (eg., registered envs)."""
         if env is None:
             env = self.template.build()
         self.sds_env: Environment = env
+        # Keep an un-stepped copy to reset from
+        self._initial_env: Environment = env.clone()
 
         # Set the new save paths
         self.save_path = os.path.join(self.sds_env.name, self.save_dir)
@@ -46,14 +52,19 @@ class GymEnv(gym.Env):
         total_pop = self.sds_env.observation_space.graph.total_population
         self.observation_space = gym.spaces.tuple.Tuple(
             (
-                gym.spaces.box.Box(low=0, high=total_pop, shape=(6,), dtype=np.int16),
+                gym.spaces.box.Box(low=0, high=total_pop, shape=(7,), dtype=np.int16),
                 gym.spaces.box.Box(
                     low=0, high=1, shape=(total_pop, total_pop), dtype=np.int8
                 ),
-                gym.spaces.box.Box(low=0, high=1, shape=(total_pop, 5), dtype=np.int8),
+                gym.spaces.box.Box(low=0, high=1, shape=(total_pop, 6), dtype=np.int8),
             )
         )
 
+    def _set_state(self) -> None:
+        self._state = LazyObservation(
+            self.sds_env, components=self.observation_components
+        )
+
     def _set_action_space(self) -> None:
         self.action_space = gym.spaces.discrete.Discrete(n=5)
 
@@ -65,9 +76,7 @@ class GymEnv(gym.Env):
     def step(
         self,
         actions_targets: Union[int, Tuple[List[int], List[Union[int, None]]]],
-    ) -> Tuple[
-        Tuple[np.ndarray, np.ndarray, np.ndarray], float, bool, None, Dict[Any, Any]
-    ]:
+    ) -> Tuple[LazyObservation, float, bool, None, Dict[Any, Any]]:
         """
         Step with actions and targets.
 
@@ -86,16 +95,49 @@ class GymEnv(gym.Env):
             actions_targets = ([actions_targets], [])
         actions, targets = actions_targets
 
+        # Keep the last observation valid for callers that hold on to it. It's a plain tuple if the env was unpickled.
+        if isinstance(self._state, LazyObservation):
+            self._state.freeze()
         info, reward, done = self.sds_env.step(actions=actions, targets=targets)
+        self._set_state()
+
         return self.state, reward, done, None, info
 
     @property
-    def state(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        return self.sds_env.observation_space.state
+    def state(self) -> LazyObservation:
+        """
+        The (summary, graph, nodes) observation tuple for the current step. Components are computed on access and
+        cached, see LazyObservation.
+        """
+        return self._state
 
-    def reset(self, **kwargs) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        self.sds_env = self.sds_env.clone()
-        return self.state
+    @property
+    def fixed_graph(self) -> bool:
+        """True if the graph is generated from a fixed seed, so is the same every time the env is built."""
+        return self._initial_env.observation_space.graph.seed is not None
+
+    def reset(
+        self,
+        seed: Optional[int] = None,
+        options: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Tuple[LazyObservation, Dict[str, Any]]:
+        """
+        Reset to a fresh copy of the initial environment, returns (observation, info) as expected by gym wrappers.
+
+        :param seed: If set, reseed the environment's random components for this episode, see Environment.reseed.
+        :param options: Supports {"regenerate_graph": True}, to also generate a new graph from the seed.
+        """
+        self.sds_env = self._initial_env.clone()
+        if seed is not None:
+            regenerate_graph = (options or {}).get("regenerate_graph", False)
+            self.sds_env.reseed(seed, regenerate_graph=regenerate_graph)
+            if regenerate_graph:
+                # Population size can change
+                self._set_observation_space()
+        self._set_state()
+
+        return self.state, {}
 
     def replay(self):
         self.sds_env.replay()
@@ -0,0 +1,132 @@
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+import gym
+import numpy as np
+
+from social_distancing_sim.environment.environment import Environment
+
+
+class LazyObservation(tuple):
+    """
+    Observation tuple of (summary, graph, nodes) arrays, where each component is only computed when accessed.
+
+    Computed components are cached, so repeated access in the same step is free. Components that aren't accessed, for
+    example the dense graph matrix when using SummaryObservationWrapper, are never built.
+
+    Indexing always computes the requested component. Iterating (including unpacking, tuple(obs) and gym's
+    observation_space.contains) only builds the components declared in .components, and yields None for the rest. By
+    default all components are declared.
+
+    This is a tuple, so it can be used (and stored) anywhere the plain observation tuple is. The env calls .freeze
+    before it steps again, which computes the declared components that haven't been accessed yet, so observations
+    stay valid after the step. Only undeclared components that weren't accessed in time raise a RuntimeError.
+    """
+
+    component_names = ("summary", "graph", "nodes")
+
+    def __new__(
+        cls, env: Environment, components: Optional[Tuple[int, ...]] = None
+    ) -> "LazyObservation":
+        # The tuple's own items are placeholders, components are always read through ._get
+        return super().__new__(cls, (None,) * len(cls.component_names))
+
+    def __init__(
+        self, env: Environment, components: Optional[Tuple[int, ...]] = None
+    ) -> None:
+        """
+        :param env: Environment to take the observation from.
+        :param components: Indexes of the components to build when iterating. Defaults to all.
+        """
+        self._env = env
+        self._step = env._step
+        self.components = (
+            tuple(range(len(self.component_names)))
+            if components is None
+            else tuple(components)
+        )
+        self._cache: List[Union[np.ndarray, None]] = [None] * len(self.component_names)
+
+    def _compute(self, idx: int) -> np.ndarray:
+        if (self._env is None) or (self._env._step != self._step):
+            raise RuntimeError(
+                f"Observation from step {self._step} is stale, component {self.component_names[idx]} isn't declared "
+                f"and wasn't computed before the env stepped."
+            )
+
+        obs = self._env.observation_space
+        return (obs.state_summary, obs.state_graph, obs.state_nodes)[idx]()
+
+    def _get(self, idx: int) -> np.ndarray:
+        if self._cache[idx] is None:
+            self._cache[idx] = self._compute(idx)
+
+        return self._cache[idx]
+
+    def freeze(self) -> None:
+        """Compute the remaining declared components and release the env, called before the env steps again."""
+        if self._env is not None:
+            for i in self.components:
+                self._get(i)
+            self._env = None
+
+    def __getitem__(
+        self, idx: Union[int, slice]
+    ) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
+        if isinstance(idx, slice):
+            return tuple(self._get(i) for i in range(len(self))[idx])
+
+        return self._get(range(len(self))[idx])
+
+    def __iter__(self) -> Iterator[Union[np.ndarray, None]]:
+        for i in range(len(self)):
+            yield self._get(i) if i in self.components else None
+
+    def __contains__(self, item: Any) -> bool:
+        return any(item is c for c in self)
+
+    def __eq__(self, other: Any) -> bool:
+        return tuple(self) == other
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"LazyObservation(step={self._step}, components={self.components})"
+
+    @property
+    def summary(self) -> np.ndarray:
+        return self._get(0)
+
+    @property
+    def graph(self) -> np.ndarray:
+        return self._get(1)
+
+    @property
+    def nodes(self) -> np.ndarray:
+        return self._get(2)
+
+    def materialise(self) -> Tuple[Union[np.ndarray, None], ...]:
+        """Build the declared components and return as a plain tuple."""
+        return tuple(self)
+
+    def __reduce__(self):
+        # Pickle (and copy) as the plain tuple rather than keeping a reference to the whole env
+        return tuple, (self.materialise(),)
+
+
+def declare_observation_components(env: gym.Env, components: Tuple[int, ...]) -> None:
+    """
+    Declare the observation components an observation wrapper needs from the underlying GymEnv.
+
+    Only the innermost wrapper's declaration applies, as outer wrappers index into its output rather than the original
+    observation. The GymEnv's current observation was built before the wrapper, so the declaration is applied to it
+    too, otherwise freezing it on the next step would build every component.
+    """
+    unwrapped = env.unwrapped
+    if getattr(unwrapped, "observation_components", None) is None:
+        unwrapped.observation_components = tuple(components)
+        state = getattr(unwrapped, "_state", None)
+        if isinstance(state, LazyObservation):
+            state.components = unwrapped.observation_components
@@ -0,0 +1,340 @@
+import multiprocessing as mp
+import traceback
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import gym
+import numpy as np
+from gym.envs.registration import EnvSpec
+
+from social_distancing_sim.environment.gym.gym_env import GymEnv
+from social_distancing_sim.environment.gym.vec_env import BatchActionsTargets, VecEnv
+from social_distancing_sim.environment.seeding import derive_seeds
+
+# Entries of the sub-envs' info dicts that aren't sent back from the workers. They reference the sub-env's internal
+# ObservationSpace, History and Healthcare, which are large and keep growing.
+_UNSHARED_INFO_KEYS = ("obs", "history", "healthcare")
+
+
+class _WorkerError:
+    """Sent to the parent in place of a reply when a worker raises, the parent re-raises it."""
+
+    def __init__(self, formatted_traceback: str) -> None:
+        self.formatted_traceback = formatted_traceback
+
+
+def _attach(
+    name: str, shape: Tuple[int, ...], dtype: type
+) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(name=name)
+    # The parent owns (and unlinks) the block, stop this process's tracker trying to clean it up on exit too.
+    resource_tracker.unregister(shm._name, "shared_memory")
+
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _shareable_info(info: Dict[str, Any], include_graph: bool) -> Dict[str, Any]:
+    """A sub-env's info without the _UNSHARED_INFO_KEYS, and with any final observation as a plain tuple."""
+    shared = {k: v for k, v in info.items() if k not in _UNSHARED_INFO_KEYS}
+    if "final_observation" in shared:
+        obs = shared["final_observation"]
+        shared["final_observation"] = (
+            obs[0],
+            obs[1] if include_graph else None,
+            obs[2],
+        )
+
+    return shared
+
+
+def _worker(
+    remote: Connection,
+    parent_remote: Connection,
+    env: Union[EnvSpec, Type[GymEnv]],
+    n_envs: int,
+    n_steps: Optional[int],
+    include_graph: bool,
+    seed: int,
+) -> None:
+    """
+    Worker process loop. Owns a VecEnv of n_envs sub-envs, which writes observations directly into its slice of the
+    shared buffers.
+
+    Exceptions are sent to the parent (as a _WorkerError with the formatted traceback) in place of the reply, then the
+    worker exits.
+    """
+    parent_remote.close()
+    vec_env, buffers, arr, handles = None, [], None, []
+    try:
+        vec_env = VecEnv(
+            env,
+            n_envs=n_envs,
+            n_steps=n_steps,
+            copy=False,
+            include_graph=include_graph,
+            seed=seed,
+        )
+        remote.send((vec_env.total_population, vec_env.n_steps))
+
+        # Swap the VecEnv's own buffers for views into this worker's slice of the shared buffers
+        for spec in remote.recv():
+            if spec is None:
+                buffers.append(None)
+                continue
+            name, shape, dtype, lo, hi = spec
+            shm, arr = _attach(name, shape, dtype)
+            handles.append(shm)
+            buffers.append(arr[lo:hi])
+        vec_env._buffers = tuple(buffers)
+        remote.send(None)
+
+        while True:
+            cmd, data = remote.recv()
+            if cmd == "step":
+                _, rewards, dones, _, infos = vec_env.step(data)
+                remote.send(
+                    (
+                        rewards,
+                        dones,
+                        [_shareable_info(info, include_graph) for info in infos],
+                    )
+                )
+            elif cmd == "reset":
+                vec_env.reset()
+                remote.send(None)
+            elif cmd == "close":
+                break
+            else:
+                raise NotImplementedError(f"Unknown command {cmd}")
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        try:
+            remote.send(_WorkerError(traceback.format_exc()))
+        except (BrokenPipeError, EOFError):
+            pass
+    finally:
+        # Release views before closing the blocks they're built on
+        vec_env = buffers = arr = None
+        for shm in handles:
+            shm.close()
+        remote.close()
+
+
+class SubprocVecEnv:
+    """
+    Step a batch of K GymEnvs spread over multiple worker processes.
+
+    Each worker owns a subset of the sub-envs (as a VecEnv) and writes the state_summary and state_nodes components of
+    their observations directly into shared memory buffers. Only actions, and rewards and dones, are sent over the
+    pipes between processes, so no observations are pickled on each step. Sub-envs are automatically reset when done,
+    as in VecEnv.
+
+    Observations are returned as views into the shared buffers, which are overwritten on the next call to .step or
+    .reset. Copy them if they need to be kept.
+
+    The (K, N, N) graph component is large and isn't shared by default, it's returned as None unless include_graph is
+    True. Each sub-env's info dict is returned from its worker without the entries referencing the sub-env's
+    internals (the ObservationSpace, History and Healthcare). Final observations of sub-envs that were done are
+    included, as plain tuples.
+
+    Exceptions raised in the workers are re-raised in this process as RuntimeErrors with the worker's traceback, and
+    the workers are stopped.
+    """
+
+    def __init__(
+        self,
+        env: Union[str, EnvSpec, Type[GymEnv]],
+        n_envs: int,
+        n_workers: Optional[int] = None,
+        n_steps: Optional[int] = None,
+        include_graph: bool = False,
+        start_method: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        :param env: Registered env id, EnvSpec or GymEnv class (eg. SDS746) to build the sub-envs from.
+        :param n_envs: Number of sub-envs, K.
+        :param n_workers: Number of worker processes. Defaults to the number of cpus, and is capped at n_envs.
+        :param n_steps: Episode length for each sub-env, see VecEnv.
+        :param include_graph: If True, also share the (K, N, N) graph component of the observations.
+        :param start_method: multiprocessing start method, eg. "fork", "spawn". Defaults to the platform default.
+        :param seed: Seed for the episode seeds of all sub-envs, see VecEnv. Each worker gets its own derived seed.
+        """
+        if isinstance(env, str):
+            # Specs can be sent to workers using any start method, the registry might not be available in them
+            env = gym.spec(env)
+
+        self.n_envs = n_envs
+        self.n_workers = min(
+            n_envs, mp.cpu_count() if n_workers is None else max(1, n_workers)
+        )
+        self.include_graph = include_graph
+        self._closed = True
+        self._shms: List[shared_memory.SharedMemory] = []
+
+        self._slices = [
+            (int(s[0]), int(s[-1]) + 1)
+            for s in np.array_split(np.arange(n_envs), self.n_workers)
+        ]
+        worker_seeds = derive_seeds(seed, self.n_workers)
+        ctx = mp.get_context(start_method)
+        self._remotes, self._processes = [], []
+        for (lo, hi), worker_seed in zip(self._slices, worker_seeds):
+            remote, worker_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(
+                    worker_remote,
+                    remote,
+                    env,
+                    hi - lo,
+                    n_steps,
+                    include_graph,
+                    worker_seed,
+                ),
+                daemon=True,
+            )
+            process.start()
+            worker_remote.close()
+            self._remotes.append(remote)
+            self._processes.append(process)
+        self._closed = False
+
+        populations, n_steps = zip(*self._recv_all())
+        if len(set(populations)) > 1:
+            self._terminate()
+            raise ValueError(
+                f"Sub-envs have different population sizes ({set(populations)}) so observations can't be stacked. "
+                f"Use a template with a fixed graph_seed."
+            )
+        self.total_population = populations[0]
+        self.n_steps = n_steps[0]
+
+        self._prepare_buffers()
+
+    def _prepare_buffers(self) -> None:
+        n = self.total_population
+        specs = [
+            ((self.n_envs, 7), np.int16),
+            ((self.n_envs, n, n), np.int8) if self.include_graph else None,
+            ((self.n_envs, n, 6), np.int8),
+        ]
+
+        buffers = []
+        for spec in specs:
+            if spec is None:
+                buffers.append(None)
+                continue
+            shape, dtype = spec
+            shm = shared_memory.SharedMemory(
+                create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            )
+            self._shms.append(shm)
+            buffers.append(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+        self._buffers: Tuple[np.ndarray, Optional[np.ndarray], np.ndarray] = tuple(
+            buffers
+        )
+
+        shm_names = iter(shm.name for shm in self._shms)
+        specs = [None if s is None else (next(shm_names), *s) for s in specs]
+        for remote, (lo, hi) in zip(self._remotes, self._slices):
+            remote.send([None if s is None else (*s, lo, hi) for s in specs])
+        self._recv_all()
+
+    def _recv_all(self) -> List[Any]:
+        """Receive the reply of every worker. If any raised, stop all the workers and re-raise it here."""
+        replies = []
+        for remote in self._remotes:
+            try:
+                replies.append(remote.recv())
+            except EOFError:
+                replies.append(_WorkerError("Worker exited without replying."))
+
+        errors = [r for r in replies if isinstance(r, _WorkerError)]
+        if len(errors) > 0:
+            self._terminate()
+            raise RuntimeError(
+                f"SubprocVecEnv worker raised:\n{errors[0].formatted_traceback}"
+            )
+
+        return replies
+
+    def reset(self, **kwargs) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+        """Reset all sub-envs, returns views of the stacked observations."""
+        for remote in self._remotes:
+            remote.send(("reset", None))
+        self._recv_all()
+
+        return self._buffers
+
+    def step(self, actions_targets: BatchActionsTargets) -> Tuple[
+        Tuple[np.ndarray, Optional[np.ndarray], np.ndarray],
+        np.ndarray,
+        np.ndarray,
+        None,
+        List[Dict[str, Any]],
+    ]:
+        """
+        Step all sub-envs.
+
+        :param actions_targets: Batch of actions for K envs, in any of the forms accepted by VecEnv.step.
+        :return: Views of the stacked observations ((K, 7), (K, N, N) or None, (K, N, 6)), rewards (K,), dones (K,),
+                 None, and a list of K info dicts.
+        """
+        if len(actions_targets) != self.n_envs:
+            raise ValueError(
+                f"Expected actions for {self.n_envs} envs, got {len(actions_targets)}."
+            )
+
+        for remote, (lo, hi) in zip(self._remotes, self._slices):
+            remote.send(("step", actions_targets[lo:hi]))
+        rewards, dones, infos = zip(*self._recv_all())
+
+        return (
+            self._buffers,
+            np.concatenate(rewards),
+            np.concatenate(dones),
+            None,
+            [info for worker_infos in infos for info in worker_infos],
+        )
+
+    def _terminate(self) -> None:
+        for process in self._processes:
+            process.terminate()
+            process.join()
+        for remote in self._remotes:
+            remote.close()
+        self._release_buffers()
+        self._closed = True
+
+    def _release_buffers(self) -> None:
+        self._buffers = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
+
+    def close(self) -> None:
+        """Stop the workers and release the shared memory."""
+        if getattr(self, "_closed", True):
+            return
+
+        for remote in self._remotes:
+            try:
+                remote.send(("close", None))
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for remote in self._remotes:
+            remote.close()
+
+        self._release_buffers()
+        self._closed = True
+
+    def __del__(self) -> None:
+        self.close()
@@ -0,0 +1,205 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import gym
+import numpy as np
+from gym.envs.registration import EnvSpec
+
+from social_distancing_sim.environment.gym.gym_env import GymEnv
+from social_distancing_sim.environment.gym.lazy_observation import LazyObservation
+
+BatchActionsTargets = Union[
+    np.ndarray, Sequence[int], Sequence[Tuple[List[int], List[Union[int, None]]]]
+]
+
+
+class VecEnv:
+    """
+    Step a batch of K GymEnvs with a single call.
+
+    All sub-envs are built from the same template. If the template uses a fixed graph seed, the graph is only generated
+    once and the other sub-envs are cloned from the first, sharing the same graph structure. If it doesn't, each sub-env
+    is built separately, and the populations must still be the same size so observations can be stacked.
+
+    Every episode of every sub-env is reset with its own seed (see GymEnv.reset), drawn from a SeedSequence per
+    sub-env, so sub-envs don't share outcomes, and runs are reproducible if seed is set.
+
+    Sub-envs are automatically reset when done. In this case the returned observation is the first observation of the
+    new episode, and the final observation of the previous episode is available in infos[k]["final_observation"].
+    """
+
+    def __init__(
+        self,
+        env: Union[str, EnvSpec, Type[GymEnv]],
+        n_envs: int,
+        n_steps: Optional[int] = None,
+        copy: bool = True,
+        include_graph: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        :param env: Registered env id, EnvSpec or GymEnv class (eg. SDS746) to build the sub-envs from.
+        :param n_envs: Number of sub-envs, K.
+        :param n_steps: Episode length for each sub-env, after which it's done and automatically reset. Defaults to
+                        the spec's max_episode_steps, if available, or 1000.
+        :param copy: If True, return copies of the observation buffers from .step and .reset. If False, return the
+                     buffers themselves, which are overwritten on the next call.
+        :param include_graph: If False, the (K, N, N) graph component of the observations isn't stacked and is returned
+                              as None.
+        :param seed: Seed for the sequence of episode seeds. If None, episode seeds are drawn from fresh entropy.
+        """
+        self.n_envs = n_envs
+        self.copy = copy
+        self.include_graph = include_graph
+        self.seed = seed
+        self._seed_sequences = np.random.SeedSequence(seed).spawn(n_envs)
+        self.envs: List[GymEnv] = self._build_envs(env, n_envs)
+        self.n_steps = self._default_n_steps(env) if n_steps is None else n_steps
+        for sub_env in self.envs:
+            sub_env.sds_env._total_steps = self.n_steps
+            if not include_graph:
+                # Don't build the graph component when observations are frozen each step
+                sub_env.observation_components = (0, 2)
+
+        self._check_populations()
+        self.single_observation_space = self.envs[0].observation_space
+        self.single_action_space = self.envs[0].action_space
+        self.total_population = self.envs[0].sds_env.total_population
+
+        self._prepare_buffers()
+
+    @staticmethod
+    def _default_n_steps(env: Union[str, EnvSpec, Type[GymEnv]]) -> int:
+        if isinstance(env, str):
+            env = gym.spec(env)
+        if isinstance(env, EnvSpec) and (env.max_episode_steps is not None):
+            return env.max_episode_steps
+
+        return 1000
+
+    @staticmethod
+    def _build_env(env: Union[str, EnvSpec, Type[GymEnv]]) -> GymEnv:
+        if isinstance(env, (str, EnvSpec)):
+            return gym.make(env).unwrapped
+
+        return env()
+
+    def _build_envs(
+        self, env: Union[str, EnvSpec, Type[GymEnv]], n_envs: int
+    ) -> List[GymEnv]:
+        base = self._build_env(env)
+        envs = [base]
+        for _ in range(n_envs - 1):
+            if base.fixed_graph:
+                # Same graph structure, skip regenerating it. Random states are reseeded on reset.
+                sub_env = type(base)(env=base.sds_env.clone(), save_dir=base.save_dir)
+            else:
+                sub_env = self._build_env(env)
+            envs.append(sub_env)
+
+        return envs
+
+    def _check_populations(self) -> None:
+        sizes = {e.sds_env.total_population for e in self.envs}
+        if len(sizes) > 1:
+            raise ValueError(
+                f"Sub-envs have different population sizes ({sizes}) so observations can't be stacked. Use a "
+                f"template with a fixed graph_seed."
+            )
+
+    def _prepare_buffers(self) -> None:
+        n = self.total_population
+        self._buffers: Tuple[np.ndarray, Optional[np.ndarray], np.ndarray] = (
+            np.zeros((self.n_envs, 7), dtype=np.int16),
+            (
+                np.zeros((self.n_envs, n, n), dtype=np.int8)
+                if self.include_graph
+                else None
+            ),
+            np.zeros((self.n_envs, n, 6), dtype=np.int8),
+        )
+
+    def _write_obs(self, k: int, obs: LazyObservation) -> None:
+        # Index rather than iterate, so components without a buffer are never computed
+        for i, buffer in enumerate(self._buffers):
+            if buffer is not None:
+                buffer[k] = obs[i]
+
+    @property
+    def _obs(self) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+        if self.copy:
+            return tuple(b.copy() if b is not None else None for b in self._buffers)
+
+        return self._buffers
+
+    def _next_seed(self, k: int) -> int:
+        return int(self._seed_sequences[k].spawn(1)[0].generate_state(1)[0])
+
+    def _reset_env(self, k: int) -> LazyObservation:
+        obs, _ = self.envs[k].reset(seed=self._next_seed(k))
+        self.envs[k].sds_env._total_steps = self.n_steps
+
+        return obs
+
+    def reset(self, **kwargs) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Reset all sub-envs, returns stacked observations."""
+        for k in range(self.n_envs):
+            self._write_obs(k, self._reset_env(k))
+
+        return self._obs
+
+    def _split_actions_targets(
+        self, actions_targets: BatchActionsTargets
+    ) -> List[Tuple[List[int], List[Union[int, None]]]]:
+        if len(actions_targets) != self.n_envs:
+            raise ValueError(
+                f"Expected actions for {self.n_envs} envs, got {len(actions_targets)}."
+            )
+
+        if isinstance(actions_targets, np.ndarray):
+            # (K,) single actions or (K, n) multiple actions, targets selected by env
+            return [(list(np.atleast_1d(a)), []) for a in actions_targets]
+
+        return [
+            (
+                ([at], [])
+                if isinstance(at, (int, np.integer))
+                else (list(at[0]), list(at[1]))
+            )
+            for at in actions_targets
+        ]
+
+    def step(self, actions_targets: BatchActionsTargets) -> Tuple[
+        Tuple[np.ndarray, np.ndarray, np.ndarray],
+        np.ndarray,
+        np.ndarray,
+        None,
+        List[Dict[str, Any]],
+    ]:
+        """
+        Step all sub-envs.
+
+        :param actions_targets: Batch of actions for K envs. Either a (K,) array of single actions, a (K, n) array of
+                                n actions per env (targets selected by the env), or a sequence of K
+                                ([actions], [targets]) tuples, as accepted by GymEnv.step.
+        :return: Stacked observations ((K, 7), (K, N, N), (K, N, 6)), rewards (K,), dones (K,), None, and a list of K
+                 info dicts.
+        """
+        rewards = np.zeros(self.n_envs, dtype=np.float64)
+        dones = np.zeros(self.n_envs, dtype=bool)
+        infos = []
+        for k, (env, at) in enumerate(
+            zip(self.envs, self._split_actions_targets(actions_targets))
+        ):
+            obs, rewards[k], dones[k], _, info = env.step(at)
+
+            if dones[k]:
+                info["final_observation"] = obs
+                obs = self._reset_env(k)
+
+            self._write_obs(k, obs)
+            infos.append(info)
+
+        return self._obs, rewards, dones, None, infos
+
+    def close(self) -> None:
+        pass
@@ -3,17 +3,18 @@ import numpy as np
 
 
 class FlattenObsWrapper(gym.ObservationWrapper):
-    """Limit the env's observation space to selected outputs."""
+    """Flatten the env's (single array) observation to 1D."""
 
     def __init__(self, env: gym.Env) -> None:
         super().__init__(env)
-        # New env obs space shape
-        gym.spaces.box.Box(
+        # New env obs space shape, keeping the compact dtype of the wrapped space
+        self.observation_space = gym.spaces.box.Box(
             low=self.observation_space.low.min(),
             high=self.observation_space.high.max(),
-            shape=(self.observation_space.shape[0] * self.observation_space.shape[1],),
-            dtype=np.int16,
+            shape=(int(np.prod(self.observation_space.shape)),),
+            dtype=self.observation_space.dtype,
         )
 
     def observation(self, obs: np.ndarray) -> np.ndarray:
-        return obs.flatten()
+        # A view rather than a copy, as observations are contiguous
+        return obs.ravel()
@@ -1,6 +1,10 @@
 import gym
 import numpy as np
 
+from social_distancing_sim.environment.gym.lazy_observation import (
+    declare_observation_components,
+)
+
 
 class LimitObsWrapper(gym.ObservationWrapper):
     """Limit the env's observation space to selected outputs."""
@@ -8,8 +12,11 @@ class LimitObsWrapper(gym.ObservationWrapper):
     def __init__(self, env: gym.Env, output: int) -> None:
         super().__init__(env)
         self.output = output
+        self.observation_components = (output,)
+        declare_observation_components(env, self.observation_components)
         # New env obs space shape
         self.observation_space = self.observation_space[self.output]
 
     def observation(self, obs: np.ndarray) -> np.ndarray:
-        return obs[self.output].astype(int)
+        # Already in the compact dtype declared in the observation space, avoid upcasting
+        return obs[self.output]
@@ -1,6 +1,17 @@
+import gym
 from gym import ObservationWrapper
 
+from social_distancing_sim.environment.gym.lazy_observation import (
+    declare_observation_components,
+)
+
 
 class SummaryGraphObservationWrapper(ObservationWrapper):
+    observation_components = (0, 1)
+
+    def __init__(self, env: gym.Env) -> None:
+        super().__init__(env)
+        declare_observation_components(env, self.observation_components)
+
     def observation(self, observation):
         return observation[0:2]
@@ -1,6 +1,6 @@
 import copy
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Hashable, List, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
 import networkx as nx
@@ -34,6 +34,8 @@ class ObservationSpace:
     _current_clear_nodes: Optional[List[int]] = field(init=False, default=None)
     _isolated_nodes: Optional[List[int]] = field(init=False, default=None)
     _masked_nodes: Optional[List[int]] = field(init=False, default=None)
+    # Targets pools built by agents for the current step, see NonLearningAgentBase._target_pool
+    target_pools: Dict[Hashable, np.ndarray] = field(init=False, default_factory=dict)
 
     def __post_init__(self) -> None:
         self._prepare_random_state()
@@ -48,6 +50,7 @@ class ObservationSpace:
         self._current_clear_nodes: Union[List[int], None] = None
         self._isolated_nodes: Union[List[int], None] = None
         self._masked_nodes: Union[List[int], None] = None
+        self.target_pools: Dict[Hashable, np.ndarray] = {}
 
     def _attach_status_to_graph(self):
         for _, nv in self.graph.g_.nodes.data():
@@ -71,7 +74,8 @@ class ObservationSpace:
                 len(self.current_isolated_nodes),
                 len(self.current_masked_nodes),
                 len(self.unknown_nodes),
-            ]
+            ],
+            dtype=np.int16,
         )
 
     def state_graph(self) -> np.ndarray:
@@ -80,7 +84,9 @@ class ObservationSpace:
 
     def state_nodes(self) -> np.ndarray:
         """Node x node_state matrix. Uses node["status"] which handles known node state."""
-        return np.array([nd["status"].state for _, nd in self.graph.g_.nodes.data()])
+        return np.array(
+            [nd["status"].state for _, nd in self.graph.g_.nodes.data()], dtype=np.int8
+        )
 
     def state_full(self) -> np.ndarray:
         """.state_nodes + .state_graph"""
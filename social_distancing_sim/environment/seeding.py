@@ -0,0 +1,25 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def derive_seeds(seed: Optional[int], n: int) -> List[int]:
+    """
+    Derive n independent int seeds from a single seed, using a SeedSequence.
+
+    The ith derived seed only depends on seed and i, so runs seeded with the same seed share the same seed tree, for
+    example rep i of two MultiSims with the same seed get the same rep seed (common random numbers).
+
+    :param seed: Seed to derive from. If None, seeds are derived from fresh entropy.
+    :param n: Number of seeds to derive.
+    """
+    return [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+def derive_named_seeds(seed: Optional[int], names: Sequence[str]) -> Dict[str, int]:
+    """
+    Derive an independent int seed for each named component from a single seed, see derive_seeds.
+
+    Seeds are assigned by position in names, so new components should be appended to keep existing seeds unchanged.
+    """
+    return dict(zip(names, derive_seeds(seed, len(names))))
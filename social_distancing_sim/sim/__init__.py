@@ -1,2 +1,27 @@
+from social_distancing_sim.sim.experiment_scheduler import (
+    ExperimentScheduler as ExperimentScheduler,
+)
+from social_distancing_sim.sim.job_queue import JobQueue as JobQueue
+from social_distancing_sim.sim.job_queue import run_worker as run_worker
 from social_distancing_sim.sim.multi_sim import MultiSim as MultiSim
+from social_distancing_sim.sim.reducers import FinalValues as FinalValues
+from social_distancing_sim.sim.reducers import Quantiles as Quantiles
+from social_distancing_sim.sim.reducers import StepStatistics as StepStatistics
+from social_distancing_sim.sim.reducers import TimeSeries as TimeSeries
+from social_distancing_sim.sim.result_cache import ResultCache as ResultCache
+from social_distancing_sim.sim.schedule_optimiser import (
+    ScheduleOptimiser as ScheduleOptimiser,
+)
+from social_distancing_sim.sim.schedule_optimiser import (
+    policy_schedule as policy_schedule,
+)
 from social_distancing_sim.sim.sim import Sim as Sim
+from social_distancing_sim.sim.statistics import RunningStats as RunningStats
+from social_distancing_sim.sim.statistics import StepStats as StepStats
+from social_distancing_sim.sim.sweep import Sweep as Sweep
+from social_distancing_sim.sim.sweep import environment_spec as environment_spec
+from social_distancing_sim.sim.sweep import grid as grid
+from social_distancing_sim.sim.sweep import latin_hypercube as latin_hypercube
+from social_distancing_sim.sim.tracking import JsonlTracker as JsonlTracker
+from social_distancing_sim.sim.tracking import MlflowTracker as MlflowTracker
+from social_distancing_sim.sim.tracking import NoOpTracker as NoOpTracker
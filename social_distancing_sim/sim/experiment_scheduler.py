@@ -0,0 +1,186 @@
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from joblib.executor import get_memmapping_executor
+from tqdm import tqdm
+
+from social_distancing_sim.sim.multi_sim import MultiSim
+
+
+@dataclass
+class ExperimentScheduler:
+    """
+    Run the reps of many MultiSims on a single, persistent, process pool.
+
+    Rather than running each MultiSim in turn, where each waits for its slowest rep before the next starts, every task
+    (rep or chunk of reps, see MultiSim.chunk_size) from every MultiSim is submitted to the same pool, longest first.
+    Each MultiSim's results are collected (and logged) as soon as all of its tasks have completed.
+
+    The MultiSims' own n_jobs are ignored.
+
+    :param multi_sims: MultiSims to run.
+    :param n_jobs: Number of worker processes in the pool.
+    :param log: If True, log each MultiSim to its tracker once complete. MultiSims with a baseline are logged once their
+                baseline has also completed. Trackers are flushed once all MultiSims are complete, so MultiSims sharing
+                a tracker have their runs written in batches.
+    :param seed: If set, replaces the seed of every MultiSim, so rep i of each is run with the same env seeds (common
+                 random numbers) and results can be compared pairwise, see MultiSim.paired_stats.
+    """
+
+    multi_sims: List[MultiSim]
+    n_jobs: int = multiprocessing.cpu_count() - 2
+    log: bool = True
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.seed is not None:
+            for ms in self.multi_sims:
+                ms.seed = self.seed
+
+    def _tasks(
+        self,
+        starts: Optional[Dict[int, int]] = None,
+        stored: Optional[Dict[int, Dict[int, Any]]] = None,
+    ) -> List[Tuple[float, int, int, List[Optional[int]]]]:
+        """
+        Tasks of the next wave of each MultiSim, as (cost, multi_sim index, task index, seeds), longest first.
+
+        Cost is estimated from the number of steps and population size of each MultiSim's Sim. Ties keep submission
+        order.
+
+        :param starts: Index of the first rep of the next wave, by multi_sim index. Defaults to the first wave of all
+                       the MultiSims.
+        :param stored: Results already in each MultiSim's store, by multi_sim index then seed. These reps are skipped.
+        """
+        if starts is None:
+            starts = {ms_i: 0 for ms_i in range(len(self.multi_sims))}
+        stored = {} if stored is None else stored
+
+        tasks = [
+            (self.multi_sims[ms_i].rep_cost * len(seeds), ms_i, task_i, seeds)
+            for ms_i, start in starts.items()
+            for task_i, seeds in enumerate(
+                self.multi_sims[ms_i]._tasks(start, skip=stored.get(ms_i, {}))
+            )
+        ]
+
+        return sorted(tasks, key=lambda t: -t[0])
+
+    def _start_waves(self, executor: Executor, starts: Dict[int, int]) -> None:
+        """
+        Submit the next wave of each MultiSim in starts.
+
+        Waves with every rep already in the MultiSim's store are completed straight away.
+        """
+        while starts:
+            for ms_i, start in starts.items():
+                self._starts[ms_i] = start
+                self._stored[ms_i] = self.multi_sims[ms_i]._stored(start)
+                self.multi_sims[ms_i]._merge_streamed(self._stored[ms_i].values())
+
+            for _, ms_i, task_i, seeds in self._tasks(starts, self._stored):
+                future = executor.submit(self.multi_sims[ms_i]._run_task, seeds)
+                self._futures[future] = (ms_i, task_i, seeds)
+                self._n_tasks[ms_i] += 1
+
+            empty = [ms_i for ms_i in starts if self._n_tasks[ms_i] == 0]
+            starts = {}
+            for ms_i in empty:
+                next_start = self._complete_wave(ms_i)
+                if next_start is not None:
+                    starts[ms_i] = next_start
+
+    def _complete_wave(self, ms_i: int) -> Optional[int]:
+        """Update a MultiSim with its completed wave. Returns the start of the next wave, or None if it's finished."""
+        ms = self.multi_sims[ms_i]
+        new = [
+            red
+            for task_i in sorted(self._wave_results[ms_i])
+            for red in self._wave_results[ms_i][task_i]
+        ]
+        wave = ms._assemble(self._starts[ms_i], self._stored[ms_i], new)
+        ms._update(wave)
+        self._reduced[ms_i].extend(wave)
+        self._progress.update(len(self._stored[ms_i]))
+        self._wave_results[ms_i], self._n_tasks[ms_i] = {}, 0
+
+        if ms.finished:
+            self._complete(ms_i, self._reduced[ms_i])
+            return None
+
+        return ms.n_reps_run
+
+    def run(self) -> List[MultiSim]:
+        """
+        Run all the MultiSims.
+
+        MultiSims running adaptively (see MultiSim.tolerance) are run in waves. The next wave is submitted as soon as
+        the previous one completes, if the MultiSim still needs more reps. Results are streamed to each MultiSim's
+        store (if set) as tasks complete.
+        """
+        n = len(self.multi_sims)
+        self._completed: Set[int] = set()
+        self._logged: Set[int] = set()
+        self._futures: Dict[Future, Tuple[int, int, List[Optional[int]]]] = {}
+        self._n_tasks = [0] * n
+        self._starts = [0] * n
+        self._stored: Dict[int, Dict[int, Any]] = {}
+        self._wave_results: List[Dict[int, List[Dict[str, Any]]]] = [
+            {} for _ in range(n)
+        ]
+        self._reduced: List[List[Dict[str, Any]]] = [[] for _ in range(n)]
+        for ms in self.multi_sims:
+            ms._reset_running_stats()
+
+        # The same reusable pool joblib uses for the loky backend, so workers (and their cached Sims) are shared
+        executor = get_memmapping_executor(max(1, self.n_jobs))
+
+        with tqdm(total=sum(ms.n_reps for ms in self.multi_sims)) as self._progress:
+            self._start_waves(executor, {ms_i: 0 for ms_i in range(n)})
+            while self._futures:
+                done, _ = wait(self._futures, return_when=FIRST_COMPLETED)
+                starts = {}
+                for future in done:
+                    ms_i, task_i, seeds = self._futures.pop(future)
+                    result = future.result()
+                    self.multi_sims[ms_i]._store_results(seeds, result)
+                    self.multi_sims[ms_i]._merge_streamed(result)
+                    self._wave_results[ms_i][task_i] = result
+                    self._progress.update(len(result))
+
+                    if len(self._wave_results[ms_i]) == self._n_tasks[ms_i]:
+                        next_start = self._complete_wave(ms_i)
+                        if next_start is not None:
+                            starts[ms_i] = next_start
+
+                self._start_waves(executor, starts)
+
+        # Write any runs still buffered, once per tracker even if shared
+        for tracker in {id(ms.tracker): ms.tracker for ms in self.multi_sims}.values():
+            tracker.flush()
+
+        return self.multi_sims
+
+    def _complete(self, ms_i: int, reduced: List[Dict[str, Any]]) -> None:
+        ms = self.multi_sims[ms_i]
+        ms._collect(reduced)
+        self._completed.add(id(ms))
+        if self.log:
+            self._log_ready()
+
+    def _log_ready(self) -> None:
+        """Log completed MultiSims that haven't been logged yet, unless they're waiting on a scheduled baseline."""
+        scheduled = {id(ms) for ms in self.multi_sims}
+        for ms in self.multi_sims:
+            if (id(ms) not in self._completed) or (id(ms) in self._logged):
+                continue
+            if (
+                (ms.baseline is not None)
+                and (id(ms.baseline) in scheduled)
+                and (id(ms.baseline) not in self._completed)
+            ):
+                continue
+            ms.log()
+            self._logged.add(id(ms))
@@ -0,0 +1,370 @@
+import argparse
+import json
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from social_distancing_sim.sim.multi_sim import MultiSim
+from social_distancing_sim.sim.result_cache import config_hash
+
+_DEFAULT_MAX_ATTEMPTS = 3
+
+
+@dataclass
+class Job:
+    job_id: int
+    config_hash: str
+    seeds: List[int]
+
+
+@dataclass
+class JobQueue:
+    """
+    SQLite backed queue of MultiSim rep tasks, shared by a coordinator and any number of worker processes.
+
+    The coordinator submits MultiSims (see .submit), which adds one job per task (a chunk of rep seeds, see
+    MultiSim.chunk_size), and waits for them with .wait. Workers (see run_worker), on this machine or others with the
+    same directory mounted, claim jobs with a lease, run them and write the reduced results back. Leases are extended
+    while a job runs, so jobs of workers that die are claimed by other workers once their lease expires. Jobs that
+    fail max_attempts times are marked as failed.
+
+    Jobs are keyed by the MultiSim's config (as for MultiSim.store) and seeds, so resubmitting a MultiSim doesn't
+    duplicate work already queued or done.
+
+    Note SQLite locking relies on the filesystem, some network filesystems don't implement it reliably.
+
+    :param path: Path to the SQLite database file.
+    :param lease_seconds: Length of the lease on a claimed job. Workers extend it every lease_seconds / 3 while running.
+    :param max_attempts: Number of times a job is tried before it's marked as failed. If set, it's stored in the
+                         database, so workers (see run_worker) use it too. If None, the stored value is used, or 3 if
+                         none has been stored.
+    """
+
+    path: str = "job_queue.db"
+    lease_seconds: float = 60.0
+    max_attempts: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        with self._connect() as conn:
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS configs (config_hash TEXT PRIMARY KEY, multi_sim BLOB NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id INTEGER PRIMARY KEY AUTOINCREMENT, config_hash TEXT NOT NULL, seeds TEXT NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'pending', worker TEXT, lease_expires REAL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, result BLOB, error TEXT, UNIQUE (config_hash, seeds));"
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            )
+            if self.max_attempts is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('max_attempts', ?)",
+                    (str(self.max_attempts),),
+                )
+
+    def _max_attempts(self, conn: sqlite3.Connection) -> int:
+        """max_attempts, or the value stored by the coordinator's JobQueue if it isn't set."""
+        if self.max_attempts is not None:
+            return self.max_attempts
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'max_attempts'"
+        ).fetchone()
+
+        return _DEFAULT_MAX_ATTEMPTS if row is None else int(row[0])
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # isolation_level=None, so transactions are managed explicitly with BEGIN IMMEDIATE. Closing without COMMIT
+        # (eg. on an exception) rolls back.
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _hash(multi_sim: MultiSim) -> str:
+        return config_hash(multi_sim._store_config)
+
+    @staticmethod
+    def _task_seeds(multi_sim: MultiSim) -> List[List[int]]:
+        if multi_sim.seed is None:
+            raise ValueError(
+                "MultiSims run through a JobQueue need a seed, so their reps can be identified."
+            )
+
+        seeds = multi_sim._rep_seeds()
+        size = 1 if multi_sim.chunk_size is None else multi_sim.chunk_size
+
+        return [seeds[i : i + size] for i in range(0, len(seeds), size)]
+
+    def submit(self, multi_sim: MultiSim) -> int:
+        """
+        Queue all the reps of a MultiSim. Adaptive stopping (MultiSim.tolerance) isn't supported, all n_reps are queued.
+
+        :return: Number of new jobs added.
+        """
+        key = self._hash(multi_sim)
+        jobs = [(key, json.dumps(seeds)) for seeds in self._task_seeds(multi_sim)]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR IGNORE INTO configs VALUES (?, ?)",
+                (key, pickle.dumps(multi_sim)),
+            )
+            n_before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (config_hash, seeds) VALUES (?, ?)", jobs
+            )
+            n_added = conn.total_changes - n_before
+            conn.execute("COMMIT")
+
+        return n_added
+
+    def claim(self, worker: str) -> Optional[Job]:
+        """
+        Claim the next pending job, or one with an expired lease. Returns None if there aren't any.
+
+        Jobs whose lease expired after max_attempts claims (eg. because they keep killing their worker, which never
+        gets to call .fail) are marked as failed instead of being claimed again.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', worker = NULL, lease_expires = NULL, "
+                "error = COALESCE(error, 'Lease expired on every attempt, the job may be killing its worker.') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self._max_attempts(conn)),
+            )
+            row = conn.execute(
+                "SELECT job_id, config_hash, seeds FROM jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY job_id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE job_id = ?",
+                    (worker, now + self.lease_seconds, row[0]),
+                )
+            conn.execute("COMMIT")
+
+        return None if row is None else Job(row[0], row[1], json.loads(row[2]))
+
+    def extend_lease(self, job: Job, worker: str) -> bool:
+        """Extend the lease on a job. Returns False if the worker no longer holds it."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + self.lease_seconds, job.job_id, worker),
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, job: Job, worker: str, result: List[Dict[str, Any]]) -> bool:
+        """
+        Store the reduced results of a job. Returns False, and stores nothing, if the worker no longer holds the job
+        (its lease expired and another worker claimed it, or it was marked as failed).
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, lease_expires = NULL "
+                "WHERE job_id = ? AND worker = ? AND status = 'leased'",
+                (pickle.dumps(result), job.job_id, worker),
+            )
+            return cursor.rowcount > 0
+
+    def fail(self, job: Job, worker: str, error: str) -> None:
+        """
+        Release a job that raised, to be retried unless it's been tried max_attempts times.
+
+        Does nothing if the worker no longer holds the job (its lease expired and another worker claimed it).
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ?, "
+                "worker = NULL, lease_expires = NULL WHERE job_id = ? AND worker = ? AND status = 'leased'",
+                (self._max_attempts(conn), error, job.job_id, worker),
+            )
+
+    def load_multi_sim(self, key: str) -> MultiSim:
+        with self._connect() as conn:
+            (blob,) = conn.execute(
+                "SELECT multi_sim FROM configs WHERE config_hash = ?", (key,)
+            ).fetchone()
+
+        return pickle.loads(blob)
+
+    def counts(self, multi_sim: Optional[MultiSim] = None) -> Dict[str, int]:
+        """Number of jobs by status, for all jobs or those of a MultiSim."""
+        query, args = "SELECT status, COUNT(*) FROM jobs", ()
+        if multi_sim is not None:
+            query, args = f"{query} WHERE config_hash = ?", (self._hash(multi_sim),)
+        with self._connect() as conn:
+            return dict(conn.execute(f"{query} GROUP BY status", args).fetchall())
+
+    def results(self, multi_sim: MultiSim) -> Optional[List[Dict[str, Any]]]:
+        """Reduced results of all the MultiSim's reps, in rep order, or None if any aren't done yet."""
+        with self._connect() as conn:
+            rows = dict(
+                conn.execute(
+                    "SELECT seeds, result FROM jobs WHERE config_hash = ? AND status = 'done'",
+                    (self._hash(multi_sim),),
+                ).fetchall()
+            )
+
+        tasks = [json.dumps(seeds) for seeds in self._task_seeds(multi_sim)]
+        if any(t not in rows for t in tasks):
+            return None
+
+        return [red for t in tasks for red in pickle.loads(rows[t])]
+
+    def wait(
+        self,
+        multi_sims: List[MultiSim],
+        poll_interval: float = 5.0,
+        timeout: Optional[float] = None,
+        log: bool = True,
+    ) -> List[MultiSim]:
+        """
+        Wait for the jobs of submitted MultiSims to be done, collecting (and logging) each MultiSim's results as soon
+        as all of its jobs are done.
+
+        :raises RuntimeError: If any of the jobs failed.
+        :raises TimeoutError: If the jobs aren't all done within timeout seconds.
+        """
+        start = time.time()
+        pending = list(multi_sims)
+        while pending:
+            for ms in list(pending):
+                if self.counts(ms).get("failed", 0) > 0:
+                    raise RuntimeError(
+                        f"Jobs of MultiSim {ms.name} ({ms.sim.agent.name}) failed, see the error column of the jobs "
+                        f"table in {self.path}."
+                    )
+                reduced = self.results(ms)
+                if reduced is not None:
+                    ms._reset_running_stats()
+                    ms._update(reduced)
+                    ms._collect(reduced)
+                    if log:
+                        ms.log()
+                        ms.tracker.flush()
+                    pending.remove(ms)
+
+            if pending:
+                if (timeout is not None) and (time.time() - start > timeout):
+                    raise TimeoutError(
+                        f"{len(pending)} MultiSims not done after {timeout}s."
+                    )
+                time.sleep(poll_interval)
+
+        return multi_sims
+
+
+class _LeaseKeeper(threading.Thread):
+    """Extends the lease on a job in the background while it runs."""
+
+    def __init__(self, queue: JobQueue, job: Job, worker: str) -> None:
+        super().__init__(daemon=True)
+        self._queue = queue
+        self._job = job
+        self._worker = worker
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self._queue.lease_seconds / 3):
+            if not self._queue.extend_lease(self._job, self._worker):
+                return
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def run_worker(
+    path: str,
+    worker: Optional[str] = None,
+    lease_seconds: float = 60.0,
+    poll_interval: float = 5.0,
+    idle_timeout: Optional[float] = None,
+    max_jobs: Optional[int] = None,
+) -> int:
+    """
+    Claim and run jobs from a JobQueue until there are none left for idle_timeout seconds, or max_jobs have been run.
+
+    MultiSims are unpickled once per worker, and their Sims are reused across jobs (as in MultiSim's chunked mode).
+    Jobs are retried up to the max_attempts stored in the database by the coordinator's JobQueue.
+
+    :param path: Path to the JobQueue's database.
+    :param worker: Name of this worker, defaults to host, pid and a random suffix.
+    :param lease_seconds: Lease length, see JobQueue.
+    :param poll_interval: Seconds to wait before checking for new jobs when the queue is empty.
+    :param idle_timeout: Stop after this many seconds without a job. If None, wait for jobs forever.
+    :param max_jobs: Stop after running this many jobs.
+    :return: Number of jobs run.
+    """
+    queue = JobQueue(path=path, lease_seconds=lease_seconds)
+    worker = (
+        f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[0:6]}"
+        if worker is None
+        else worker
+    )
+    multi_sims: Dict[str, MultiSim] = {}
+    n_jobs = 0
+    idle_since = time.time()
+    while (max_jobs is None) or (n_jobs < max_jobs):
+        job = queue.claim(worker)
+        if job is None:
+            if (idle_timeout is not None) and (time.time() - idle_since > idle_timeout):
+                break
+            time.sleep(poll_interval)
+            continue
+
+        lease_keeper = _LeaseKeeper(queue, job, worker)
+        lease_keeper.start()
+        try:
+            if job.config_hash not in multi_sims:
+                multi_sims[job.config_hash] = queue.load_multi_sim(job.config_hash)
+            result = multi_sims[job.config_hash]._run_task(job.seeds)
+        except Exception:
+            lease_keeper.stop()
+            queue.fail(job, worker, traceback.format_exc())
+        else:
+            lease_keeper.stop()
+            queue.complete(job, worker, result)
+        n_jobs += 1
+        idle_since = time.time()
+
+    return n_jobs
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run JobQueue worker.")
+    parser.add_argument("path", help="Path to the JobQueue's database.")
+    parser.add_argument("--worker", default=None)
+    parser.add_argument("--lease-seconds", type=float, default=60.0)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--idle-timeout", type=float, default=None)
+    parser.add_argument("--max-jobs", type=int, default=None)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    run_worker(
+        args.path,
+        worker=args.worker,
+        lease_seconds=args.lease_seconds,
+        poll_interval=args.poll_interval,
+        idle_timeout=args.idle_timeout,
+        max_jobs=args.max_jobs,
+    )
@@ -1,8 +1,11 @@
 import multiprocessing
+import uuid
+import warnings
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
 
-import mlflow
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 from joblib import Parallel, delayed
@@ -10,7 +13,16 @@ from tqdm import tqdm
 
 from social_distancing_sim.environment.gym.gym_env import GymEnv
 from social_distancing_sim.environment.history import History
+from social_distancing_sim.environment.seeding import derive_seeds
+from social_distancing_sim.sim.reducers import FinalValues, ReducerBase, StepStatistics
+from social_distancing_sim.sim.result_cache import (
+    ResultCache,
+    config_hash,
+    init_params,
+)
 from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.statistics import RunningStats
+from social_distancing_sim.sim.tracking import MlflowTracker, TrackerBase
 
 
 def _dummy_logger(*args, **kwargs) -> None:
@@ -18,109 +30,547 @@ def _dummy_logger(*args, **kwargs) -> None:
     print("what")
 
 
+# Sims built in this (worker) process for the most recent MultiSims, keyed by MultiSim. Reused by all chunks of reps the
+# worker runs, so the env and agent are only built once per worker (per MultiSim). See MultiSim.max_worker_sims.
+_WORKER_SIMS: "OrderedDict[str, Sim]" = OrderedDict()
+
+
 @dataclass
 class MultiSim:
+    """
+    Run a Sim for multiple reps in parallel, and log aggregated results.
+
+    :param sim: Sim to run.
+    :param n_reps: Number of reps. If tolerance is set, this is the maximum number of reps.
+    :param n_jobs: Number of parallel jobs.
+    :param name: Name of experiment, used for logging.
+    :param reducers: Reducers (from sim.reducers) to run on each rep's History inside the workers, only their output
+                     is returned, in .reduced_results. FinalValues is always included, as it's used to build .results.
+                     Outputs of streamed reducers (eg. StepStatistics) are merged across reps into .merged_results
+                     instead.
+    :param keep_full_results: If True, also return the complete History of every rep in .full_results. These are
+                              large, so are discarded by default.
+    :param chunk_size: If set, dispatch reps to workers in chunks of this size. Each worker builds its env and agent
+                       once, and runs each rep after a cheap reset with its own seed, rather than rebuilding the env
+                       (and graph) for every rep. If None, one task is dispatched per rep and each builds its own env.
+    :param seed: Seed used to deterministically derive a seed for each rep. Reps are only seeded when chunk_size is
+                 None if this is set. In chunked mode they're always seeded, from fresh entropy if this is None.
+                 MultiSims with the same seed run rep i with the same env seeds, whatever the agent (common random
+                 numbers), so their results can be compared pairwise, see .paired_stats.
+    :param baseline: Optional MultiSim to compare to when logging. Paired differences of the results (this - baseline)
+                     are logged along with the usual stats. The baseline should use the same seed, and must be run
+                     first.
+    :param tolerance: If set, run adaptively: reps are run in waves of wave_size, and the mean and CI of each metric
+                      in tolerance (eg. {"Overall score": 5.0}) are updated after each wave. Stops once the 95% CI
+                      half-width of every metric is within its tolerance (and at least min_reps have been run), or
+                      n_reps have been run. The number of reps actually run is in .n_reps_run. Metrics must be fields
+                      of the FinalValues results.
+    :param wave_size: Number of reps per wave when running adaptively.
+    :param min_reps: Minimum number of reps to run before stopping adaptively, so the CIs aren't trusted from only a
+                     few reps.
+    :param store: Optional ResultCache to stream each rep's reduced results to as soon as it completes. Reps already
+                  in the store (for this MultiSim's name, agent and env params, n_steps and reducers) are skipped, so
+                  an interrupted run resumes where it stopped when run again. Requires seed, so reps can be identified.
+    :param tracker: Tracking backend (from sim.tracking) to log aggregated results to. Defaults to an MlflowTracker.
+                    Use a NoOpTracker to turn off logging.
+    :param max_worker_sims: In chunked mode, the number of Sims each worker keeps, for this and the most recently run
+                            other MultiSims. The least recently used is dropped when adding this MultiSim's Sim. Raise
+                            it when interleaving the tasks of more MultiSims on the same workers, so their Sims aren't
+                            rebuilt.
+    """
+
     sim: Sim
     n_reps: int = 100
     n_jobs: int = multiprocessing.cpu_count() - 2
     name: str = "Unnamed experiment"
+    reducers: List[ReducerBase] = None
+    keep_full_results: bool = False
+    chunk_size: Optional[int] = None
+    seed: Optional[int] = None
+    baseline: Optional["MultiSim"] = None
+    tolerance: Optional[Dict[str, float]] = None
+    wave_size: int = 20
+    min_reps: int = 0
+    store: Optional[ResultCache] = None
+    tracker: Optional[TrackerBase] = None
+    max_worker_sims: int = 8
+
+    # Result columns aggregated when logging. These are already totals.
+    _logged_columns = [
+        "Observed overall score",
+        "Observed turn score",
+        "Overall score",
+        "Turn score",
+        "Total deaths",
+    ]
 
     def __post_init__(self):
-        self._mlflow_exp = None
+        self._key = uuid.uuid4().hex
         self.results = pd.DataFrame()
+        self.reduced_results: Dict[str, List[Dict[str, Any]]] = {}
+        self.full_results: List[History] = []
+        self._reset_running_stats()
+
+        if (self.store is not None) and (self.seed is None):
+            raise ValueError(
+                "MultiSims with a store need a seed, so completed reps can be identified when resuming."
+            )
 
-        # Create a reference env that will be used in results logging. It's mainly used to log params.
-        self.reference_env: GymEnv = self.sim.env_spec.make()
+        if self.tracker is None:
+            self.tracker = MlflowTracker()
 
-    def _run(self):
+        if self.reducers is None:
+            self.reducers = []
+        if not any(isinstance(r, FinalValues) for r in self.reducers):
+            self.reducers = [FinalValues()] + list(self.reducers)
+
+        self._reference_env: Optional[GymEnv] = None
+
+        if self.tolerance is not None:
+            self._check_tolerance()
+
+    def _check_tolerance(self) -> None:
+        """Raise if any tolerance metric isn't a field of the FinalValues results, as it would never converge."""
+        if self.min_reps > self.n_reps:
+            raise ValueError(
+                f"min_reps ({self.min_reps}) is more than n_reps ({self.n_reps})."
+            )
+
+        fields = next(r for r in self.reducers if isinstance(r, FinalValues)).fields
+        if fields is None:
+            # All the fields of the History, which are logged from the first step
+            env = self.reference_env.sds_env.clone()
+            env.step(actions=[])
+            fields = list(env.history.keys())
+        unknown = [k for k in self.tolerance if k not in fields]
+        if len(unknown) > 0:
+            raise ValueError(
+                f"Unknown tolerance metrics {unknown}, use fields of the FinalValues results: {sorted(fields)}."
+            )
+
+    @property
+    def reference_env(self) -> GymEnv:
+        """
+        Reference env used in results logging, it's mainly used to log params. Built when first needed, so MultiSims
+        built in workers (eg. by Sweep) don't build it.
+        """
+        if self._reference_env is None:
+            self._reference_env = self.sim.env_spec.make()
+
+        return self._reference_env
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Don't send the reference env, results, baseline, store or tracker to the workers with each task
+        state = self.__dict__.copy()
+        state["_reference_env"] = None
+        for k in [
+            "results",
+            "reduced_results",
+            "full_results",
+            "merged_results",
+            "baseline",
+            "store",
+            "tracker",
+        ]:
+            state.pop(k, None)
+
+        return state
+
+    def _reduce(self, history: History) -> Dict[str, Any]:
+        reduced = {r.name: r.reduce(history) for r in self.reducers}
+        if self.keep_full_results:
+            reduced["full"] = history
+
+        return reduced
+
+    def _rep_seeds(self) -> List[int]:
+        return derive_seeds(self.seed, self.n_reps)
+
+    def _run(self, seed: Optional[int] = None) -> Dict[str, Any]:
         # Clone to make sure the sims are actually run on different environments
         sim = self.sim.clone()
         # Reattach env to agent
         sim.agent.attach_to_env(sim.env_spec)
         sim.agent.env.sds_env.log_to_file = False
-        results = sim.run()
 
-        return results
+        # Reduce in the worker, so only the reduced payload is returned to the main process
+        return self._reduce(sim.run(seed=seed))
 
-    def run(self):
-        self.full_results = Parallel(n_jobs=self.n_jobs, backend="loky")(
-            delayed(self._run)()
-            for _ in tqdm(range(self.n_reps), desc=self.sim.agent.name)
+    def _worker_sim(self) -> Sim:
+        sim = _WORKER_SIMS.get(self._key)
+        if sim is None:
+            sim = self.sim.clone()
+            _WORKER_SIMS[self._key] = sim
+        _WORKER_SIMS.move_to_end(self._key)
+        while len(_WORKER_SIMS) > self.max_worker_sims:
+            _WORKER_SIMS.popitem(last=False)
+
+        return sim
+
+    def _run_chunk(self, seeds: List[int]) -> List[Dict[str, Any]]:
+        sim = self._worker_sim()
+
+        return [self._reduce(sim.run(seed=seed, rebuild_env=False)) for seed in seeds]
+
+    def _wave_seeds(self, start: int = 0) -> List[Optional[int]]:
+        """
+        Seeds of the reps in the next wave.
+
+        :param start: Index of the first rep in the wave. The wave contains all the remaining reps, or wave_size reps if
+                      running adaptively.
+        """
+        stop = (
+            self.n_reps
+            if self.tolerance is None
+            else min(self.n_reps, start + self.wave_size)
+        )
+        if (self.chunk_size is None) and (self.seed is None):
+            return [None] * (stop - start)
+
+        return self._rep_seeds()[start:stop]
+
+    def _tasks(
+        self, start: int = 0, skip: Collection[int] = ()
+    ) -> List[List[Optional[int]]]:
+        """
+        Split the next wave of reps into tasks, as lists of rep seeds. One rep per task unless chunk_size is set.
+
+        :param start: Index of the first rep in the wave, see ._wave_seeds.
+        :param skip: Seeds of reps to leave out, eg. those already in the store.
+        """
+        seeds = [s for s in self._wave_seeds(start) if (s is None) or (s not in skip)]
+        size = 1 if self.chunk_size is None else self.chunk_size
+
+        return [seeds[i : i + size] for i in range(0, len(seeds), size)]
+
+    @property
+    def _store_config(self) -> Dict[str, Any]:
+        """
+        Config identifying this MultiSim's reps in the store (and JobQueue). Covers the agent's and env spec's init
+        parameters (see init_params), as ids of unregistered specs (eg. from sweep.environment_spec) aren't unique.
+        """
+        return {
+            "name": self.name,
+            "agent": init_params(self.sim.agent),
+            "env": self.sim.env_spec.id,
+            "env_entry_point": init_params(self.sim.env_spec.entry_point),
+            "env_kwargs": init_params(self.sim.env_spec.kwargs),
+            "n_steps": self.sim.n_steps,
+            "reducers": [repr(r) for r in self.reducers],
+            "keep_full_results": self.keep_full_results,
+        }
+
+    def _stored(self, start: int = 0) -> Dict[int, Dict[str, Any]]:
+        """Reduced results of the reps in the wave that are already in the store, by seed."""
+        if self.store is None:
+            return {}
+
+        return self.store.get(config_hash(self._store_config), self._wave_seeds(start))
+
+    def _store_results(
+        self, seeds: List[Optional[int]], reduced: List[Dict[str, Any]]
+    ) -> None:
+        if self.store is not None:
+            config = self._store_config
+            self.store.put(config_hash(config), config, dict(zip(seeds, reduced)))
+
+    def _assemble(
+        self,
+        start: int,
+        stored: Dict[int, Dict[str, Any]],
+        reduced: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Merge the stored and newly run results of the wave from start, in rep order."""
+        if len(stored) == 0:
+            return reduced
+
+        reduced = iter(reduced)
+        return [
+            stored[seed] if seed in stored else next(reduced)
+            for seed in self._wave_seeds(start)
+        ]
+
+    def _run_task(self, seeds: List[Optional[int]]) -> List[Dict[str, Any]]:
+        if self.chunk_size is None:
+            return [self._run(seed) for seed in seeds]
+
+        return self._run_chunk(seeds)
+
+    def _reset_running_stats(self) -> None:
+        self.n_reps_run = 0
+        self.running_stats: Dict[str, RunningStats] = {
+            k: RunningStats() for k in (self.tolerance or {})
+        }
+        self.merged_results: Dict[str, Any] = {}
+
+    def _merge_streamed(self, reduced: Iterable[Dict[str, Any]]) -> None:
+        """
+        Merge the outputs of streamed reducers into .merged_results, and remove them from the reps' reduced results.
+
+        Called as each task's results arrive (and for reps loaded from the store), so the per-rep payloads aren't kept
+        until the end of the wave. Reps that have already been merged are skipped.
+        """
+        streamed = [r for r in self.reducers if r.streamed]
+        for red in reduced:
+            for r in streamed:
+                if r.name in red:
+                    self.merged_results[r.name] = r.merge(
+                        self.merged_results.get(r.name), red.pop(r.name)
+                    )
+
+    def _update(self, reduced: List[Dict[str, Any]]) -> None:
+        """Update the running stats with the reduced results of a completed wave, merging any unmerged streamed outputs."""
+        self.n_reps_run += len(reduced)
+        self._merge_streamed(reduced)
+        for red in reduced:
+            for k, stats in self.running_stats.items():
+                stats.update(red[FinalValues.name].get(k, np.nan))
+
+    @property
+    def converged(self) -> bool:
+        """
+        True if running adaptively, at least min_reps have run, and the CI half-widths of all the tolerance metrics
+        are within tolerance.
+        """
+        if (self.tolerance is None) or (self.n_reps_run < self.min_reps):
+            return False
+
+        return all(
+            self.running_stats[k].ci_half_width() <= tol
+            for k, tol in self.tolerance.items()
         )
 
+    @property
+    def finished(self) -> bool:
+        return (self.n_reps_run >= self.n_reps) or self.converged
+
+    @property
+    def rep_cost(self) -> float:
+        """Rough relative cost of running a single rep, used for scheduling."""
+        return self.sim.n_steps * self.reference_env.sds_env.total_population
+
+    def _collect(self, reduced: List[Dict[str, Any]]) -> None:
+        self.reduced_results = {
+            r.name: [red[r.name] for red in reduced]
+            for r in self.reducers
+            if not r.streamed
+        }
+        self.full_results = [red["full"] for red in reduced if "full" in red]
+
         # Place in fake history container for now
         results_hist = History()
-        for h in self.full_results:
-            results_hist.log({k: v[-1] for k, v in h.items()})
-
+        for final in self.reduced_results[FinalValues.name]:
+            results_hist.log(final)
         self.results = pd.DataFrame(results_hist)
+
+    def run(self):
+        self._reset_running_stats()
+        reduced = []
+        with tqdm(total=self.n_reps, desc=self.sim.agent.name) as progress:
+            while not self.finished:
+                start = self.n_reps_run
+                stored = self._stored(start)
+                self._merge_streamed(stored.values())
+                progress.update(len(stored))
+                tasks = self._tasks(start, skip=stored)
+                new = []
+                for task, task_reduced in zip(
+                    tasks,
+                    Parallel(n_jobs=self.n_jobs, backend="loky", return_as="generator")(
+                        delayed(self._run_task)(task) for task in tasks
+                    ),
+                ):
+                    # Stream to the store as tasks complete, so an interrupted run keeps its progress
+                    self._store_results(task, task_reduced)
+                    self._merge_streamed(task_reduced)
+                    new.extend(task_reduced)
+                    progress.update(len(task_reduced))
+
+                wave = self._assemble(start, stored, new)
+                self._update(wave)
+                reduced.extend(wave)
+
+        self._collect(reduced)
         self.log()
+        self.tracker.flush()
 
     @staticmethod
-    def _agg_stats(x: pd.Series) -> Dict[str, float]:
+    def _agg_stats(
+        x: pd.Series, baseline: Optional[pd.Series] = None
+    ) -> Dict[str, float]:
+        """
+        Mean and 95% interval of x over reps.
+
+        If baseline is given, also the mean, standard deviation and 95% confidence interval (normal approximation) of
+        the mean of the paired differences x - baseline. Rep i of x is paired with rep i of baseline, which is only
+        meaningful if both were run with common random numbers (the same MultiSim seed).
+        """
         m = x.mean()
         ci = np.percentile(x, [2.5, 97.5])
         name = "".join(
             [s for s in str(x.name) if s.isalpha() or (s in ["_", ".", "-", " ", "/"])]
         )
-        return {f"{name}__mean": m, f"{name}__ci_lb": ci[0], f"{name}__ci_ub": ci[1]}
+        stats = {f"{name}__mean": m, f"{name}__ci_lb": ci[0], f"{name}__ci_ub": ci[1]}
+
+        if baseline is not None:
+            diff = x.to_numpy(dtype=float) - baseline.to_numpy(dtype=float)
+            diff_m = diff.mean()
+            diff_sd = diff.std(ddof=1) if len(diff) > 1 else 0.0
+            half_width = 1.96 * diff_sd / np.sqrt(len(diff))
+            stats.update(
+                {
+                    f"{name}__paired_diff_mean": diff_m,
+                    f"{name}__paired_diff_sd": diff_sd,
+                    f"{name}__paired_diff_ci_lb": diff_m - half_width,
+                    f"{name}__paired_diff_ci_ub": diff_m + half_width,
+                }
+            )
+
+        return stats
+
+    def paired_stats(
+        self, baseline: "MultiSim", columns: Optional[List[str]] = None
+    ) -> Dict[str, float]:
+        """
+        Stats of this MultiSim's results, and their paired differences to the baseline's results, see _agg_stats.
+
+        If the MultiSims ran different numbers of reps (eg. when running adaptively), only the reps they both ran are
+        paired. Rep seeds don't depend on the number of reps, so these still share random numbers.
+
+        :param baseline: MultiSim that's already been run, ideally with the same seed.
+        :param columns: Result columns to compare. Defaults to the logged columns.
+        """
+        n = min(len(self.results), len(baseline.results))
+        if n == 0:
+            raise ValueError(
+                f"Can't pair {len(self.results)} reps with {len(baseline.results)} baseline reps, run both first."
+            )
+        if (self.seed is None) or (self.seed != baseline.seed):
+            warnings.warn(
+                "MultiSims weren't run with the same seed, so reps don't share random numbers and paired differences "
+                "won't have reduced variance."
+            )
+
+        stats = {}
+        for c in self._logged_columns if columns is None else columns:
+            stats.update(
+                self._agg_stats(self.results[c][0:n], baseline.results[c][0:n])
+            )
+
+        return stats
+
+    def step_bands(self, k: str, q: Sequence[float] = (0.05, 0.95)) -> pd.DataFrame:
+        """
+        Per-step mean, standard deviation and quantiles of a field across reps. Requires a StepStatistics reducer.
+
+        :param k: Field, eg. "Current infections".
+        :param q: Quantiles to include, in [0, 1].
+        :return: DataFrame with a row per step, and columns mean, std, n and a column per quantile (eg. q0.05).
+        """
+        merged = self.merged_results.get(StepStatistics.name, {})
+        if k not in merged:
+            raise ValueError(
+                f"No step statistics for {k}, add a StepStatistics reducer (including this field) and run first."
+            )
+
+        stats = merged[k]
+        bands = pd.DataFrame({"mean": stats.mean, "std": stats.std, "n": stats.n})
+        for q_, v in zip(q, stats.quantile(q).T):
+            bands[f"q{q_:g}"] = v
+
+        return bands
+
+    def plot_bands(
+        self,
+        k: str,
+        q: Tuple[float, float] = (0.05, 0.95),
+        ax: plt.Axes = None,
+        show: bool = True,
+    ) -> plt.Axes:
+        """
+        Plot the per-step mean of a field across reps, with a band between two quantiles, see .step_bands.
+
+        :param k: Field, eg. "Current infections".
+        :param q: Lower and upper quantiles of the band.
+        :param ax: Axis to draw on. If not specified, will create.
+        :param show: Draw figure.
+        :return: Axis handle used.
+        """
+        bands = self.step_bands(k, q=q)
+        if ax is None:
+            _, ax = plt.subplots(nrows=1, ncols=1)
+
+        label = f"{self.sim.agent.name}: {k}"
+        line = ax.plot(bands.index, bands["mean"], label=f"{label} (mean)")[0]
+        ax.fill_between(
+            bands.index,
+            bands[f"q{q[0]:g}"],
+            bands[f"q{q[1]:g}"],
+            color=line.get_color(),
+            alpha=0.3,
+            label=f"{label} ({q[0]:g}-{q[1]:g} quantiles)",
+        )
+        ax.set_xlabel("Day")
+        ax.set_ylabel("Count")
+        ax.legend()
+        if show:
+            plt.show()
+
+        return ax
 
     def log(self):
         """
-        Log parameters of the env used.
+        Log parameters of the env used, and aggregated results, to the tracker.
 
         Using Sim's copy here, as iterated env isn't returned from _run. This logs the params, which are the same (ie.
         what's defined in the template).
         """
-        self._mlflow_exp = mlflow.set_experiment(self.name)
-        mlflow.start_run()
-        mlflow.log_params(
-            {
-                "sim_n_steps": self.sim.n_steps,
-                "pop_total_population_EXAMPLE": self.reference_env.sds_env.total_population,  # Can vary if not deterministic!
-                "pop_name": self.reference_env.sds_env.name,
-                "pop_random_infection_chance": self.reference_env.sds_env.random_infection_chance,
-                "disease_name": self.reference_env.sds_env.disease.name,
-                "disease_virulence": self.reference_env.sds_env.disease.virulence,
-                "recovery_rate": self.reference_env.sds_env.disease.recovery_rate,
-                "duration_mean": self.reference_env.sds_env.disease.duration_mean,
-                "duration_std": self.reference_env.sds_env.disease.duration_std,
-                "immunity_mean": self.reference_env.sds_env.disease.immunity_mean,
-                "immunity_std": self.reference_env.sds_env.disease.immunity_std,
-                "immunity_decay_mean": self.reference_env.sds_env.disease.immunity_decay_mean,
-                "immunity_decay_std": self.reference_env.sds_env.disease.immunity_decay_std,
-                "obs_test_rate": self.reference_env.sds_env.observation_space.test_rate,
-                "obs_test_validity_period": self.reference_env.sds_env.observation_space.test_validity_period,
-                "graph_community_n": self.reference_env.sds_env.observation_space.graph.community_n,
-                "graph_community_size_mean": self.reference_env.sds_env.observation_space.graph.community_size_mean,
-                "graph_community_size_std": self.reference_env.sds_env.observation_space.graph.community_size_std,
-                "graph_community_p_in": self.reference_env.sds_env.observation_space.graph.community_p_in,
-                "graph_community_p_out": self.reference_env.sds_env.observation_space.graph.community_p_out,
-                "graph_considered_immune_threshold": self.reference_env.sds_env.observation_space.graph.considered_immune_threshold,
-                "scoring_clear_yield_per_edge": self.reference_env.sds_env.scoring.clear_yield_per_edge,
-                "scoring_infection_penalty": self.reference_env.sds_env.scoring.infection_penalty,
-                "scoring_death_penalty": self.reference_env.sds_env.scoring.death_penalty,
-                "agent_name": self.sim.agent.name,
-                "agent_type": self.sim.agent.__class__.__name__,
-                "agent_delay": NotImplemented,  # TODO: Add back later if used
-                "agent_actions_per_turn": self.sim.agent.actions_per_turn,
-                "agent_action_space_vaccinate_cost": self.reference_env.sds_env.action_space.vaccinate_cost,
-                "agent_action_space_isolate_cost": self.reference_env.sds_env.action_space.isolate_cost,
-            }
-        )  # TODO: Other action costs, etc.
-
-        metrics_to_log = {}
-
-        # These are already totals
-        for c in [
-            "Observed overall score",
-            "Observed turn score",
-            "Overall score",
-            "Turn score",
-            "Total deaths",
-        ]:
-            metrics_to_log.update(self._agg_stats(self.results[c]))
+        params = {
+            "sim_n_steps": self.sim.n_steps,
+            "pop_total_population_EXAMPLE": self.reference_env.sds_env.total_population,  # Can vary if not deterministic!
+            "pop_name": self.reference_env.sds_env.name,
+            "pop_random_infection_chance": self.reference_env.sds_env.random_infection_chance,
+            "disease_name": self.reference_env.sds_env.disease.name,
+            "disease_virulence": self.reference_env.sds_env.disease.virulence,
+            "recovery_rate": self.reference_env.sds_env.disease.recovery_rate,
+            "duration_mean": self.reference_env.sds_env.disease.duration_mean,
+            "duration_std": self.reference_env.sds_env.disease.duration_std,
+            "immunity_mean": self.reference_env.sds_env.disease.immunity_mean,
+            "immunity_std": self.reference_env.sds_env.disease.immunity_std,
+            "immunity_decay_mean": self.reference_env.sds_env.disease.immunity_decay_mean,
+            "immunity_decay_std": self.reference_env.sds_env.disease.immunity_decay_std,
+            "obs_test_rate": self.reference_env.sds_env.observation_space.test_rate,
+            "obs_test_validity_period": self.reference_env.sds_env.observation_space.test_validity_period,
+            "graph_community_n": self.reference_env.sds_env.observation_space.graph.community_n,
+            "graph_community_size_mean": self.reference_env.sds_env.observation_space.graph.community_size_mean,
+            "graph_community_size_std": self.reference_env.sds_env.observation_space.graph.community_size_std,
+            "graph_community_p_in": self.reference_env.sds_env.observation_space.graph.community_p_in,
+            "graph_community_p_out": self.reference_env.sds_env.observation_space.graph.community_p_out,
+            "graph_considered_immune_threshold": self.reference_env.sds_env.observation_space.graph.considered_immune_threshold,
+            "scoring_clear_yield_per_edge": self.reference_env.sds_env.scoring.clear_yield_per_edge,
+            "scoring_infection_penalty": self.reference_env.sds_env.scoring.infection_penalty,
+            "scoring_death_penalty": self.reference_env.sds_env.scoring.death_penalty,
+            "agent_name": self.sim.agent.name,
+            "agent_type": self.sim.agent.__class__.__name__,
+            "agent_delay": NotImplemented,  # TODO: Add back later if used
+            "agent_actions_per_turn": self.sim.agent.actions_per_turn,
+            "agent_action_space_vaccinate_cost": self.reference_env.sds_env.action_space.vaccinate_cost,
+            "agent_action_space_isolate_cost": self.reference_env.sds_env.action_space.isolate_cost,
+        }  # TODO: Other action costs, etc.
 
-        mlflow.log_metrics(metrics_to_log)
+        if self.baseline is not None:
+            params.update(
+                {"seed": self.seed, "baseline_agent_name": self.baseline.sim.agent.name}
+            )
+            metrics_to_log = self.paired_stats(self.baseline)
+        else:
+            metrics_to_log = {}
+            # These are already totals
+            for c in self._logged_columns:
+                metrics_to_log.update(self._agg_stats(self.results[c]))
+        metrics_to_log["n_reps_run"] = len(self.results)
+        if self.tolerance is not None:
+            params.update({f"tolerance_{k}": tol for k, tol in self.tolerance.items()})
+            params["min_reps"] = self.min_reps
 
-        mlflow.end_run()
+        self.tracker.log_run(self.name, params, metrics_to_log)
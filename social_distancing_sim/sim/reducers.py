@@ -0,0 +1,140 @@
+import abc
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from social_distancing_sim.environment.history import History
+from social_distancing_sim.sim.statistics import StepStats
+
+
+@dataclass
+class ReducerBase(abc.ABC):
+    """
+    Reduce the History of a single rep to a small payload.
+
+    Reducers are run inside the MultiSim workers, so only their output is sent back to the main process.
+
+    Outputs of streamed reducers are merged across reps with .merge as they arrive, into MultiSim.merged_results,
+    rather than kept for every rep in MultiSim.reduced_results.
+    """
+
+    name = "base"
+    streamed = False
+
+    @abc.abstractmethod
+    def reduce(self, history: History) -> Dict[str, Any]:
+        pass
+
+    def merge(self, merged: Optional[Any], reduced: Any) -> Any:
+        """Merge the output of a rep into the outputs merged so far (None for the first rep). Streamed reducers only."""
+        raise NotImplementedError
+
+    def _fields(
+        self, history: History, fields: Union[List[str], None]
+    ) -> Sequence[str]:
+        return list(history.keys()) if fields is None else fields
+
+
+@dataclass
+class FinalValues(ReducerBase):
+    """
+    Value of each field on the last step.
+
+    :param fields: Fields to keep. Defaults to all fields in the History.
+    """
+
+    fields: List[str] = None
+    name = "final"
+
+    def reduce(self, history: History) -> Dict[str, Any]:
+        return {
+            k: history[k][-1] for k in self._fields(history, self.fields) if history[k]
+        }
+
+
+@dataclass
+class TimeSeries(ReducerBase):
+    """
+    Full time series of selected fields, as compact arrays rather than lists.
+
+    :param fields: Fields to keep.
+    :param dtype: dtype of the returned arrays.
+    """
+
+    fields: List[str] = None
+    dtype: type = np.float32
+    name = "time_series"
+
+    def reduce(self, history: History) -> Dict[str, np.ndarray]:
+        return {
+            k: np.asarray(history[k], dtype=self.dtype)
+            for k in self._fields(history, self.fields)
+        }
+
+
+@dataclass
+class Quantiles(ReducerBase):
+    """
+    Quantiles of each selected field over the steps of the rep.
+
+    :param fields: Fields to summarise. Defaults to all fields in the History.
+    :param q: Quantiles to calculate, in [0, 1].
+    """
+
+    fields: List[str] = None
+    q: Sequence[float] = (0.05, 0.5, 0.95)
+    name = "quantiles"
+
+    def reduce(self, history: History) -> Dict[str, float]:
+        reduced = {}
+        for k in self._fields(history, self.fields):
+            values = np.asarray(history[k], dtype=float)
+            if len(values) == 0:
+                continue
+            for q, v in zip(self.q, np.nanquantile(values, self.q)):
+                reduced[f"{k}__q{q:g}"] = float(v)
+
+        return reduced
+
+
+@dataclass
+class StepStatistics(ReducerBase):
+    """
+    Per-step mean, variance and approximate quantiles of each selected field across reps, see statistics.StepStats.
+
+    Streamed: each rep's payload is just its series, as compact arrays, and MultiSim merges them into a single
+    StepStats per field as each task's results arrive, so memory in the main process stays constant in the number of
+    reps. The merged stats are in MultiSim.merged_results["step_statistics"], by field, see also MultiSim.step_bands.
+
+    :param fields: Fields to summarise. Defaults to all fields in the History.
+    :param sketch_size: Maximum number of centroids kept per step for the quantiles.
+    :param dtype: dtype of the series sent back from the workers.
+    """
+
+    fields: List[str] = None
+    sketch_size: int = 200
+    dtype: type = np.float32
+    name = "step_statistics"
+    streamed = True
+
+    def reduce(self, history: History) -> Dict[str, np.ndarray]:
+        return {
+            k: np.asarray(history[k], dtype=self.dtype)
+            for k in self._fields(history, self.fields)
+        }
+
+    def merge(
+        self, merged: Optional[Dict[str, StepStats]], reduced: Dict[str, np.ndarray]
+    ) -> Dict[str, StepStats]:
+        stats = {
+            k: StepStats.from_series(v, sketch_size=self.sketch_size)
+            for k, v in reduced.items()
+        }
+        if merged is None:
+            return stats
+
+        return {
+            **merged,
+            **{k: merged[k].merge(v) if k in merged else v for k, v in stats.items()},
+        }
@@ -0,0 +1,147 @@
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Init parameters left out of init_params for non-dataclass objects (eg. agents). Agents are attached to the Sim's env,
+# and reseeded from each rep's seed, so these don't define the config.
+_SKIPPED_PARAMS = ("self", "env_spec", "env", "seed")
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for numpy scalars and types (eg. agent classes in configs), used for config hashes and logs."""
+    if hasattr(obj, "item"):
+        return obj.item()
+    if isinstance(obj, type):
+        return obj.__name__
+
+    return str(obj)
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Stable hash of a config dict, independent of key order."""
+    dumped = json.dumps(config, sort_keys=True, default=_json_default)
+    return hashlib.sha1(dumped.encode()).hexdigest()
+
+
+def _init_param_names(cls: type) -> List[str]:
+    """Names of the named parameters of the __init__ methods in the class's MRO, as most of the agents pass **kwargs up."""
+    names = []
+    for klass in cls.__mro__:
+        if "__init__" not in klass.__dict__:
+            continue
+        try:
+            parameters = inspect.signature(klass.__dict__["__init__"]).parameters
+        except (TypeError, ValueError):
+            continue
+        for p in parameters.values():
+            if (
+                (p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD))
+                and (p.name not in _SKIPPED_PARAMS)
+                and (p.name not in names)
+            ):
+                names.append(p.name)
+
+    return names
+
+
+def init_params(obj: Any) -> Any:
+    """
+    JSON-able description of an object by the parameters it was built with, for config hashes.
+
+    Dataclasses (eg. Environment and its components, or NumpyDense models) are described by their init fields, other
+    objects (eg. agents) by their attributes named like their __init__ parameters (except those in _SKIPPED_PARAMS).
+    Nested objects, such as the agents of a MultiAgent, are described recursively. Arrays are replaced by a digest of
+    their contents.
+    """
+    if (obj is None) or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        digest = hashlib.sha1(np.ascontiguousarray(obj).tobytes()).hexdigest()
+        return {"shape": list(obj.shape), "dtype": str(obj.dtype), "sha1": digest}
+    if isinstance(obj, dict):
+        return {str(k): init_params(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [init_params(v) for v in obj]
+    if isinstance(obj, functools.partial):
+        return {
+            "func": init_params(obj.func),
+            "args": init_params(obj.args),
+            "keywords": init_params(obj.keywords),
+        }
+    if isinstance(obj, type) or inspect.isroutine(obj):
+        return f"{obj.__module__}.{obj.__qualname__}"
+
+    if dataclasses.is_dataclass(obj):
+        names = [f.name for f in dataclasses.fields(obj) if f.init]
+    else:
+        names = [n for n in _init_param_names(type(obj)) if hasattr(obj, n)]
+
+    return {
+        "type": f"{type(obj).__module__}.{type(obj).__qualname__}",
+        **{n: init_params(getattr(obj, n)) for n in names},
+    }
+
+
+@dataclass
+class ResultCache:
+    """
+    SQLite cache of reduced rep results, keyed by (config hash, rep seed).
+
+    Results are written as soon as reps complete, so interrupted Sweeps and MultiSims can resume from the cache.
+
+    :param path: Path to the SQLite database file. ":memory:" keeps the cache for the lifetime of this object only.
+    """
+
+    path: str = "sweep_cache.db"
+
+    def __post_init__(self) -> None:
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "config_hash TEXT NOT NULL, rep_seed INTEGER NOT NULL, config TEXT NOT NULL, result BLOB NOT NULL, "
+            "PRIMARY KEY (config_hash, rep_seed))"
+        )
+        self._conn.commit()
+
+    def get(self, config_hash: str, rep_seeds: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Cached results of any of the rep seeds of a config, by rep seed."""
+        rows = self._conn.execute(
+            "SELECT rep_seed, result FROM results WHERE config_hash = ?",
+            (config_hash,),
+        ).fetchall()
+        wanted = set(rep_seeds)
+
+        return {seed: pickle.loads(res) for seed, res in rows if seed in wanted}
+
+    def put(
+        self,
+        config_hash: str,
+        config: Dict[str, Any],
+        results: Dict[int, Dict[str, Any]],
+    ) -> None:
+        """Store the results of a config, by rep seed."""
+        config_json = json.dumps(config, sort_keys=True, default=_json_default)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            [
+                (config_hash, seed, config_json, pickle.dumps(res))
+                for seed, res in results.items()
+            ],
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
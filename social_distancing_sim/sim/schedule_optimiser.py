@@ -0,0 +1,222 @@
+import math
+import multiprocessing
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib.executor import get_memmapping_executor
+from tqdm import tqdm
+
+from social_distancing_sim.environment.seeding import derive_seeds
+from social_distancing_sim.sim.multi_sim import MultiSim
+from social_distancing_sim.sim.reducers import FinalValues
+from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.sweep import latin_hypercube
+from social_distancing_sim.sim.tracking import NoOpTracker
+
+
+def policy_schedule(**params: int) -> Dict[str, Any]:
+    """
+    Policy agent kwargs (start_step and end_step dicts, and actions_per_turn) from flat schedule parameters.
+
+    Parameters are named {action}_start, and either {action}_end or {action}_duration, where action is an action name
+    (eg. "isolate"), so schedules can be searched over as independent ints. Durations are often easier to bound than
+    end steps, as any start with any duration is valid. eg.
+
+        policy_schedule(isolate_start=10, isolate_duration=20, actions_per_turn=3)
+        -> {"start_step": {"isolate": 10}, "end_step": {"isolate": 30}, "actions_per_turn": 3}
+    """
+    kwargs: Dict[str, Any] = {"start_step": {}, "end_step": {}}
+    for name, value in params.items():
+        if name == "actions_per_turn":
+            kwargs[name] = int(value)
+            continue
+
+        action, _, kind = name.rpartition("_")
+        if kind == "start":
+            kwargs["start_step"][action] = int(value)
+        elif kind == "end":
+            kwargs["end_step"][action] = int(value)
+        elif kind != "duration":
+            raise ValueError(
+                f"Unknown schedule parameter {name}, expected actions_per_turn or {{action}}_start, _end or _duration."
+            )
+
+    for name, value in params.items():
+        action, _, kind = name.rpartition("_")
+        if kind == "duration":
+            kwargs["end_step"][action] = kwargs["start_step"].get(action, 0) + int(
+                value
+            )
+
+    return kwargs
+
+
+@dataclass
+class ScheduleOptimiser:
+    """
+    Search for the config (eg. a policy agent schedule, see policy_schedule) with the best mean metric, by successive
+    halving rather than running every config for the full number of reps.
+
+    All candidates are run for min_reps reps, then only the best 1/eta of them are run for eta times as many reps,
+    and so on until a single candidate is left or the survivors have been run for max_reps. Poor candidates are cut
+    after a few reps, so most of the budget is spent telling the good ones apart.
+
+    Rep seeds are derived from seed, so rep i of every candidate shares random numbers (see MultiSim.seed) and
+    candidates are ranked on the same reps, which removes most of the rep to rep noise from the comparisons. Each
+    rung's reps of all the surviving candidates are run on one process pool, and reps already run in earlier rungs
+    aren't run again.
+
+    :param factory: Callable returning the Sim to run for a config, called with the config as kwargs, as for Sweep.
+    :param bounds: (low, high) for each parameter, candidates are a Latin hypercube design over these (see
+                   sweep.latin_hypercube). Int bounds give int parameters.
+    :param design: List of candidate configs to use instead of sampling from bounds.
+    :param n_candidates: Number of candidates to sample from bounds.
+    :param min_reps: Number of reps every candidate is run for in the first rung.
+    :param max_reps: Maximum number of reps for any candidate.
+    :param eta: Factor the number of candidates is cut by, and the number of reps is increased by, in each rung.
+    :param budget: Optional maximum total number of reps. No rung is started if it would exceed this, and the best
+                   candidate so far is returned.
+    :param metric: FinalValues result to maximise.
+    :param n_jobs: Number of worker processes.
+    :param name: Name of the optimisation, used for the MultiSims.
+    :param seed: Seed to derive rep seeds and sample candidates from.
+    :param chunk_size: Dispatch reps in chunks of this size, see MultiSim.chunk_size.
+    """
+
+    factory: Callable[..., Sim]
+    bounds: Optional[Dict[str, Tuple[float, float]]] = None
+    design: Optional[List[Dict[str, Any]]] = None
+    n_candidates: int = 27
+    min_reps: int = 5
+    max_reps: int = 100
+    eta: int = 3
+    budget: Optional[int] = None
+    metric: str = "Overall score"
+    n_jobs: int = multiprocessing.cpu_count() - 2
+    name: str = "Unnamed schedule optimisation"
+    seed: int = 0
+    chunk_size: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.design is None:
+            if self.bounds is None:
+                raise ValueError(
+                    "Specify either bounds to sample candidates from, or a design."
+                )
+            self.design = latin_hypercube(
+                self.n_candidates, seed=self.seed, **self.bounds
+            )
+
+        self.scores: List[Dict[int, float]] = [{} for _ in self.design]
+        self.results = pd.DataFrame()
+        self.best: Optional[Dict[str, Any]] = None
+        self.n_reps_run = 0
+        self._multi_sims: Dict[int, MultiSim] = {}
+
+    def _multi_sim(self, candidate: int) -> MultiSim:
+        # Keep each candidate's MultiSim across rungs, and let workers keep a Sim for every candidate, so chunked
+        # workers reuse the Sims they've built
+        if candidate not in self._multi_sims:
+            self._multi_sims[candidate] = MultiSim(
+                self.factory(**self.design[candidate]),
+                n_reps=self.max_reps,
+                n_jobs=1,
+                name=self.name,
+                chunk_size=self.chunk_size,
+                seed=self.seed,
+                tracker=NoOpTracker(),
+                max_worker_sims=len(self.design),
+            )
+
+        return self._multi_sims[candidate]
+
+    def _tasks(
+        self, candidates: List[int], rep_seeds: List[int]
+    ) -> List[Tuple[int, List[int]]]:
+        """(candidate, rep seeds) tasks for the reps of the candidates that haven't been run yet."""
+        size = 1 if self.chunk_size is None else self.chunk_size
+        tasks = []
+        for c in candidates:
+            missing = [s for s in rep_seeds if s not in self.scores[c]]
+            tasks.extend(
+                (c, missing[i : i + size]) for i in range(0, len(missing), size)
+            )
+
+        return tasks
+
+    def _evaluate(self, tasks: List[Tuple[int, List[int]]], desc: str) -> None:
+        executor = get_memmapping_executor(max(1, self.n_jobs))
+        futures = {
+            executor.submit(self._multi_sim(c)._run_task, seeds): (c, seeds)
+            for c, seeds in tasks
+        }
+        with tqdm(total=sum(len(s) for _, s in tasks), desc=desc) as progress:
+            for future in as_completed(futures):
+                c, seeds = futures[future]
+                for seed, reduced in zip(seeds, future.result()):
+                    self.scores[c][seed] = reduced[FinalValues.name][self.metric]
+                self.n_reps_run += len(seeds)
+                progress.update(len(seeds))
+
+    def _row(self, candidate: int, rung: int, values: np.ndarray) -> Dict[str, Any]:
+        return {
+            **{
+                k: v.__name__ if isinstance(v, type) else v
+                for k, v in self.design[candidate].items()
+            },
+            "candidate": candidate,
+            "rung": rung,
+            "n_reps": len(values),
+            "mean": values.mean(),
+            "std": values.std(ddof=1) if len(values) > 1 else 0.0,
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run successive halving, returns the best config. The mean and standard deviation of the metric for each
+        candidate in each rung it was run in are in .results.
+        """
+        rep_seeds = derive_seeds(self.seed, self.max_reps)
+        alive = list(range(len(self.design)))
+        rows = []
+
+        rung = 0
+        while True:
+            n_reps = min(self.max_reps, self.min_reps * self.eta**rung)
+            tasks = self._tasks(alive, rep_seeds[0:n_reps])
+            cost = sum(len(s) for _, s in tasks)
+            if (self.budget is not None) and (self.n_reps_run + cost > self.budget):
+                if rung == 0:
+                    raise ValueError(
+                        f"Budget of {self.budget} reps can't run {len(alive)} candidates for {n_reps} reps each."
+                    )
+                break
+
+            self._evaluate(tasks, desc=f"{self.name} (rung {rung})")
+            means = {
+                c: np.mean([self.scores[c][s] for s in rep_seeds[0:n_reps]])
+                for c in alive
+            }
+            # Sorted is stable, so ties go to the earlier candidate
+            alive = sorted(alive, key=lambda c: -means[c])
+            rows.extend(
+                self._row(
+                    c, rung, np.array([self.scores[c][s] for s in rep_seeds[0:n_reps]])
+                )
+                for c in alive
+            )
+            self.best = self.design[alive[0]]
+
+            if (n_reps >= self.max_reps) or (len(alive) == 1):
+                break
+            alive = alive[0 : max(1, math.ceil(len(alive) / self.eta))]
+            if len(alive) == 1:
+                break
+            rung += 1
+
+        self.results = pd.DataFrame(rows)
+
+        return self.best
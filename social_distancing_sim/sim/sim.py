@@ -1,8 +1,9 @@
 import os
+import pickle
 import shutil
 import warnings
 from dataclasses import dataclass, field
-from typing import Any, Iterable, Union
+from typing import Any, Iterable, Optional, Union
 
 import gym
 from tqdm import tqdm
@@ -11,6 +12,7 @@ from social_distancing_sim.agent import DummyAgent
 from social_distancing_sim.agent.non_learning_agent_base import NonLearningAgentBase
 from social_distancing_sim.environment.gym.gym_env import GymEnv
 from social_distancing_sim.environment.history import History
+from social_distancing_sim.environment.seeding import derive_named_seeds, derive_seeds
 
 try:
     from social_distancing_sim.agent.learning_agent_base import LearningAgentBase
@@ -24,6 +26,11 @@ except ImportError:
 class Sim:
     """
     Agent evaluation class (no training).
+
+    Long runs can be checkpointed by setting checkpoint_path. The env (including its random states and history), agent
+    and step are pickled there every checkpoint_every steps, and .run resumes from the checkpoint if it exists and was
+    saved by a run with the same seed. The checkpoint is removed once the run completes. Note the agent is replaced by
+    the checkpointed copy on resume.
     """
 
     env_spec: gym.envs.registration.EnvSpec
@@ -35,18 +42,22 @@ class Sim:
     save: bool = False
     tqdm_on: bool = False
     logging: bool = False
+    checkpoint_path: Optional[str] = None
+    checkpoint_every: int = 100
 
     _last_state: Any = field(init=False)
 
     def __post_init__(self):
-        self.env: GymEnv
+        self.env: Optional[GymEnv] = None
 
         if self.tqdm_on:
             self._tqdm = tqdm
 
         self._step: int = 0
 
-    def _prepare_agent(self) -> Any:
+    def _prepare_agent(
+        self, seed: Optional[int] = None, rebuild_env: bool = True
+    ) -> Any:
         """
         Prepare the agent; if there isn't one create a Dummy.
 
@@ -55,10 +66,37 @@ class Sim:
 
         This agent is reset here, as reset rebuilds from spec, resetting logging options (which default to off).
         These are set after reset.
+
+        :param seed: If set, used to derive seeds for the env (see GymEnv.reset) and agent for this run. If the spec
+                     doesn't fix the graph seed, the graph is also generated from this seed.
+        :param rebuild_env: If False, and an env has already been built, reuse it rather than building a new one from
+                            the spec. Resetting is much cheaper than rebuilding, which generates a new graph. If the
+                            spec doesn't fix the graph seed, a new graph is still generated on reset.
         """
-        self.env = self.env_spec.make()
-        self.agent.attach_to_env(self.env)
-        initial_obs = self.agent.env.reset()
+        reuse_env = (not rebuild_env) and (self.env is not None)
+        if not reuse_env:
+            self.env = self.env_spec.make()
+            self.agent.attach_to_env(self.env)
+
+        if seed is None:
+            env_seed = None
+            if reuse_env:
+                self.agent.reset()
+        else:
+            # Env and agent get separate seeds, so reps with the same seed share env randomness for any agent
+            seeds = derive_named_seeds(seed, ("environment", "agent"))
+            env_seed = seeds["environment"]
+            self.agent.reseed(seeds["agent"])
+
+        regenerate_graph = (not self.env.unwrapped.fixed_graph) and (
+            reuse_env or (env_seed is not None)
+        )
+        if regenerate_graph and (env_seed is None):
+            # A seed is needed to generate the new graph from
+            env_seed = derive_seeds(None, 1)[0]
+        initial_obs, _ = self.agent.env.reset(
+            seed=env_seed, options={"regenerate_graph": regenerate_graph}
+        )
 
         # Set the new save paths
         self.save_path = os.path.join(
@@ -92,27 +130,81 @@ class Sim:
 
         self.agent.env.sds_env.plot(plot=self.plot, save=self.save)
 
-    def run(self) -> History:
-        self._last_state = self._prepare_agent()
-        self.agent.env.sds_env._total_steps = self.n_steps
-        self.agent.env.sds_env.plot(plot=self.plot, save=self.save)
+    def run(self, seed: Optional[int] = None, rebuild_env: bool = True) -> History:
+        """
+        Run the sim for .n_steps.
+
+        :param seed: Optional seed for this run, see ._prepare_agent.
+        :param rebuild_env: If False, reuse the env from the previous run, see ._prepare_agent.
+        """
+        if not self._load_checkpoint(seed):
+            self._step = 0
+            self._last_state = self._prepare_agent(seed=seed, rebuild_env=rebuild_env)
+            self.agent.env.sds_env._total_steps = self.n_steps
+            self.agent.env.sds_env.plot(plot=self.plot, save=self.save)
 
         with warnings.catch_warnings():
             warnings.simplefilter("ignore", category=RuntimeWarning)
             warnings.simplefilter("ignore", category=UserWarning)
 
             for _ in self._tqdm(
-                range(self.n_steps),
+                range(self._step, self.n_steps),
                 desc=f"{self.agent.env.sds_env.name}: {self.agent.name}",
             ):
                 self.step()
                 self._step += 1
+                if (
+                    (self.checkpoint_path is not None)
+                    and (self._step % self.checkpoint_every == 0)
+                    and (self._step < self.n_steps)
+                ):
+                    self._save_checkpoint(seed)
 
         if self.save:
             self.agent.env.sds_env.replay()
 
+        if (self.checkpoint_path is not None) and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
         return self.history
 
+    def _save_checkpoint(self, seed: Optional[int]) -> None:
+        checkpoint = {
+            "seed": seed,
+            "n_steps": self.n_steps,
+            "step": self._step,
+            # Together, so the agent's reference to the env survives pickling
+            "env": self.env,
+            "agent": self.agent,
+            "last_state": self._last_state,
+        }
+        # Write then move, so a run dying mid-write doesn't corrupt the last good checkpoint
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load_checkpoint(self, seed: Optional[int]) -> bool:
+        """Restore from the checkpoint, if there is one from a run with the same seed. Returns True if restored."""
+        if (self.checkpoint_path is None) or (not os.path.exists(self.checkpoint_path)):
+            return False
+
+        with open(self.checkpoint_path, "rb") as f:
+            checkpoint = pickle.load(f)
+        if (checkpoint["seed"] != seed) or (checkpoint["n_steps"] != self.n_steps):
+            warnings.warn(
+                f"Ignoring checkpoint {self.checkpoint_path}, it's from a different run (seed={checkpoint['seed']}, "
+                f"n_steps={checkpoint['n_steps']})."
+            )
+            return False
+
+        self.env = checkpoint["env"]
+        self.agent = checkpoint["agent"]
+        self._step = checkpoint["step"]
+        self._last_state = checkpoint["last_state"]
+
+        return True
+
     @property
     def history(self) -> History:
         return self.agent.env.sds_env.history
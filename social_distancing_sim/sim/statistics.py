@@ -0,0 +1,196 @@
+from dataclasses import dataclass
+from typing import Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+
+@dataclass
+class RunningStats:
+    """
+    Mean and variance of a stream of values, updated online with Welford's algorithm.
+
+    Only the count, mean and sum of squared differences are stored, so values don't need to be kept. Stats from
+    separate streams can be combined with .merge.
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, x: float) -> None:
+        if np.isnan(x):
+            return
+
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def update_many(self, xs: Iterable[float]) -> None:
+        for x in xs:
+            self.update(x)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine with the stats of another stream (Chan et al.), returns a new RunningStats."""
+        n = self.n + other.n
+        if n == 0:
+            return RunningStats()
+
+        delta = other.mean - self.mean
+        return RunningStats(
+            n=n,
+            mean=self.mean + delta * other.n / n,
+            m2=self.m2 + other.m2 + delta**2 * self.n * other.n / n,
+        )
+
+    @property
+    def var(self) -> float:
+        """Sample variance, NaN with fewer than 2 values."""
+        return self.m2 / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.var))
+
+    @property
+    def sem(self) -> float:
+        """Standard error of the mean."""
+        return self.std / np.sqrt(self.n) if self.n > 1 else np.nan
+
+    def ci_half_width(self, z: float = 1.96) -> float:
+        """Half-width of the confidence interval of the mean (normal approximation, 95% by default)."""
+        return z * self.sem
+
+
+def _compress(
+    values: np.ndarray, weights: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Group each row's weighted centroids, in order of value, into size bins of roughly equal total weight."""
+    if values.shape[1] <= size:
+        return values, weights
+
+    order = np.argsort(values, axis=1, kind="stable")
+    values = np.take_along_axis(values, order, axis=1)
+    weights = np.take_along_axis(weights, order, axis=1)
+    total = weights.sum(axis=1, keepdims=True)
+    before = np.cumsum(weights, axis=1) - weights
+    rank = np.divide(before, total, out=np.zeros_like(before), where=total > 0)
+    bins = np.minimum((rank * size).astype(int), size - 1)
+
+    n_rows = values.shape[0]
+    idx = (np.arange(n_rows)[:, None] * size + bins).ravel()
+    new_weights = np.bincount(idx, weights=weights.ravel(), minlength=n_rows * size)
+    new_sums = np.bincount(
+        idx, weights=(values * weights).ravel(), minlength=n_rows * size
+    )
+    new_values = np.divide(
+        new_sums, new_weights, out=np.zeros_like(new_sums), where=new_weights > 0
+    )
+
+    return new_values.reshape(n_rows, size), new_weights.reshape(n_rows, size)
+
+
+@dataclass(eq=False)
+class StepStats:
+    """
+    Per-step mean, variance and approximate quantiles of a stream of time series (eg. one per rep), in constant memory.
+
+    Mean and variance are updated per step with Welford's algorithm, merged with Chan's method as for RunningStats.
+    Quantiles come from a sketch per step of at most sketch_size weighted centroids. When a merge would exceed
+    sketch_size, the sorted centroids are grouped into sketch_size bins of equal weight, so quantiles are accurate to
+    about 1 / sketch_size in rank. Until then they're exact. NaNs are ignored, and shorter series don't contribute to
+    later steps.
+    """
+
+    n: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+    values: np.ndarray
+    weights: np.ndarray
+    sketch_size: int = 200
+
+    @classmethod
+    def from_series(cls, x: Iterable[float], sketch_size: int = 200) -> "StepStats":
+        x = np.asarray(x, dtype=float)
+        valid = ~np.isnan(x)
+        x = np.where(valid, x, 0.0)
+
+        return cls(
+            n=valid.astype(int),
+            mean=x,
+            m2=np.zeros(len(x)),
+            values=x[:, None],
+            weights=valid.astype(float)[:, None],
+            sketch_size=sketch_size,
+        )
+
+    @property
+    def n_steps(self) -> int:
+        return len(self.n)
+
+    def _padded(self, n_steps: int) -> "StepStats":
+        pad = n_steps - self.n_steps
+        if pad == 0:
+            return self
+
+        return StepStats(
+            *[
+                np.pad(a, [(0, pad)] + [(0, 0)] * (a.ndim - 1))
+                for a in (self.n, self.mean, self.m2, self.values, self.weights)
+            ],
+            sketch_size=self.sketch_size,
+        )
+
+    def merge(self, other: "StepStats") -> "StepStats":
+        """Combine with the stats of other series, returns a new StepStats."""
+        n_steps = max(self.n_steps, other.n_steps)
+        a, b = self._padded(n_steps), other._padded(n_steps)
+        n = a.n + b.n
+        frac = np.divide(b.n, n, out=np.zeros(n_steps), where=n > 0)
+        delta = b.mean - a.mean
+        values, weights = _compress(
+            np.concatenate((a.values, b.values), axis=1),
+            np.concatenate((a.weights, b.weights), axis=1),
+            self.sketch_size,
+        )
+
+        return StepStats(
+            n=n,
+            mean=a.mean + delta * frac,
+            m2=a.m2 + b.m2 + delta**2 * a.n * frac,
+            values=values,
+            weights=weights,
+            sketch_size=self.sketch_size,
+        )
+
+    @property
+    def var(self) -> np.ndarray:
+        """Sample variance per step, NaN for steps with fewer than 2 values."""
+        return np.divide(
+            self.m2, self.n - 1, out=np.full(self.n_steps, np.nan), where=self.n > 1
+        )
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.var)
+
+    def quantile(self, q: Union[float, Sequence[float]]) -> np.ndarray:
+        """
+        Approximate quantiles per step, interpolating between centroids. While the sketch is exact, these match
+        np.quantile(..., method="hazen").
+
+        :param q: Quantile or quantiles, in [0, 1].
+        :return: Array of shape (n_steps,) for a single quantile, or (n_steps, len(q)).
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        quantiles = np.full((self.n_steps, len(qs)), np.nan)
+        for step, (values, weights) in enumerate(zip(self.values, self.weights)):
+            keep = weights > 0
+            if not keep.any():
+                continue
+            order = np.argsort(values[keep])
+            values, weights = values[keep][order], weights[keep][order]
+            mid = np.cumsum(weights) - weights / 2
+            quantiles[step] = np.interp(qs * weights.sum(), mid, values)
+
+        return quantiles if np.ndim(q) else quantiles[:, 0]
@@ -0,0 +1,230 @@
+import itertools
+import multiprocessing
+import uuid
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from gym.envs.registration import EnvSpec
+from joblib.executor import get_memmapping_executor
+from tqdm import tqdm
+
+from social_distancing_sim.environment.environment import Environment
+from social_distancing_sim.environment.gym.gym_env import GymEnv
+from social_distancing_sim.environment.seeding import derive_seeds
+from social_distancing_sim.sim.multi_sim import MultiSim
+from social_distancing_sim.sim.reducers import FinalValues, ReducerBase
+from social_distancing_sim.sim.result_cache import ResultCache, config_hash
+from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.tracking import NoOpTracker
+
+# MultiSims built in this (worker) process for the configs of the most recent Sweep runs, keyed by run and config. Reused
+# by all the tasks of a config the worker runs, so the factory is only called once per worker (per config).
+_WORKER_MULTI_SIMS: "OrderedDict[str, MultiSim]" = OrderedDict()
+
+
+def grid(**params: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    Full factorial design over the given parameter values.
+
+    eg. grid(virulence=[0.01, 0.02], actions_per_turn=[3, 6]) -> 4 configs. The last parameter varies fastest.
+    """
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+
+
+def latin_hypercube(
+    n_configs: int, seed: Optional[int] = None, **bounds: Tuple[float, float]
+) -> List[Dict[str, Any]]:
+    """
+    Latin hypercube design of n_configs configs over continuous parameter ranges.
+
+    Each parameter's range is split into n_configs equal strata and each stratum is sampled exactly once, so the design
+    covers every parameter's range evenly with far fewer configs than a grid. Parameters with int bounds are sampled
+    as ints.
+
+    :param n_configs: Number of configs.
+    :param seed: Seed for the sampling.
+    :param bounds: (low, high) for each parameter, eg. virulence=(0.005, 0.05).
+    """
+    state = np.random.RandomState(seed)
+    columns = {}
+    for name, (lo, hi) in bounds.items():
+        u = (state.permutation(n_configs) + state.uniform(size=n_configs)) / n_configs
+        values = lo + u * (hi - lo)
+        if isinstance(lo, (int, np.integer)) and isinstance(hi, (int, np.integer)):
+            # Strata over [lo, hi + 1) so the top value is as likely as any other
+            values = np.minimum(np.floor(lo + u * (hi + 1 - lo)), hi).astype(int)
+        columns[name] = values.tolist()
+
+    return [{name: columns[name][i] for name in bounds} for i in range(n_configs)]
+
+
+def _make_gym_env(env: Environment) -> GymEnv:
+    # Clone so envs made from the same spec (in the same process) don't share state
+    return GymEnv(env=env.clone())
+
+
+def _run_config_task(
+    key: str,
+    factory: Callable[..., Sim],
+    config: Dict[str, Any],
+    multi_sim_kwargs: Dict[str, Any],
+    seeds: List[int],
+) -> List[Dict[str, Any]]:
+    """Run a task of a config's reps in a worker, building the config's Sim and MultiSim here if it hasn't already."""
+    multi_sim = _WORKER_MULTI_SIMS.get(key)
+    if multi_sim is None:
+        multi_sim = MultiSim(factory(**config), **multi_sim_kwargs)
+        _WORKER_MULTI_SIMS[key] = multi_sim
+    _WORKER_MULTI_SIMS.move_to_end(key)
+    while len(_WORKER_MULTI_SIMS) > multi_sim.max_worker_sims:
+        _WORKER_MULTI_SIMS.popitem(last=False)
+
+    return multi_sim._run_task(seeds)
+
+
+def environment_spec(env: Environment, max_episode_steps: int = 1000) -> EnvSpec:
+    """
+    Create an (unregistered) EnvSpec that makes GymEnvs wrapping copies of env.
+
+    Useful in sweep factories, where an Environment is built from the config rather than from a registered template.
+    """
+    return EnvSpec(
+        id=f"SDSSweep-{env.name}-v0",
+        entry_point=_make_gym_env,
+        max_episode_steps=max_episode_steps,
+        kwargs={"env": env},
+    )
+
+
+@dataclass
+class Sweep:
+    """
+    Run a design of configs, each as a MultiSim, caching the reduced results of every (config, rep seed) point.
+
+    Configs are dicts of parameters (see grid and latin_hypercube), and the factory builds the Sim for a config from
+    them, eg. factory(virulence=0.01, actions_per_turn=3). Points already in the cache are skipped, so re-running a
+    sweep after adding configs, or increasing n_reps, only runs the new points. The factory is only called for configs
+    with missing points, in the workers (once per worker and config), so only the factory and config are sent with
+    each task, rather than the built Sim.
+
+    Rep seeds are derived from seed, so rep i of every config shares random numbers (see MultiSim.seed).
+
+    The cache key covers the config, name and reducers, but not the factory itself. Change the name to invalidate the
+    cache if the factory changes.
+
+    :param factory: Callable returning the Sim to run for a config, called with the config as kwargs.
+    :param design: List of configs to run.
+    :param n_reps: Number of reps per config.
+    :param n_jobs: Number of worker processes.
+    :param name: Name of the sweep, part of the cache key.
+    :param seed: Seed to derive rep seeds from.
+    :param chunk_size: Dispatch reps in chunks of this size, see MultiSim.chunk_size.
+    :param reducers: Reducers to run on each rep, see MultiSim.reducers.
+    :param cache: ResultCache to read from and write to. If None, nothing is cached.
+    """
+
+    factory: Callable[..., Sim]
+    design: List[Dict[str, Any]]
+    n_reps: int = 100
+    n_jobs: int = multiprocessing.cpu_count() - 2
+    name: str = "Unnamed sweep"
+    seed: int = 0
+    chunk_size: Optional[int] = None
+    reducers: List[ReducerBase] = None
+    cache: Optional[ResultCache] = None
+
+    def __post_init__(self) -> None:
+        self.results = pd.DataFrame()
+        self.reduced_results: List[Dict[int, Dict[str, Any]]] = []
+
+    def _hash(self, config: Dict[str, Any]) -> str:
+        return config_hash(
+            {
+                "name": self.name,
+                "config": config,
+                "reducers": [repr(r) for r in self.reducers or []],
+            }
+        )
+
+    def _multi_sim_kwargs(self) -> Dict[str, Any]:
+        """MultiSim args used to run each config in the workers, see _run_config_task."""
+        return {
+            "n_reps": self.n_reps,
+            "n_jobs": 1,
+            "name": self.name,
+            "reducers": self.reducers,
+            "chunk_size": self.chunk_size,
+            "seed": self.seed,
+            "tracker": NoOpTracker(),
+        }
+
+    def run(self) -> pd.DataFrame:
+        """Run the missing points, returns the results of all the points (one row per config and rep)."""
+        rep_seeds = derive_seeds(self.seed, self.n_reps)
+        hashes = [self._hash(config) for config in self.design]
+        self.reduced_results = [
+            {} if self.cache is None else self.cache.get(h, rep_seeds) for h in hashes
+        ]
+
+        tasks = []
+        for config_i, config in enumerate(self.design):
+            missing = [s for s in rep_seeds if s not in self.reduced_results[config_i]]
+            size = 1 if self.chunk_size is None else self.chunk_size
+            tasks.extend(
+                (config_i, missing[i : i + size]) for i in range(0, len(missing), size)
+            )
+
+        if len(tasks) > 0:
+            # Keys of the configs' MultiSims in the workers, unique to this run so they aren't reused by later runs
+            run_key = uuid.uuid4().hex
+            multi_sim_kwargs = self._multi_sim_kwargs()
+            executor = get_memmapping_executor(max(1, self.n_jobs))
+            futures = {
+                executor.submit(
+                    _run_config_task,
+                    f"{run_key}-{config_i}",
+                    self.factory,
+                    self.design[config_i],
+                    multi_sim_kwargs,
+                    seeds,
+                ): (config_i, seeds)
+                for config_i, seeds in tasks
+            }
+            with tqdm(total=sum(len(t[1]) for t in tasks), desc=self.name) as progress:
+                for future in as_completed(futures):
+                    config_i, seeds = futures[future]
+                    done = dict(zip(seeds, future.result()))
+                    self.reduced_results[config_i].update(done)
+                    if self.cache is not None:
+                        # Store as each task completes, so an interrupted sweep keeps its progress
+                        self.cache.put(hashes[config_i], self.design[config_i], done)
+                    progress.update(len(seeds))
+
+        self.results = self._results_frame(rep_seeds)
+
+        return self.results
+
+    def _results_frame(self, rep_seeds: List[int]) -> pd.DataFrame:
+        rows = []
+        for config_i, config in enumerate(self.design):
+            for rep, seed in enumerate(rep_seeds):
+                final = self.reduced_results[config_i][seed][FinalValues.name]
+                rows.append(
+                    {
+                        **{
+                            k: v.__name__ if isinstance(v, type) else v
+                            for k, v in config.items()
+                        },
+                        "config": config_i,
+                        "rep": rep,
+                        "rep_seed": seed,
+                        **final,
+                    }
+                )
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,127 @@
+import abc
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from social_distancing_sim.sim.result_cache import _json_default
+
+
+@dataclass
+class TrackerBase(abc.ABC):
+    """
+    Experiment tracking backend for MultiSim results.
+
+    Runs are buffered in memory by .log_run and written in batches, once batch_size runs are buffered or .flush is
+    called. MultiSim.run flushes after logging, ExperimentScheduler.run flushes once all its MultiSims are logged, so
+    share a tracker between MultiSims to batch their writes.
+
+    :param batch_size: Number of buffered runs that triggers a write.
+    """
+
+    batch_size: int = 100
+
+    def __post_init__(self) -> None:
+        self._buffer: List[Dict[str, Any]] = []
+
+    def log_run(
+        self, experiment: str, params: Dict[str, Any], metrics: Dict[str, float]
+    ) -> None:
+        """Buffer a run of an experiment, with its params and (final) metrics."""
+        self._buffer.append(
+            {
+                "experiment": experiment,
+                "timestamp": time.time(),
+                "params": params,
+                "metrics": metrics,
+            }
+        )
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered runs."""
+        if len(self._buffer) > 0:
+            self._write(self._buffer)
+        self._buffer = []
+
+    @abc.abstractmethod
+    def _write(self, runs: List[Dict[str, Any]]) -> None:
+        pass
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Don't copy buffered runs, they'd be written twice
+        state = self.__dict__.copy()
+        state["_buffer"] = []
+
+        return state
+
+
+@dataclass
+class NoOpTracker(TrackerBase):
+    """Discards all runs."""
+
+    def log_run(
+        self, experiment: str, params: Dict[str, Any], metrics: Dict[str, float]
+    ) -> None:
+        pass
+
+    def _write(self, runs: List[Dict[str, Any]]) -> None:
+        pass
+
+
+@dataclass
+class JsonlTracker(TrackerBase):
+    """
+    Appends runs to a local JSON lines file, one run per line. Load with pandas.read_json(path, lines=True).
+
+    :param path: Path to the file. Parent directories are created if needed.
+    """
+
+    path: str = "runs.jsonl"
+
+    def _write(self, runs: List[Dict[str, Any]]) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a") as f:
+            f.writelines(json.dumps(run, default=_json_default) + "\n" for run in runs)
+
+
+@dataclass
+class MlflowTracker(TrackerBase):
+    """
+    Logs each run as an MLflow run, with a single batched request per run.
+
+    mlflow is only imported when runs are written.
+
+    :param tracking_uri: MLflow tracking URI. Defaults to MLflow's default (or MLFLOW_TRACKING_URI).
+    """
+
+    tracking_uri: Optional[str] = None
+
+    def _write(self, runs: List[Dict[str, Any]]) -> None:
+        from mlflow.entities import Metric, Param
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient(tracking_uri=self.tracking_uri)
+        experiment_ids = {}
+        for run in runs:
+            name = run["experiment"]
+            if name not in experiment_ids:
+                experiment = client.get_experiment_by_name(name)
+                experiment_ids[name] = (
+                    client.create_experiment(name)
+                    if experiment is None
+                    else experiment.experiment_id
+                )
+
+            timestamp = int(run["timestamp"] * 1000)
+            mlflow_run = client.create_run(experiment_ids[name], start_time=timestamp)
+            client.log_batch(
+                mlflow_run.info.run_id,
+                metrics=[
+                    Metric(k, float(v), timestamp, 0) for k, v in run["metrics"].items()
+                ],
+                params=[Param(k, str(v)) for k, v in run["params"].items()],
+            )
+            client.set_terminated(mlflow_run.info.run_id)
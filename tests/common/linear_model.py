@@ -0,0 +1,28 @@
+import numpy as np
+
+
+class LinearModel:
+    """Stand in for a Keras Q model, a single linear layer trained with SGD."""
+
+    def __init__(self, n_inputs: int, n_actions: int, lr: float = 1e-3) -> None:
+        self.w = np.zeros((n_inputs, n_actions), dtype=np.float32)
+        self.b = np.zeros(n_actions, dtype=np.float32)
+        self.lr = lr
+        self.n_calls = {"predict_on_batch": 0, "train_on_batch": 0}
+
+    def predict_on_batch(self, x: np.ndarray) -> np.ndarray:
+        self.n_calls["predict_on_batch"] += 1
+        return x @ self.w + self.b
+
+    def train_on_batch(self, x: np.ndarray, y: np.ndarray) -> float:
+        self.n_calls["train_on_batch"] += 1
+        error = x @ self.w + self.b - y
+        self.w -= self.lr * x.T @ error / len(x)
+        self.b -= self.lr * error.mean(axis=0)
+        return float((error**2).mean())
+
+    def get_weights(self):
+        return [self.w.copy(), self.b.copy()]
+
+    def set_weights(self, weights) -> None:
+        self.w, self.b = weights[0].copy(), weights[1].copy()
@@ -0,0 +1,55 @@
+import unittest
+
+import gym
+
+from social_distancing_sim.agent.planning_agents.mcts_agent import MCTSAgent
+from social_distancing_sim.sim.sim import Sim
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestMCTSAgent(unittest.TestCase):
+    _sut = MCTSAgent
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def _run(self, n_jobs: int):
+        env = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").unwrapped
+        env.reset()
+        agent = self._sut(
+            actions_per_turn=2, seed=1, horizon=3, n_simulations=12, n_jobs=n_jobs
+        )
+        agent.attach_to_env(env)
+
+        turns = []
+        for _ in range(3):
+            actions_targets = agent.get_actions()
+            env.step(actions_targets)
+            turns.append((actions_targets, agent.last_visits.tolist()))
+
+        return turns
+
+    def test_root_parallel_search_reproducible(self):
+        # Act
+        first = self._run(n_jobs=2)
+        second = self._run(n_jobs=2)
+
+        # Assert
+        self.assertListEqual(first, second)
+        self.assertEqual(12, sum(first[0][1]))
+
+    def test_run_in_sim(self):
+        # Arrange
+        sim = Sim(
+            env_spec=gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec,
+            agent=self._sut(actions_per_turn=2, seed=1, horizon=2, n_simulations=6),
+            n_steps=5,
+            tqdm_on=False,
+        )
+
+        # Act
+        history = sim.run()
+
+        # Assert
+        self.assertEqual(5, len(history["Turn score"]))
@@ -0,0 +1,62 @@
+import unittest
+
+import gym
+
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    IsolationArrayAgent,
+)
+from social_distancing_sim.agent.planning_agents.mpc_agent import MPCAgent
+from social_distancing_sim.sim.sim import Sim
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestMPCAgent(unittest.TestCase):
+    _sut = MPCAgent
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def _run(self, n_jobs: int):
+        env = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").unwrapped
+        env.reset()
+        agent = self._sut(
+            actions_per_turn=2,
+            seed=1,
+            horizon=3,
+            n_rollouts=4,
+            n_jobs=n_jobs,
+            rollout_agent=IsolationArrayAgent(actions_per_turn=2),
+        )
+        agent.attach_to_env(env)
+
+        turns = []
+        for _ in range(3):
+            actions_targets = agent.get_actions()
+            env.step(actions_targets)
+            turns.append((actions_targets, agent.last_scores.tolist()))
+
+        return turns
+
+    def test_parallel_rollouts_match_serial(self):
+        # Act
+        serial = self._run(n_jobs=1)
+        parallel = self._run(n_jobs=2)
+
+        # Assert
+        self.assertListEqual(serial, parallel)
+
+    def test_run_in_sim(self):
+        # Arrange
+        sim = Sim(
+            env_spec=gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec,
+            agent=self._sut(actions_per_turn=2, seed=1, horizon=2, n_rollouts=2),
+            n_steps=5,
+            tqdm_on=False,
+        )
+
+        # Act
+        history = sim.run()
+
+        # Assert
+        self.assertEqual(5, len(history["Turn score"]))
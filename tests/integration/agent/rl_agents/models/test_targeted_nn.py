@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.models.numpy_targeted_nn import (
+    NumpyTargetedNN,
+)
+
+RUN_TESTS = True
+try:
+    from tensorflow import keras
+
+    from social_distancing_sim.agent.rl_agents.models.targeted_nn import TargetedNN
+except ImportError:
+    RUN_TESTS = False
+
+
+@unittest.skipUnless(RUN_TESTS, "Requires rlk")
+class TestTargetedNN(unittest.TestCase):
+    def setUp(self):
+        inputs, output = TargetedNN(
+            observation_shape=(7,),
+            n_actions=5,
+            output_activation=None,
+            opt="adam",
+            learning_rate=0.001,
+        )._model_architecture()
+        self._model = keras.Model(inputs=list(inputs), outputs=output)
+
+    def test_numpy_export_matches_keras_predictions(self):
+        # Arrange
+        state = np.random.RandomState(0)
+        summaries = state.uniform(size=(3, 7)).astype(np.float32)
+        nodes = state.randint(0, 2, size=(3, 30, 6)).astype(np.float32)
+
+        # Act
+        numpy_model = NumpyTargetedNN.from_keras(self._model)
+
+        # Assert
+        np.testing.assert_allclose(
+            self._model.predict_on_batch([summaries, nodes]),
+            numpy_model.predict(summaries, nodes),
+            rtol=1e-4,
+            atol=1e-5,
+        )
+        self.assertEqual(5, numpy_model.n_actions)
@@ -0,0 +1,52 @@
+import unittest
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.q_learning.actor_learner import (
+    ActorLearnerDQNTrainer,
+)
+from tests.common.env_fixtures import register_test_envs
+from tests.common.linear_model import LinearModel
+
+
+class TestActorLearnerDQNTrainer(unittest.TestCase):
+    _sut = ActorLearnerDQNTrainer
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def test_train_with_actor_processes(self):
+        # Arrange
+        spec = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec
+        n_inputs = gym.make(spec).unwrapped.sds_env.total_population * 6
+        trainer = self._sut(
+            env=spec,
+            model=LinearModel(n_inputs, 5),
+            target_model=LinearModel(n_inputs, 5),
+            activations=["linear"],
+            n_actors=2,
+            envs_per_actor=2,
+            steps_per_push=5,
+            updates_per_push=2,
+            sync_every=4,
+            n_steps=5,
+            learning_starts=20,
+            batch_size=8,
+            target_update_every=4,
+            seed=0,
+        )
+
+        # Act
+        history = trainer.train(n_updates=12)
+        more_history = trainer.train(n_updates=4)
+
+        # Assert
+        self.assertEqual(12, len(history["losses"]))
+        self.assertEqual(4, len(more_history["losses"]))
+        self.assertEqual(16, trainer._n_updates)
+        self.assertGreaterEqual(len(trainer.buffer), 20)
+        self.assertEqual(0, len(trainer.buffer) % 10)
+        self.assertGreater(len(history["episode_rewards"]), 0)
+        self.assertFalse(np.allclose(0, trainer.model.w))
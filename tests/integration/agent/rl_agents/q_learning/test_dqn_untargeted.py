@@ -6,6 +6,7 @@ from functools import partial
 from unittest.mock import patch
 
 import gym
+import numpy as np
 
 from social_distancing_sim.environment.gym.wrappers.flatten_obs_wrapper import (
     FlattenObsWrapper,
@@ -153,3 +154,20 @@ class TestDQNUntargeted(unittest.TestCase):
             n_reps=3,
         )
         ms.run()
+
+    def test_to_numpy_matches_keras_predictions(self):
+        # Arrange
+        self._agent.train(render=False, n_episodes=1)
+        states = np.random.RandomState(0).randint(0, 2, size=(4, 180))
+
+        # Act
+        numpy_agent = self._agent.to_numpy()
+
+        # Assert
+        np.testing.assert_allclose(
+            self._agent.rlk_agent._action_model.predict_on_batch(states),
+            numpy_agent.model.predict(states),
+            rtol=1e-4,
+            atol=1e-5,
+        )
+        self.assertEqual(self._agent.actions_per_turn, numpy_agent.actions_per_turn)
@@ -59,10 +59,10 @@ class TestGymEnv(unittest.TestCase):
         agent: Union[NonLearningAgentBase, LearningAgentBase], steps: int = 25
     ) -> Union[NonLearningAgentBase, LearningAgentBase]:
         """This loop defines Sim runs, all agents should work with this."""
-        state = agent.env.reset()
+        state, _ = agent.env.reset()
         for _ in range(steps):
             actions, targets = agent.get_actions(state)
-            state, _, _, _ = agent.env.step((actions, targets))
+            state, _, _, _, _ = agent.env.step((actions, targets))
 
         return agent
 
@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import patch
+
+import gym
+import numpy as np
+from joblib.executor import get_memmapping_executor
+
+from social_distancing_sim.agent.basic_agents.dummy_agent import DummyAgent
+from social_distancing_sim.agent.basic_agents.random_agent import RandomAgent
+from social_distancing_sim.sim.experiment_scheduler import ExperimentScheduler
+from social_distancing_sim.sim.multi_sim import MultiSim
+from social_distancing_sim.sim.reducers import StepStatistics
+from social_distancing_sim.sim.result_cache import ResultCache
+from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.tracking import JsonlTracker
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestExperimentScheduler(unittest.TestCase):
+    _sut = ExperimentScheduler
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def setUp(self):
+        env_spec = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec
+        self._multi_sims = [
+            MultiSim(
+                Sim(env_spec=env_spec, n_steps=n_steps, agent=agent),
+                name="scheduler",
+                n_reps=n_reps,
+                chunk_size=chunk_size,
+                seed=123,
+            )
+            for n_steps, agent, n_reps, chunk_size in [
+                (5, DummyAgent(), 3, None),
+                (10, RandomAgent(), 4, 2),
+            ]
+        ]
+
+    def test_tasks_ordered_longest_first(self):
+        # Act
+        tasks = self._sut(self._multi_sims, n_jobs=1)._tasks()
+
+        # Assert
+        self.assertEqual(3 + 2, len(tasks))
+        self.assertListEqual([1, 1, 0, 0, 0], [t[1] for t in tasks])
+        self.assertListEqual(
+            sorted([t[0] for t in tasks], reverse=True), [t[0] for t in tasks]
+        )
+
+    def test_run_fills_results_of_all_multi_sims(self):
+        # Act
+        self._sut(self._multi_sims, n_jobs=2, log=False).run()
+
+        # Assert
+        self.assertEqual(3, len(self._multi_sims[0].results))
+        self.assertEqual(4, len(self._multi_sims[1].results))
+
+    def test_streamed_reducers_merged_as_tasks_complete(self):
+        # Arrange
+        ms = self._multi_sims[1]
+        ms.reducers.append(StepStatistics(fields=["Current infections"]))
+        waves = []
+        update = ms._update
+        ms._update = lambda wave: (waves.append([set(r) for r in wave]), update(wave))
+
+        # Act
+        self._sut(self._multi_sims, n_jobs=2, log=False).run()
+
+        # Assert
+        self.assertTrue(all("step_statistics" not in r for w in waves for r in w))
+        np.testing.assert_array_equal(4, ms.step_bands("Current infections")["n"])
+
+    def test_results_match_multi_sim_run(self):
+        # Arrange
+        expected = MultiSim(
+            self._multi_sims[1].sim.clone(),
+            n_reps=4,
+            n_jobs=1,
+            chunk_size=2,
+            seed=123,
+        )
+        expected.run()
+
+        # Act
+        self._sut(self._multi_sims, n_jobs=2, log=False).run()
+
+        # Assert
+        self.assertListEqual(
+            list(expected.results["Overall score"]),
+            list(self._multi_sims[1].results["Overall score"]),
+        )
+
+    def test_seed_is_shared_by_all_multi_sims(self):
+        # Arrange
+        self._multi_sims[0].seed = None
+
+        # Act
+        self._sut(self._multi_sims, n_jobs=1, log=False, seed=42)
+
+        # Assert
+        self.assertListEqual([42, 42], [ms.seed for ms in self._multi_sims])
+
+    def test_multi_sims_with_baseline_logged_after_baseline(self):
+        # Arrange
+        logged = []
+        for ms in self._multi_sims:
+            ms.log = lambda ms=ms: logged.append(ms.name)
+        self._multi_sims[0].name = "with baseline"
+        self._multi_sims[1].name = "baseline"
+        self._multi_sims[0].baseline = self._multi_sims[1]
+
+        # Act
+        self._sut(self._multi_sims, n_jobs=2).run()
+
+        # Assert
+        self.assertListEqual(["baseline", "with baseline"], logged)
+
+    def test_adaptive_multi_sims_run_in_waves(self):
+        # Arrange
+        self._multi_sims[0].tolerance = {"Overall score": np.inf}
+        self._multi_sims[0].wave_size = 2
+        self._multi_sims[1].tolerance = {"Overall score": -np.inf}
+        self._multi_sims[1].wave_size = 3
+
+        # Act
+        self._sut(self._multi_sims, n_jobs=2, log=False).run()
+
+        # Assert
+        self.assertEqual(2, len(self._multi_sims[0].results))
+        self.assertEqual(4, len(self._multi_sims[1].results))
+        self.assertEqual(4, self._multi_sims[1].n_reps_run)
+
+    def test_multi_sims_with_store_skip_stored_reps(self):
+        # Arrange
+        store = ResultCache(path=":memory:")
+        for ms in self._multi_sims:
+            ms.store = store
+        self._sut(self._multi_sims, n_jobs=2, log=False).run()
+        expected = [list(ms.results["Overall score"]) for ms in self._multi_sims]
+
+        # Act
+        with patch.object(get_memmapping_executor(1), "submit") as submit:
+            self._sut(self._multi_sims, n_jobs=1, log=False).run()
+
+        # Assert
+        submit.assert_not_called()
+        self.assertEqual(3 + 4, len(store))
+        self.assertListEqual(
+            expected, [list(ms.results["Overall score"]) for ms in self._multi_sims]
+        )
+
+    def test_shared_tracker_flushed_once_all_logged(self):
+        # Arrange
+        tracker = JsonlTracker(path=":unused:")
+        for ms in self._multi_sims:
+            ms.tracker = tracker
+
+        # Act
+        with patch.object(JsonlTracker, "_write") as write:
+            self._sut(self._multi_sims, n_jobs=2).run()
+
+        # Assert
+        write.assert_called_once()
+        self.assertEqual(2, len(write.call_args.args[0]))
@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+import gym
+
+from social_distancing_sim.agent.basic_agents.random_agent import RandomAgent
+from social_distancing_sim.sim.job_queue import JobQueue, run_worker
+from social_distancing_sim.sim.multi_sim import MultiSim
+from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.tracking import NoOpTracker
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestJobQueue(unittest.TestCase):
+    _sut = JobQueue
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._tmp_dir.name, "queue.db")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    @staticmethod
+    def _multi_sim() -> MultiSim:
+        return MultiSim(
+            Sim(
+                env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                agent=RandomAgent(actions_per_turn=2, seed=None),
+                n_steps=10,
+            ),
+            n_reps=6,
+            n_jobs=1,
+            chunk_size=2,
+            seed=123,
+            tracker=NoOpTracker(),
+        )
+
+    def test_workers_match_local_run(self):
+        # Arrange
+        expected = self._multi_sim()
+        expected.run()
+        ms = self._multi_sim()
+        queue = self._sut(path=self._path)
+        queue.submit(ms)
+        workers = [
+            multiprocessing.Process(
+                target=run_worker,
+                kwargs={"path": self._path, "poll_interval": 0.1, "idle_timeout": 1},
+            )
+            for _ in range(2)
+        ]
+
+        # Act
+        for w in workers:
+            w.start()
+        queue.wait([ms], poll_interval=0.1, timeout=120, log=False)
+        for w in workers:
+            w.join()
+
+        # Assert
+        self.assertDictEqual({"done": 3}, queue.counts(ms))
+        self.assertListEqual(
+            list(expected.results["Overall score"]), list(ms.results["Overall score"])
+        )
+        self.assertEqual(6, ms.n_reps_run)
+
+    def test_worker_stops_after_max_jobs(self):
+        # Arrange
+        queue = self._sut(path=self._path)
+        ms = self._multi_sim()
+        queue.submit(ms)
+
+        # Act
+        n_jobs = run_worker(self._path, max_jobs=1)
+
+        # Assert
+        self.assertEqual(1, n_jobs)
+        self.assertDictEqual({"done": 1, "pending": 2}, queue.counts(ms))
@@ -1,18 +1,41 @@
+import os
+import tempfile
 import unittest
+from functools import partial
+from unittest.mock import patch
 
 import gym
+import matplotlib
 import numpy as np
+import pandas as pd
 from tqdm import tqdm
 
+import social_distancing_sim.environment as env
 from social_distancing_sim.agent.basic_agents.dummy_agent import DummyAgent
 from social_distancing_sim.agent.basic_agents.isolation_agent import IsolationAgent
 from social_distancing_sim.agent.basic_agents.random_agent import RandomAgent
 from social_distancing_sim.agent.basic_agents.treatment_agent import TreatmentAgent
 from social_distancing_sim.agent.basic_agents.vaccination_agent import VaccinationAgent
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+from social_distancing_sim.agent.rl_agents.q_learning.numpy_dqn_untargeted import (
+    NumpyDQNUntargeted,
+)
+from social_distancing_sim.environment.gym.wrappers.flatten_obs_wrapper import (
+    FlattenObsWrapper,
+)
+from social_distancing_sim.environment.gym.wrappers.limit_obs_wrapper import (
+    LimitObsWrapper,
+)
 from social_distancing_sim.sim.multi_sim import MultiSim
+from social_distancing_sim.sim.reducers import FinalValues, StepStatistics, TimeSeries
+from social_distancing_sim.sim.result_cache import ResultCache
 from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.sweep import environment_spec
+from social_distancing_sim.sim.tracking import JsonlTracker, NoOpTracker
 from tests.common.env_fixtures import register_test_envs
 
+matplotlib.use("Agg")
+
 
 class TestMultiSim(unittest.TestCase):
     @classmethod
@@ -74,3 +97,458 @@ class TestMultiSim(unittest.TestCase):
 
     def test_multi_sim_run_with_vaccination_agent_multiple_jobs(self):
         self._run_with_agent(VaccinationAgent, n_jobs=2)
+
+    def test_multi_sim_run_with_wrapped_numpy_dqn_untargeted(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec
+        n_inputs = int(np.prod(gym.make(env_spec).observation_space[2].shape))
+        state = np.random.RandomState(0)
+        model = NumpyDense(
+            kernels=[state.normal(size=(n_inputs, 8)), state.normal(size=(8, 5))],
+            biases=[np.zeros(8), np.zeros(5)],
+            activations=["relu", "linear"],
+        )
+        ms = MultiSim(
+            Sim(
+                env_spec=env_spec,
+                n_steps=10,
+                agent=NumpyDQNUntargeted(
+                    model,
+                    env_wrappers=(
+                        partial(LimitObsWrapper, output=2),
+                        FlattenObsWrapper,
+                    ),
+                    actions_per_turn=2,
+                ),
+            ),
+            name="wrapped numpy dqn",
+            n_reps=3,
+            n_jobs=2,
+            seed=0,
+        )
+
+        # Act
+        ms.run()
+
+        # Assert
+        self.assertEqual(3, len(ms.results))
+
+    def test_multi_sim_returns_reduced_results(self):
+        # Arrange
+        ms = MultiSim(
+            Sim(
+                env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                n_steps=10,
+                agent=DummyAgent(),
+            ),
+            name="reducers",
+            n_reps=3,
+            n_jobs=2,
+            reducers=[TimeSeries(fields=["Total deaths"])],
+        )
+
+        # Act
+        ms.run()
+
+        # Assert
+        self.assertIsInstance(ms.reducers[0], FinalValues)
+        self.assertEqual(3, len(ms.results))
+        self.assertEqual(3, len(ms.reduced_results["time_series"]))
+        self.assertEqual(
+            (10,), ms.reduced_results["time_series"][0]["Total deaths"].shape
+        )
+        self.assertListEqual([], ms.full_results)
+
+    def test_multi_sim_merges_step_statistics_across_reps(self):
+        # Arrange
+        ms = MultiSim(
+            Sim(
+                env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                n_steps=10,
+                agent=RandomAgent(actions_per_turn=2, seed=None),
+            ),
+            name="step statistics",
+            n_reps=6,
+            n_jobs=2,
+            chunk_size=2,
+            seed=123,
+            reducers=[
+                TimeSeries(fields=["Current infections"]),
+                StepStatistics(fields=["Current infections"]),
+            ],
+            tracker=NoOpTracker(),
+        )
+
+        waves = []
+        update = ms._update
+        ms._update = lambda wave: (waves.append([set(r) for r in wave]), update(wave))
+
+        # Act
+        ms.run()
+        bands = ms.step_bands("Current infections", q=(0.05, 0.95))
+        ax = ms.plot_bands("Current infections", show=False)
+
+        # Assert
+        series = np.stack(
+            [ts["Current infections"] for ts in ms.reduced_results["time_series"]]
+        )
+        self.assertNotIn("step_statistics", ms.reduced_results)
+        # Merged as each task arrives, so never held until the end of the wave
+        self.assertTrue(all("step_statistics" not in r for w in waves for r in w))
+        self.assertListEqual(["mean", "std", "n", "q0.05", "q0.95"], list(bands))
+        np.testing.assert_array_equal(6, bands["n"])
+        np.testing.assert_allclose(series.mean(axis=0), bands["mean"], rtol=1e-6)
+        np.testing.assert_allclose(
+            np.quantile(series, 0.95, axis=0, method="hazen"), bands["q0.95"]
+        )
+        self.assertEqual(1, len(ax.lines))
+        self.assertRaises(ValueError, ms.step_bands, "Total deaths")
+
+    def test_multi_sim_keeps_full_results_if_requested(self):
+        # Arrange
+        ms = MultiSim(
+            Sim(
+                env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                n_steps=10,
+                agent=DummyAgent(),
+            ),
+            name="reducers",
+            n_reps=2,
+            n_jobs=1,
+            keep_full_results=True,
+        )
+
+        # Act
+        ms.run()
+
+        # Assert
+        self.assertEqual(2, len(ms.full_results))
+        self.assertEqual(10, len(ms.full_results[0]["Total deaths"]))
+
+    def test_chunked_multi_sim_matches_seeded_per_rep_multi_sim(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+        multi_sims = [
+            MultiSim(
+                Sim(env_spec=env_spec, n_steps=10, agent=RandomAgent()),
+                name="chunked",
+                n_reps=5,
+                n_jobs=n_jobs,
+                chunk_size=chunk_size,
+                seed=123,
+            )
+            for n_jobs, chunk_size in [(1, None), (1, 5), (2, 2)]
+        ]
+
+        # Act
+        for ms in multi_sims:
+            ms.run()
+
+        # Assert
+        self.assertEqual(5, len(multi_sims[0].results))
+        for ms in multi_sims[1:]:
+            self.assertListEqual(
+                list(multi_sims[0].results["Overall score"]),
+                list(ms.results["Overall score"]),
+            )
+
+    def test_workers_keep_max_worker_sims(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+        multi_sims = [
+            MultiSim(
+                Sim(env_spec=env_spec, n_steps=2, agent=DummyAgent()),
+                n_reps=1,
+                chunk_size=1,
+                tracker=NoOpTracker(),
+                max_worker_sims=max_worker_sims,
+            )
+            for max_worker_sims in [3, 3, 3, 2]
+        ]
+
+        # Act
+        sims = [ms._worker_sim() for ms in multi_sims[0:3]]
+        kept = [ms._worker_sim() for ms in multi_sims[0:3]]
+        multi_sims[3]._worker_sim()
+
+        # Assert
+        self.assertListEqual([id(s) for s in sims], [id(s) for s in kept])
+        # Only the 2 most recently used are kept, once a MultiSim with a smaller limit runs
+        self.assertIsNot(sims[1], multi_sims[1]._worker_sim())
+        self.assertIs(sims[2], multi_sims[2]._worker_sim())
+
+    def test_multi_sims_with_same_seed_share_random_numbers(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+        baseline, ms = [
+            MultiSim(
+                Sim(env_spec=env_spec, n_steps=10, agent=DummyAgent()),
+                name=name,
+                n_reps=4,
+                n_jobs=1,
+                chunk_size=chunk_size,
+                seed=123,
+            )
+            for name, chunk_size in [("baseline", None), ("crn", 2)]
+        ]
+        ms.baseline = baseline
+
+        # Act
+        baseline.run()
+        ms.run()
+        stats = ms.paired_stats(baseline)
+
+        # Assert
+        self.assertListEqual(
+            list(baseline.results["Overall score"]), list(ms.results["Overall score"])
+        )
+        self.assertEqual(0, stats["Overall score__paired_diff_mean"])
+        self.assertEqual(0, stats["Overall score__paired_diff_sd"])
+
+    def test_paired_stats_pairs_common_reps(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+        baseline, ms = [
+            MultiSim(
+                Sim(env_spec=env_spec, n_steps=5, agent=DummyAgent()),
+                n_reps=n_reps,
+                n_jobs=1,
+                seed=123,
+            )
+            for n_reps in [2, 3]
+        ]
+        baseline.run()
+        ms.run()
+
+        # Act
+        stats = ms.paired_stats(baseline)
+
+        # Assert
+        self.assertEqual(0, stats["Overall score__paired_diff_mean"])
+
+    def test_paired_stats_raises_if_baseline_not_run(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+        baseline, ms = [
+            MultiSim(
+                Sim(env_spec=env_spec, n_steps=5, agent=DummyAgent()),
+                n_reps=2,
+                n_jobs=1,
+                seed=123,
+            )
+            for _ in range(2)
+        ]
+        ms.run()
+
+        # Act/Assert
+        self.assertRaises(ValueError, ms.paired_stats, baseline)
+
+    def test_adaptive_multi_sim_stops_when_within_tolerance(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+        multi_sims = [
+            MultiSim(
+                Sim(env_spec=env_spec, n_steps=5, agent=DummyAgent()),
+                n_reps=9,
+                n_jobs=1,
+                chunk_size=2,
+                seed=123,
+                tolerance={"Overall score": tol},
+                wave_size=3,
+            )
+            for tol in [np.inf, -np.inf]
+        ]
+
+        # Act
+        for ms in multi_sims:
+            ms.run()
+
+        # Assert
+        self.assertEqual(3, multi_sims[0].n_reps_run)
+        self.assertEqual(3, len(multi_sims[0].results))
+        self.assertTrue(multi_sims[0].converged)
+        self.assertEqual(9, multi_sims[1].n_reps_run)
+        self.assertFalse(multi_sims[1].converged)
+        self.assertListEqual(
+            list(multi_sims[0].results["Overall score"]),
+            list(multi_sims[1].results["Overall score"][0:3]),
+        )
+        self.assertEqual(9, multi_sims[1].running_stats["Overall score"].n)
+
+    def test_adaptive_multi_sim_runs_at_least_min_reps(self):
+        # Arrange
+        ms = MultiSim(
+            Sim(
+                env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                n_steps=5,
+                agent=DummyAgent(),
+            ),
+            n_reps=9,
+            n_jobs=1,
+            seed=123,
+            tolerance={"Overall score": np.inf},
+            wave_size=3,
+            min_reps=5,
+            tracker=NoOpTracker(),
+        )
+
+        # Act
+        ms.run()
+
+        # Assert
+        self.assertEqual(6, ms.n_reps_run)
+        self.assertTrue(ms.converged)
+
+    def test_unknown_tolerance_metric_raises(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+
+        # Act/Assert
+        for reducers, tolerance in [
+            (None, {"Overall scores": 5.0}),
+            ([FinalValues(fields=["Turn score"])], {"Overall score": 5.0}),
+        ]:
+            with self.subTest(tolerance=tolerance), self.assertRaises(ValueError):
+                MultiSim(
+                    Sim(env_spec=env_spec, agent=DummyAgent()),
+                    reducers=reducers,
+                    tolerance=tolerance,
+                    tracker=NoOpTracker(),
+                )
+
+    def test_agg_stats_adds_paired_differences_with_baseline(self):
+        # Arrange
+        x = pd.Series([2.0, 4.0, 6.0, 8.0], name="Overall score")
+        baseline = pd.Series([1.0, 2.0, 3.0, 4.0], name="Overall score")
+
+        # Act
+        stats = MultiSim._agg_stats(x, baseline)
+
+        # Assert
+        self.assertAlmostEqual(5.0, stats["Overall score__mean"])
+        self.assertAlmostEqual(2.5, stats["Overall score__paired_diff_mean"])
+        self.assertAlmostEqual(
+            1.96 * np.std([1, 2, 3, 4], ddof=1) / 2,
+            stats["Overall score__paired_diff_ci_ub"] - 2.5,
+        )
+        self.assertNotIn("Overall score__paired_diff_mean", MultiSim._agg_stats(x))
+
+    def test_multi_sim_with_store_resumes_completed_reps(self):
+        # Arrange
+        env_spec = gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec
+        store = ResultCache(path=":memory:")
+
+        def multi_sim(n_reps: int) -> MultiSim:
+            return MultiSim(
+                Sim(env_spec=env_spec, n_steps=5, agent=RandomAgent()),
+                name="resumable",
+                n_reps=n_reps,
+                n_jobs=2,
+                chunk_size=2,
+                seed=123,
+                store=store,
+            )
+
+        partial = multi_sim(3)
+        partial.run()
+        expected = MultiSim(
+            Sim(env_spec=env_spec, n_steps=5, agent=RandomAgent()),
+            n_reps=5,
+            n_jobs=1,
+            chunk_size=2,
+            seed=123,
+        )
+        expected.run()
+
+        # Act
+        resumed = multi_sim(5)
+        with patch.object(
+            MultiSim,
+            "_store_results",
+            autospec=True,
+            side_effect=MultiSim._store_results,
+        ) as store_results:
+            resumed.run()
+
+        # Assert
+        self.assertEqual(5, len(store))
+        self.assertListEqual(
+            list(expected.results["Overall score"]),
+            list(resumed.results["Overall score"]),
+        )
+        self.assertListEqual(
+            [expected._rep_seeds()[3:5]],
+            [c.args[1] for c in store_results.call_args_list],
+        )
+
+    def test_store_keys_cover_env_and_agent_params(self):
+        # Arrange
+        store = ResultCache(path=":memory:")
+
+        def multi_sim(virulence: float, start_step: int) -> MultiSim:
+            environment = env.Environment(
+                name="store_key_test",
+                disease=env.Disease(virulence=virulence),
+                observation_space=env.ObservationSpace(
+                    graph=env.Graph(community_n=3, community_size_mean=5, seed=222)
+                ),
+            )
+            return MultiSim(
+                Sim(
+                    env_spec=environment_spec(environment),
+                    n_steps=5,
+                    agent=VaccinationAgent(start_step={"vaccinate": start_step}),
+                ),
+                name="store keys",
+                n_reps=2,
+                n_jobs=1,
+                seed=123,
+                store=store,
+                tracker=NoOpTracker(),
+            )
+
+        multi_sims = [multi_sim(0.01, 0), multi_sim(0.5, 0), multi_sim(0.01, 3)]
+
+        # Act
+        for ms in multi_sims:
+            ms.run()
+
+        # Assert
+        self.assertEqual(6, len(store))
+        self.assertEqual(multi_sims[0]._store_config, multi_sim(0.01, 0)._store_config)
+
+    def test_multi_sim_with_store_needs_seed(self):
+        with self.assertRaises(ValueError):
+            MultiSim(
+                Sim(
+                    env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                    agent=DummyAgent(),
+                ),
+                store=ResultCache(path=":memory:"),
+            )
+
+    def test_multi_sim_logs_to_tracker(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "runs.jsonl")
+            ms = MultiSim(
+                Sim(
+                    env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                    n_steps=5,
+                    agent=DummyAgent(),
+                ),
+                name="tracked",
+                n_reps=2,
+                n_jobs=1,
+                tracker=JsonlTracker(path=path),
+            )
+
+            # Act
+            ms.run()
+
+            # Assert
+            runs = pd.read_json(path, lines=True)
+        self.assertListEqual(["tracked"], list(runs["experiment"]))
+        self.assertEqual(2, runs["metrics"][0]["n_reps_run"])
+        self.assertIn("Overall score__mean", runs["metrics"][0])
+        self.assertEqual("DummyAgent", runs["params"][0]["agent_type"])
@@ -0,0 +1,104 @@
+import unittest
+
+import social_distancing_sim.environment as env
+from social_distancing_sim.agent.policy_agents.distancing_policy_agent import (
+    DistancingPolicyAgent,
+)
+from social_distancing_sim.sim.schedule_optimiser import (
+    ScheduleOptimiser,
+    policy_schedule,
+)
+from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.sweep import environment_spec
+
+
+def _factory(**schedule) -> Sim:
+    environment = env.Environment(
+        name="schedule_optimiser_test",
+        disease=env.Disease(virulence=0.2),
+        observation_space=env.ObservationSpace(
+            graph=env.Graph(community_n=3, community_size_mean=5, seed=222),
+            test_rate=0.5,
+        ),
+    )
+
+    return Sim(
+        env_spec=environment_spec(environment),
+        agent=DistancingPolicyAgent(**policy_schedule(**schedule)),
+        n_steps=6,
+    )
+
+
+class TestScheduleOptimiser(unittest.TestCase):
+    _sut = ScheduleOptimiser
+
+    def setUp(self):
+        self._design = [
+            {"isolate_start": 0, "isolate_duration": 6, "actions_per_turn": 3},
+            {"isolate_start": 4, "isolate_duration": 1, "actions_per_turn": 1},
+            {"isolate_start": 0, "isolate_duration": 6, "actions_per_turn": 3},
+            {"isolate_start": 2, "isolate_duration": 2, "actions_per_turn": 2},
+        ]
+
+    def test_successive_halving_cuts_candidates(self):
+        # Arrange
+        optimiser = self._sut(
+            _factory, design=self._design, min_reps=2, max_reps=4, eta=2, n_jobs=2
+        )
+
+        # Act
+        best = optimiser.run()
+
+        # Assert
+        results = optimiser.results
+        self.assertListEqual([0, 0, 0, 0, 1, 1], list(results["rung"]))
+        self.assertListEqual([2, 2, 2, 2, 4, 4], list(results["n_reps"]))
+        self.assertEqual(4 * 2 + 2 * 2, optimiser.n_reps_run)
+        last = results[results["rung"] == 1]
+        self.assertGreaterEqual(last["mean"].iloc[0], last["mean"].iloc[1])
+        self.assertDictEqual(self._design[last["candidate"].iloc[0]], best)
+        # Workers can keep a Sim for every candidate
+        self.assertEqual(4, optimiser._multi_sim(0).max_worker_sims)
+
+    def test_candidates_share_random_numbers(self):
+        # Arrange
+        optimiser = self._sut(
+            _factory, design=self._design, min_reps=3, max_reps=3, n_jobs=2
+        )
+
+        # Act
+        optimiser.run()
+
+        # Assert
+        self.assertDictEqual(optimiser.scores[0], optimiser.scores[2])
+
+    def test_budget_stops_before_next_rung(self):
+        # Arrange
+        optimiser = self._sut(
+            _factory,
+            design=self._design,
+            min_reps=2,
+            max_reps=4,
+            eta=2,
+            budget=10,
+            n_jobs=1,
+            chunk_size=2,
+        )
+
+        # Act
+        best = optimiser.run()
+
+        # Assert
+        self.assertEqual(8, optimiser.n_reps_run)
+        self.assertSetEqual({0}, set(optimiser.results["rung"]))
+        self.assertIn(best, self._design)
+
+    def test_budget_too_small_for_first_rung_raises(self):
+        # Arrange
+        optimiser = self._sut(
+            _factory, design=self._design, min_reps=2, budget=7, n_jobs=1
+        )
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            optimiser.run()
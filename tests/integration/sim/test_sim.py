@@ -2,12 +2,24 @@ import glob
 import os
 import tempfile
 import unittest
+from functools import partial
 
 import gym
+import numpy as np
 
 from social_distancing_sim.agent.basic_agents.vaccination_agent import VaccinationAgent
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+from social_distancing_sim.agent.rl_agents.q_learning.numpy_dqn_untargeted import (
+    NumpyDQNUntargeted,
+)
+from social_distancing_sim.environment.gym.wrappers.flatten_obs_wrapper import (
+    FlattenObsWrapper,
+)
+from social_distancing_sim.environment.gym.wrappers.limit_obs_wrapper import (
+    LimitObsWrapper,
+)
 from social_distancing_sim.sim.sim import Sim
-from tests.common.env_fixtures import register_sim_test_envs
+from tests.common.env_fixtures import register_sim_test_envs, register_test_envs
 
 
 class TestSim(unittest.TestCase):
@@ -121,3 +133,120 @@ class TestSim(unittest.TestCase):
                 )
             ),
         )
+
+    def test_sim_run_with_wrapped_agent(self):
+        # Arrange
+        # Fixed graph, as the model's input size depends on the population
+        register_test_envs()
+        env_spec = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec
+        n_inputs = int(np.prod(gym.make(env_spec).observation_space[2].shape))
+        state = np.random.RandomState(0)
+        model = NumpyDense(
+            kernels=[state.normal(size=(n_inputs, 8)), state.normal(size=(8, 5))],
+            biases=[np.zeros(8), np.zeros(5)],
+            activations=["relu", "linear"],
+        )
+        sim = self._sut(
+            env_spec=env_spec,
+            save_dir=f"{self._tmp_dir.name}",
+            agent=NumpyDQNUntargeted(
+                model,
+                env_wrappers=(partial(LimitObsWrapper, output=2), FlattenObsWrapper),
+                actions_per_turn=2,
+            ),
+            n_steps=10,
+        )
+
+        # Act
+        history = sim.run(seed=1)
+
+        # Assert
+        self.assertIsInstance(sim.agent.env, FlattenObsWrapper)
+        self.assertEqual((n_inputs,), sim._last_state.shape)
+        self.assertEqual(10, len(history[self._test_field]))
+
+    def test_seeded_runs_reusing_env(self):
+        # Arrange
+        sim = self._sut(
+            env_spec=gym.make("SDSTests-GymEnvDefaultFixture-v0").spec,
+            save_dir=f"{self._tmp_dir.name}",
+            agent=VaccinationAgent(actions_per_turn=5, seed=123),
+            n_steps=10,
+        )
+
+        # Act
+        history_1 = sim.run(seed=1)
+        env = sim.env
+        history_2 = sim.run(seed=2, rebuild_env=False)
+        history_3 = sim.run(seed=1, rebuild_env=False)
+
+        # Assert
+        self.assertIs(env, sim.env)
+        self.assertEqual(10, sim._step)
+        self.assertEqual(10, len(history_2[self._test_field]))
+        self.assertListEqual(history_1[self._test_field], history_3[self._test_field])
+
+    def test_run_resumes_from_checkpoint(self):
+        # Arrange
+        def sim():
+            return self._sut(
+                env_spec=gym.make("SDSTests-GymEnvDefaultFixture-v0").spec,
+                save_dir=f"{self._tmp_dir.name}",
+                agent=VaccinationAgent(actions_per_turn=5),
+                n_steps=10,
+                checkpoint_path=os.path.join(self._tmp_dir.name, "checkpoint.pkl"),
+                checkpoint_every=4,
+            )
+
+        expected = sim().run(seed=1)[self._test_field]
+        interrupted = sim()
+        step = interrupted.step
+        calls = []
+
+        def dying_step():
+            calls.append(None)
+            if len(calls) == 6:
+                raise MemoryError()
+            step()
+
+        interrupted.step = dying_step
+        with self.assertRaises(MemoryError):
+            interrupted.run(seed=1)
+        resumed = sim()
+        resumed_step = resumed.step
+        resumed_calls = []
+
+        def counted_step():
+            resumed_calls.append(None)
+            resumed_step()
+
+        resumed.step = counted_step
+
+        # Act
+        history = resumed.run(seed=1)
+
+        # Assert
+        self.assertEqual(10 - 4, len(resumed_calls))
+        self.assertListEqual(expected, history[self._test_field])
+        self.assertFalse(os.path.exists(resumed.checkpoint_path))
+
+    def test_checkpoint_from_other_seed_is_ignored(self):
+        # Arrange
+        sim = self._sut(
+            env_spec=gym.make("SDSTests-GymEnvDefaultFixture-v0").spec,
+            save_dir=f"{self._tmp_dir.name}",
+            agent=VaccinationAgent(actions_per_turn=5),
+            n_steps=10,
+            checkpoint_path=os.path.join(self._tmp_dir.name, "checkpoint.pkl"),
+            checkpoint_every=4,
+        )
+        sim._step = 4
+        sim._last_state = None
+        sim._save_checkpoint(seed=2)
+
+        # Act
+        with self.assertWarns(UserWarning):
+            history = sim.run(seed=1)
+
+        # Assert
+        self.assertEqual(10, len(history[self._test_field]))
@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import social_distancing_sim.environment as env
+from social_distancing_sim.agent.basic_agents.vaccination_agent import VaccinationAgent
+from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.sweep import ResultCache, Sweep, environment_spec, grid
+
+
+@dataclass
+class _Factory:
+    """Sim factory that records its calls (and the process they're made in) to a file, as it's called in workers."""
+
+    calls_path: str
+
+    def __call__(self, virulence: float, actions_per_turn: int) -> Sim:
+        with open(self.calls_path, "a") as f:
+            f.write(json.dumps([virulence, actions_per_turn, os.getpid()]) + "\n")
+
+        return _sim(virulence, actions_per_turn)
+
+    def _read(self) -> List[list]:
+        if not os.path.exists(self.calls_path):
+            return []
+        with open(self.calls_path) as f:
+            return [json.loads(line) for line in f]
+
+    @property
+    def calls(self) -> List[Tuple[float, int]]:
+        return [(v, a) for v, a, _ in self._read()]
+
+    @property
+    def pids(self) -> List[int]:
+        return [pid for _, _, pid in self._read()]
+
+    def clear(self) -> None:
+        if os.path.exists(self.calls_path):
+            os.remove(self.calls_path)
+
+
+def _sim(virulence: float, actions_per_turn: int) -> Sim:
+    environment = env.Environment(
+        name="sweep_test",
+        disease=env.Disease(virulence=virulence),
+        observation_space=env.ObservationSpace(
+            graph=env.Graph(community_n=3, community_size_mean=5, seed=222),
+            test_rate=0.5,
+        ),
+    )
+
+    return Sim(
+        env_spec=environment_spec(environment),
+        agent=VaccinationAgent(actions_per_turn=actions_per_turn),
+        n_steps=5,
+    )
+
+
+class TestSweep(unittest.TestCase):
+    _sut = Sweep
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._factory = _Factory(
+            os.path.join(self._tmp_dir.name, "factory_calls.jsonl")
+        )
+        self._cache = ResultCache(path=os.path.join(self._tmp_dir.name, "cache.db"))
+
+    def tearDown(self):
+        self._cache.close()
+        self._tmp_dir.cleanup()
+
+    def test_run_returns_row_per_config_and_rep(self):
+        # Arrange
+        sweep = self._sut(
+            self._factory,
+            design=grid(virulence=[0.01, 0.2], actions_per_turn=[1]),
+            n_reps=3,
+            n_jobs=2,
+            cache=self._cache,
+        )
+
+        # Act
+        results = sweep.run()
+
+        # Assert
+        self.assertEqual(6, len(results))
+        self.assertListEqual([0.01] * 3 + [0.2] * 3, list(results["virulence"]))
+        self.assertIn("Overall score", results.columns)
+        self.assertEqual(6, len(self._cache))
+
+    def test_rerun_only_runs_new_points(self):
+        # Arrange
+        self._sut(
+            self._factory,
+            design=grid(virulence=[0.01], actions_per_turn=[1]),
+            n_reps=2,
+            n_jobs=1,
+            cache=self._cache,
+        ).run()
+        first = self._sut(
+            self._factory,
+            design=grid(virulence=[0.01], actions_per_turn=[1]),
+            n_reps=2,
+            n_jobs=1,
+            cache=self._cache,
+        ).run()
+        self._factory.clear()
+
+        # Act
+        results = self._sut(
+            self._factory,
+            design=grid(virulence=[0.01, 0.2], actions_per_turn=[1]),
+            n_reps=3,
+            n_jobs=1,
+            cache=self._cache,
+            chunk_size=2,
+        ).run()
+
+        # Assert
+        self.assertListEqual([(0.01, 1), (0.2, 1)], self._factory.calls)
+        self.assertNotIn(os.getpid(), self._factory.pids)
+        self.assertEqual(6, len(results))
+        self.assertEqual(6, len(self._cache))
+        self.assertListEqual(
+            list(first["Overall score"]), list(results["Overall score"][0:2])
+        )
+
+    def test_fully_cached_sweep_skips_factory(self):
+        # Arrange
+        kwargs = dict(
+            factory=self._factory,
+            design=grid(virulence=[0.01], actions_per_turn=[1, 2]),
+            n_reps=2,
+            n_jobs=1,
+            cache=self._cache,
+        )
+        expected = self._sut(**kwargs).run()
+        self._factory.clear()
+
+        # Act
+        results = self._sut(**kwargs).run()
+
+        # Assert
+        self.assertListEqual([], self._factory.calls)
+        self.assertListEqual(
+            list(expected["Overall score"]), list(results["Overall score"])
+        )
@@ -0,0 +1,160 @@
+import unittest
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.array_agent_base import COLUMNS
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    IsolationArrayAgent,
+    VaccinationArrayAgent,
+)
+from social_distancing_sim.agent.array_agents.policy_array_agents import (
+    DistancingPolicyArrayAgent,
+)
+from social_distancing_sim.environment.gym.vec_env import VecEnv
+from tests.common.env_fixtures import register_test_envs
+
+
+def _nodes(n_envs: int, n_nodes: int, **statuses: np.ndarray) -> np.ndarray:
+    nodes = np.zeros((n_envs, n_nodes, len(COLUMNS)), dtype=np.int8)
+    for name, value in statuses.items():
+        nodes[..., COLUMNS[name]] = value
+
+    return nodes
+
+
+class TestVaccinationArrayAgent(unittest.TestCase):
+    _sut = VaccinationArrayAgent
+
+    def test_batch_targets_distinct_clear_non_immune_nodes(self):
+        # Arrange
+        clear = np.array([[1, 1, 1, 1, 0, 0], [0, 0, 0, 1, 1, 0], [0, 0, 0, 0, 0, 0]])
+        immune = np.array([[0, 1, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0]])
+        agent = self._sut(actions_per_turn=2, seed=0)
+
+        # Act
+        actions_targets = agent.get_batch_actions(
+            _nodes(3, 6, clear=clear, immune=immune)
+        )
+
+        # Assert
+        self.assertEqual(3, len(actions_targets))
+        self.assertListEqual([1, 1], actions_targets[0][0])
+        self.assertEqual(2, len(set(actions_targets[0][1])))
+        self.assertTrue(set(actions_targets[0][1]).issubset({0, 2, 3}))
+        self.assertListEqual([3, 4], sorted(actions_targets[1][1]))
+        self.assertEqual(([], []), actions_targets[2])
+        self.assertEqual(1, agent._step)
+
+    def test_batch_actions_reproducible_with_seed(self):
+        # Arrange
+        nodes = _nodes(4, 50, clear=1)
+
+        # Act
+        first = self._sut(actions_per_turn=5, seed=1).get_batch_actions(nodes)
+        second = self._sut(actions_per_turn=5, seed=1).get_batch_actions(nodes)
+
+        # Assert
+        self.assertListEqual(first, second)
+
+    def test_get_actions_from_single_nodes_array(self):
+        # Arrange
+        agent = self._sut(actions_per_turn=3, seed=0)
+
+        # Act
+        actions, targets = agent.get_actions(_nodes(1, 5, clear=1)[0])
+
+        # Assert
+        self.assertListEqual([1, 1, 1], actions)
+        self.assertEqual(3, len(set(targets)))
+
+
+class TestIsolationArrayAgent(unittest.TestCase):
+    _sut = IsolationArrayAgent
+
+    def test_targets_match_action(self):
+        # Arrange
+        infected = np.array([[1, 1, 0, 0, 0, 0]])
+        clear = np.array([[0, 0, 1, 1, 1, 1]])
+        isolated = np.array([[0, 1, 1, 0, 0, 1]])
+        agent = self._sut(actions_per_turn=20, seed=0)
+
+        # Act
+        ((actions, targets),) = agent.get_batch_actions(
+            _nodes(1, 6, infected=infected, clear=clear, isolated=isolated)
+        )
+
+        # Assert
+        targets_by_action = {
+            a: sorted(t for t, a_ in zip(targets, actions) if a_ == a) for a in (2, 3)
+        }
+        self.assertDictEqual({2: [0], 3: [2, 5]}, targets_by_action)
+
+
+class TestDistancingPolicyArrayAgent(unittest.TestCase):
+    _sut = DistancingPolicyArrayAgent
+
+    def test_actions_only_in_active_period_of_each_env(self):
+        # Arrange
+        agent = self._sut(
+            actions_per_turn=2,
+            seed=0,
+            start_step={"isolate": 5, "reconnect": 10},
+            end_step={"isolate": 8, "reconnect": 12},
+        )
+
+        # Act
+        actions_targets = agent.get_batch_actions(
+            _nodes(3, 10, clear=1, isolated=np.arange(10) < 5),
+            steps=np.array([0, 6, 11]),
+        )
+
+        # Assert
+        self.assertListEqual([], actions_targets[0][0])
+        self.assertListEqual([2, 2], actions_targets[1][0])
+        self.assertListEqual([3, 3], actions_targets[2][0])
+        self.assertTrue(all(t >= 5 for t in actions_targets[1][1]))
+        self.assertTrue(all(t < 5 for t in actions_targets[2][1]))
+        self.assertEqual(0, agent._step)
+
+
+class TestArrayAgentsWithEnvs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def test_drive_vec_env(self):
+        # Arrange
+        vec_env = VecEnv(
+            "SDSTests-GymEnvFixedSeedFixture-v0", n_envs=3, n_steps=5, seed=0
+        )
+        agent = IsolationArrayAgent(actions_per_turn=3, seed=0)
+        obs = vec_env.reset()
+
+        # Act
+        for _ in range(6):
+            obs, rewards, dones, _, _ = vec_env.step(agent.get_batch_actions(obs[2]))
+
+        # Assert
+        self.assertEqual((3,), rewards.shape)
+        self.assertEqual(6, agent._step)
+
+    def test_get_actions_reads_nodes_from_attached_env(self):
+        # Arrange
+        env = gym.make("SDSTests-GymEnvRandomSeedFixture-v0")
+        agent = VaccinationArrayAgent(actions_per_turn=2, seed=0)
+        agent.attach_to_env(env)
+        env.unwrapped.reset()
+        for _ in range(10):
+            env.unwrapped.step(([], []))
+        nodes = env.unwrapped.sds_env.observation_space.state_nodes()
+        candidates = np.flatnonzero(
+            nodes[:, COLUMNS["clear"]] & ~nodes[:, COLUMNS["immune"]]
+        )
+
+        # Act
+        actions, targets = agent.get_actions()
+
+        # Assert
+        self.assertListEqual([1] * min(2, len(candidates)), actions)
+        self.assertTrue(set(targets).issubset(candidates))
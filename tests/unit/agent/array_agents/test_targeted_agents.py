@@ -0,0 +1,88 @@
+import unittest
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.array_agent_base import COLUMNS
+from social_distancing_sim.agent.array_agents.targeted_agents import (
+    TargetedIsolationAgent,
+    TargetedMaskingAgent,
+    TargetedVaccinationAgent,
+)
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestTargetedAgents(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def setUp(self):
+        self._env = gym.make("SDSTests-GymEnvFixedSeedFixture-v0")
+        self._env.unwrapped.reset()
+        self._centrality = (
+            self._env.unwrapped.sds_env.observation_space.graph.centrality
+        )
+
+    def _nodes(self, n_envs: int = 2, **statuses: int) -> np.ndarray:
+        nodes = np.zeros(
+            (n_envs, self._centrality.n_nodes, len(COLUMNS)), dtype=np.int8
+        )
+        for name, value in statuses.items():
+            nodes[..., COLUMNS[name]] = value
+
+        return nodes
+
+    def _assert_most_central(self, targets, scores: np.ndarray) -> None:
+        others = np.setdiff1d(np.arange(len(scores)), targets)
+        self.assertEqual(len(set(targets)), len(targets))
+        self.assertGreaterEqual(scores[targets].min(), scores[others].max())
+
+    def test_targets_highest_degree_nodes_first(self):
+        for sut, action in [
+            (TargetedVaccinationAgent, 1),
+            (TargetedMaskingAgent, 5),
+            (TargetedIsolationAgent, 2),
+        ]:
+            with self.subTest(sut=sut.__name__):
+                # Arrange
+                agent = sut(actions_per_turn=4, seed=0)
+                agent.attach_to_env(self._env)
+
+                # Act
+                actions_targets = agent.get_batch_actions(self._nodes(clear=1))
+
+                # Assert
+                for actions, targets in actions_targets:
+                    self.assertListEqual([action] * 4, actions)
+                    self._assert_most_central(targets, self._centrality.degree)
+
+    def test_targets_highest_betweenness_nodes_first(self):
+        # Arrange
+        agent = TargetedVaccinationAgent(
+            actions_per_turn=3, seed=0, measure="betweenness"
+        )
+        agent.attach_to_env(self._env)
+
+        # Act
+        actions, targets = agent.get_batch_actions(self._nodes(n_envs=1, clear=1))[0]
+
+        # Assert
+        self._assert_most_central(targets, self._centrality.betweenness)
+
+    def test_ineligible_nodes_not_targeted(self):
+        # Arrange
+        nodes = self._nodes(n_envs=1, clear=1)
+        most_central = self._centrality.top_k(2)
+        nodes[0, most_central, COLUMNS["isolated"]] = 1
+        agent = TargetedIsolationAgent(actions_per_turn=3, seed=0)
+        agent.attach_to_env(self._env)
+
+        # Act
+        _, targets = agent.get_batch_actions(nodes)[0]
+
+        # Assert
+        self.assertFalse(set(targets) & set(most_central))
+
+    def test_unknown_measure_raises_error(self):
+        self.assertRaises(ValueError, lambda: TargetedMaskingAgent(measure="closeness"))
@@ -1,5 +1,62 @@
 import unittest
 
+import gym
+
+from social_distancing_sim.agent.basic_agents.random_agent import RandomAgent
+from social_distancing_sim.agent.basic_agents.vaccination_agent import VaccinationAgent
+from social_distancing_sim.agent.multi_agents.multi_agent import MultiAgent
+from tests.common.env_fixtures import register_test_envs
+
 
 class TestMultiAgent(unittest.TestCase):
-    pass
+    _sut = MultiAgent
+
+    def test_reset_resets_child_agents(self):
+        # Arrange
+        agent = self._sut(agents=[RandomAgent(), VaccinationAgent()])
+        for agt in agent.agents:
+            agt._step = 10
+
+        # Act
+        agent.reset()
+
+        # Assert
+        for agt in agent.agents:
+            self.assertEqual(0, agt._step)
+
+    def test_reseed_derives_independent_child_seeds(self):
+        # Arrange
+        agent_1 = self._sut(agents=[RandomAgent(), RandomAgent()])
+        agent_2 = self._sut(agents=[RandomAgent(), RandomAgent()])
+
+        # Act
+        agent_1.reseed(123)
+        agent_2.reseed(123)
+
+        # Assert
+        self.assertEqual(123, agent_1.seed)
+        self.assertNotEqual(agent_1.agents[0].seed, agent_1.agents[1].seed)
+        self.assertListEqual(
+            [a.seed for a in agent_1.agents], [a.seed for a in agent_2.agents]
+        )
+
+    def test_child_agents_share_target_pools(self):
+        # Arrange
+        register_test_envs()
+        agent = self._sut(
+            agents=[VaccinationAgent(), VaccinationAgent()],
+            env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+        )
+        agent.env.unwrapped.reset()
+
+        # Act
+        pools = [agt.available_targets for agt in agent.agents]
+        agent.env.unwrapped.step(agent.get_actions())
+        next_pool = agent.agents[0].available_targets
+
+        # Assert
+        self.assertIs(pools[0], pools[1])
+        self.assertIsNot(pools[0], next_pool)
+        self.assertEqual(
+            1, len(agent.env.unwrapped.sds_env.observation_space.target_pools)
+        )
@@ -0,0 +1,183 @@
+import unittest
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    VaccinationArrayAgent,
+)
+from social_distancing_sim.agent.planning_agents.mcts_agent import MCTSAgent, _Tree
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestTree(unittest.TestCase):
+    _sut = _Tree
+
+    def test_add_grows_arrays_when_full(self):
+        # Arrange
+        tree = self._sut(n_macros=2, capacity=2)
+
+        # Act
+        first = tree.add(0, 1)
+        second = tree.add(first, 0)
+
+        # Assert
+        self.assertEqual(4, tree.capacity)
+        self.assertEqual(3, tree.n_nodes)
+        self.assertListEqual([-1, first], tree.children[0].tolist())
+        self.assertListEqual([second, -1], tree.children[first].tolist())
+        self.assertListEqual([-1, -1], tree.children[second].tolist())
+
+    def test_subtree_renumbers_from_new_root(self):
+        # Arrange
+        tree = self._sut(n_macros=2)
+        a, b = tree.add(0, 0), tree.add(0, 1)
+        c = tree.add(b, 1)
+        tree.visits[[0, a, b, c]] = [3, 1, 2, 1]
+        tree.value_sum[[0, a, b, c]] = [-6.0, -1.0, -5.0, -2.0]
+
+        # Act
+        subtree = tree.subtree(b)
+
+        # Assert
+        self.assertEqual(2, subtree.n_nodes)
+        self.assertListEqual([-1, 1], subtree.children[0].tolist())
+        self.assertListEqual([2, 1], subtree.visits[0:2].tolist())
+        self.assertListEqual([-5.0, -2.0], subtree.value_sum[0:2].tolist())
+
+    def test_root_stats_zero_for_unexpanded(self):
+        # Arrange
+        tree = self._sut(n_macros=3)
+        node = tree.add(0, 2)
+        tree.visits[node], tree.value_sum[node] = 4, -8.0
+
+        # Act
+        visits, value_sum = tree.root_stats()
+
+        # Assert
+        self.assertListEqual([0, 0, 4], visits.tolist())
+        self.assertListEqual([0.0, 0.0, -8.0], value_sum.tolist())
+
+
+class TestMCTSAgent(unittest.TestCase):
+    _sut = MCTSAgent
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def setUp(self):
+        self._env = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").unwrapped
+        self._env.reset()
+        for _ in range(3):
+            self._env.step(([], []))
+
+    def _agent(self, **kwargs) -> MCTSAgent:
+        agent = self._sut(actions_per_turn=2, seed=0, horizon=3, **kwargs)
+        agent.attach_to_env(self._env)
+
+        return agent
+
+    def test_applies_most_visited_macro(self):
+        # Arrange
+        agent = self._agent(n_simulations=20)
+
+        # Act
+        actions, targets = agent.get_actions()
+
+        # Assert
+        self.assertEqual(20, agent.last_visits.sum())
+        best = agent.macros[int(np.argmax(agent.last_visits))]
+        if best is None:
+            self.assertListEqual([], actions)
+        else:
+            self.assertTrue(set(actions).issubset(best.available_actions))
+        self.assertEqual(len(actions), len(targets))
+        self.assertTrue(all(m is None or m.env is None for m in agent.macros))
+
+    def test_reuses_subtree_on_next_step(self):
+        # Arrange
+        agent = self._agent(n_simulations=20)
+        self._env.step(agent.get_actions())
+        kept = agent._tree.root_stats()[0].sum()
+
+        # Act
+        agent.get_actions()
+
+        # Assert
+        self.assertEqual(kept + 20, agent.last_visits.sum())
+
+    def test_discards_tree_if_env_not_on_next_step(self):
+        # Arrange
+        agent = self._agent(n_simulations=20)
+        agent.get_actions()
+
+        # Act
+        agent.get_actions()
+
+        # Assert
+        self.assertEqual(20, agent.last_visits.sum())
+
+    def test_search_doesnt_change_env(self):
+        # Arrange
+        agent = self._agent(n_simulations=10)
+        sds_env = self._env.sds_env
+        step = sds_env._step
+        random_state = sds_env._random_state.get_state()[1].copy()
+        n_history = len(sds_env.history["Turn score"])
+
+        # Act
+        agent.get_actions()
+
+        # Assert
+        self.assertIs(sds_env, self._env.sds_env)
+        self.assertEqual(step, sds_env._step)
+        np.testing.assert_array_equal(
+            random_state, sds_env._random_state.get_state()[1]
+        )
+        self.assertEqual(n_history, len(sds_env.history["Turn score"]))
+
+    def test_reproducible_with_seed(self):
+        # Act
+        first = self._agent(n_simulations=10)
+        first_actions = first.get_actions()
+        second = self._agent(n_simulations=10)
+        second_actions = second.get_actions()
+
+        # Assert
+        self.assertEqual(first_actions, second_actions)
+        np.testing.assert_array_equal(first.last_values, second.last_values)
+
+    def test_time_budget_limits_simulations_to_at_least_one(self):
+        # Arrange
+        agent = self._agent(n_simulations=50, time_budget=0)
+
+        # Act
+        agent.get_actions()
+
+        # Assert
+        self.assertEqual(1, agent.last_visits.sum())
+
+    def test_single_macro_applied_without_search(self):
+        # Arrange
+        agent = self._agent(macros=[VaccinationArrayAgent(actions_per_turn=2)])
+
+        # Act
+        actions, _ = agent.get_actions()
+
+        # Assert
+        self.assertListEqual([1, 1], actions)
+        self.assertEqual(0, agent.last_visits.sum())
+        self.assertIsNone(agent._tree)
+
+    def test_clone_drops_tree(self):
+        # Arrange
+        agent = self._agent(n_simulations=5)
+        agent.get_actions()
+
+        # Act
+        clone = agent.clone()
+
+        # Assert
+        self.assertIsNone(clone.env)
+        self.assertIsNone(clone._tree)
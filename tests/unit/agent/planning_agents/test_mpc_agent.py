@@ -0,0 +1,137 @@
+import unittest
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.basic_array_agents import (
+    IsolationArrayAgent,
+    VaccinationArrayAgent,
+)
+from social_distancing_sim.agent.planning_agents.mpc_agent import MPCAgent
+from social_distancing_sim.environment.seeding import derive_seeds
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestMPCAgent(unittest.TestCase):
+    _sut = MPCAgent
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def setUp(self):
+        self._env = gym.make("SDSTests-GymEnvFixedSeedFixture-v0").unwrapped
+        self._env.reset()
+        for _ in range(3):
+            self._env.step(([], []))
+
+    def _agent(self, **kwargs) -> MPCAgent:
+        agent = self._sut(actions_per_turn=2, seed=0, horizon=3, **kwargs)
+        agent.attach_to_env(self._env)
+
+        return agent
+
+    def test_returns_best_scoring_candidate(self):
+        # Arrange
+        agent = self._agent(n_rollouts=3)
+
+        # Act
+        actions, targets = agent.get_actions()
+
+        # Assert
+        self.assertEqual((len(agent.last_candidates), 3), agent.last_scores.shape)
+        self.assertListEqual([], agent.last_candidates[0][0])
+        best = agent.last_candidates[int(np.argmax(agent.last_scores.mean(axis=1)))]
+        self.assertListEqual(sorted(zip(*best)), sorted(zip(targets, actions)))
+        self.assertEqual(1, agent._step)
+
+    def test_rollouts_dont_change_env(self):
+        # Arrange
+        agent = self._agent(rollout_agent=IsolationArrayAgent(actions_per_turn=2))
+        sds_env = self._env.sds_env
+        step = sds_env._step
+        random_state = sds_env._random_state.get_state()[1].copy()
+        n_history = len(sds_env.history["Turn score"])
+
+        # Act
+        agent.get_actions()
+
+        # Assert
+        self.assertIs(sds_env, self._env.sds_env)
+        self.assertEqual(step, sds_env._step)
+        np.testing.assert_array_equal(
+            random_state, sds_env._random_state.get_state()[1]
+        )
+        self.assertEqual(n_history, len(sds_env.history["Turn score"]))
+
+    def test_reproducible_with_seed(self):
+        # Act
+        first = self._agent(n_rollouts=2).get_actions()
+        second = self._agent(n_rollouts=2).get_actions()
+
+        # Assert
+        self.assertEqual(first, second)
+
+    def test_time_budget_limits_rounds_to_at_least_one(self):
+        # Arrange
+        agent = self._agent(n_rollouts=10, time_budget=0)
+
+        # Act
+        agent.get_actions()
+
+        # Assert
+        self.assertEqual(1, agent.last_scores.shape[1])
+
+    def test_no_rollouts_with_single_candidate(self):
+        # Arrange
+        agent = self._agent(
+            candidate_agents=[VaccinationArrayAgent(actions_per_turn=2)],
+            include_no_action=False,
+        )
+
+        # Act
+        actions, _ = agent.get_actions()
+
+        # Assert
+        self.assertEqual(1, len(agent.last_candidates))
+        self.assertEqual((1, 0), agent.last_scores.shape)
+        self.assertListEqual(agent.last_candidates[0][0], actions)
+
+    def test_clone_detaches_candidate_agents(self):
+        # Arrange
+        agent = self._agent()
+
+        # Act
+        clone = agent.clone()
+
+        # Assert
+        self.assertIsNone(clone.env)
+        self.assertTrue(all(a.env is None for a in clone.candidate_agents))
+
+    def test_clone_leaves_original_candidate_agents_attached(self):
+        # Arrange
+        agent = self._agent()
+
+        # Act
+        agent.clone()
+
+        # Assert
+        self.assertIsNotNone(agent.env)
+        self.assertTrue(all(a.env is agent.env for a in agent.candidate_agents))
+
+    def test_clone_reseeds_candidate_agents_from_its_seed(self):
+        # Arrange
+        agent = self._agent()
+        for candidate in agent.candidate_agents:
+            candidate.seed = 123
+            candidate.reset()
+
+        # Act
+        clone = agent.clone()
+
+        # Assert
+        self.assertListEqual(
+            derive_seeds(agent.seed, len(agent.candidate_agents)),
+            [a.seed for a in clone.candidate_agents],
+        )
+        self.assertListEqual([123] * 4, [a.seed for a in agent.candidate_agents])
@@ -21,6 +21,8 @@ class TestVaccinationPolicyAgent(unittest.TestCase):
         mock_env = MagicMock(spec=GymEnv)
         mock_env.sds_env = MagicMock(spec=Environment)
         mock_env.sds_env.observation_space = mock_observation_space
+        mock_env.sds_env._step = 0
+        mock_observation_space.target_pools = {}
         mock_env.sds_env.action_space = ActionSpace()
 
         self._mock_env = mock_env
@@ -0,0 +1,127 @@
+import queue
+import unittest
+from types import SimpleNamespace
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.q_learning.actor_learner import (
+    Actor,
+    ActorLearnerDQNTrainer,
+    _latest,
+)
+from tests.common.env_fixtures import register_test_envs
+from tests.common.linear_model import LinearModel
+
+
+class TestActor(unittest.TestCase):
+    _sut = Actor
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def _actor(self, eps: float, steps_per_push: int = 3) -> Actor:
+        actor = self._sut(
+            env=gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec,
+            n_envs=2,
+            activations=["linear"],
+            eps=eps,
+            steps_per_push=steps_per_push,
+            n_steps=2,
+            seed=0,
+        )
+        state = np.random.RandomState(0)
+        n_inputs = actor.vec_env.total_population * 6
+        actor.set_weights([state.normal(size=(n_inputs, 5)), state.normal(size=5)])
+
+        return actor
+
+    def test_collect_returns_compact_transitions_from_all_envs(self):
+        # Arrange
+        actor = self._actor(eps=0)
+
+        # Act
+        batch = actor.collect()
+
+        # Assert
+        n_inputs = actor.vec_env.total_population * 6
+        self.assertEqual((6, n_inputs), batch["obs"].shape)
+        self.assertEqual(np.int8, batch["obs"].dtype)
+        self.assertEqual((6, n_inputs), batch["next_obs"].shape)
+        np.testing.assert_array_equal(
+            actor.policy.predict(batch["obs"]).argmax(axis=1), batch["actions"]
+        )
+        np.testing.assert_array_equal(
+            [False, False, True, True, False, False], batch["dones"]
+        )
+        # Both envs finished their first 2 step episode
+        self.assertEqual((2,), batch["episode_rewards"].shape)
+
+    def test_collect_explores(self):
+        # Arrange
+        actor = self._actor(eps=1, steps_per_push=20)
+
+        # Act
+        batch = actor.collect()
+
+        # Assert
+        self.assertEqual(5, len(np.unique(batch["actions"])))
+
+
+class TestActorLearnerDQNTrainer(unittest.TestCase):
+    _sut = ActorLearnerDQNTrainer
+
+    def test_actor_eps_spaced_from_initial_to_min(self):
+        # Arrange
+        trainer = self._sut(
+            env="unused",
+            model=LinearModel(2, 2),
+            activations=["linear"],
+            n_actors=3,
+            eps_initial=0.4,
+            eps_min=0.004,
+        )
+
+        # Assert
+        np.testing.assert_allclose([0.4, 0.04, 0.004], trainer.actor_eps)
+        self.assertEqual(3, len({trainer._actor_kwargs(i)["seed"] for i in range(3)}))
+
+    def test_from_agent_trains_agent_models_with_its_settings(self):
+        # Arrange
+        model, target_model = LinearModel(2, 2), LinearModel(2, 2)
+        agent = SimpleNamespace(
+            actions_per_turn=3,
+            rlk_agent=SimpleNamespace(
+                check_ready=lambda: None,
+                gamma=0.9,
+                replay_buffer_samples=16,
+                _action_model=model,
+                _target_model=target_model,
+            ),
+        )
+
+        # Act
+        trainer = self._sut.from_agent(
+            agent, env="unused", activations=["linear"], gamma=0.5
+        )
+
+        # Assert
+        self.assertIs(model, trainer.model)
+        self.assertIs(target_model, trainer.target_model)
+        self.assertEqual("unused", trainer.env)
+        self.assertEqual(0.5, trainer.gamma)
+        self.assertEqual(16, trainer.batch_size)
+        self.assertEqual(3, trainer.actions_per_turn)
+
+
+class TestLatest(unittest.TestCase):
+    def test_returns_most_recent_item(self):
+        # Arrange
+        q = queue.Queue()
+        for i in range(3):
+            q.put(i)
+
+        # Act/Assert
+        self.assertEqual(2, _latest(q))
+        self.assertIsNone(_latest(q))
@@ -0,0 +1,195 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.array_agents.array_agent_base import COLUMNS
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+from social_distancing_sim.agent.rl_agents.models.numpy_targeted_nn import (
+    NumpyTargetedNN,
+)
+from social_distancing_sim.agent.rl_agents.q_learning.numpy_dqn_targeted import (
+    NumpyDQNTargeted,
+)
+from social_distancing_sim.sim import Sim
+from tests.common.env_fixtures import register_test_envs
+
+
+def _dense(sizes, activations, state: np.random.RandomState) -> NumpyDense:
+    return NumpyDense(
+        kernels=[state.normal(size=(i, o)) for i, o in zip(sizes[:-1], sizes[1:])],
+        biases=[state.normal(size=o) for o in sizes[1:]],
+        activations=activations,
+    )
+
+
+def _model(n_actions: int = 5, seed: int = 0) -> NumpyTargetedNN:
+    state = np.random.RandomState(seed)
+    return NumpyTargetedNN(
+        state_net=_dense((7, 16, 8), ["relu", "linear"], state),
+        node_net=_dense((6, 8), ["linear"], state),
+        head=_dense((8, 4, n_actions), ["relu", "linear"], state),
+    )
+
+
+def _layer(name: str, weights, activation: str = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        name=name,
+        get_weights=lambda: weights,
+        get_config=lambda: {"activation": activation},
+    )
+
+
+class TestNumpyTargetedNN(unittest.TestCase):
+    _sut = NumpyTargetedNN
+
+    def test_batched_values_match_per_node_concatenation(self):
+        # Arrange
+        model = _model()
+        state = np.random.RandomState(1)
+        summaries = state.randint(0, 30, size=(2, 7))
+        nodes = state.randint(0, 2, size=(2, 10, 6))
+
+        # Act
+        values = model.predict(summaries, nodes)
+
+        # Assert
+        self.assertEqual((2, 10, 5), values.shape)
+        # The broadcast sum is a dense layer over the concatenated [state embedding, node features]
+        kernel = np.concatenate([np.eye(8), model.node_net.kernels[0]])
+        for k in range(2):
+            embedding = model.state_net.predict(summaries[k][None])[0]
+            for i in range(10):
+                joint = np.maximum(
+                    np.concatenate([embedding, nodes[k, i]]) @ kernel
+                    + model.node_net.biases[0],
+                    0,
+                )
+                np.testing.assert_allclose(
+                    model.head.predict(joint[None])[0], values[k, i], rtol=1e-4
+                )
+
+    def test_from_keras_splits_layers_by_name(self):
+        # Arrange
+        state = np.random.RandomState(0)
+        model = SimpleNamespace(
+            layers=[
+                _layer("state_input", []),
+                _layer("node_input", []),
+                _layer("state_fc1", [state.normal(size=(7, 4)), np.zeros(4)], "relu"),
+                _layer("state_embedding", [np.ones((4, 3)), np.zeros(3)], "linear"),
+                _layer("reshape", []),
+                _layer("node_embedding", [np.ones((6, 3)), np.zeros(3)], "linear"),
+                _layer("add", []),
+                _layer("q_fc1", [np.ones((3, 2)), np.zeros(2)], "relu"),
+                _layer("output", [np.ones((2, 5)), np.zeros(5)], None),
+            ]
+        )
+
+        # Act
+        exported = self._sut.from_keras(model)
+
+        # Assert
+        self.assertListEqual(["relu", "linear"], exported.state_net.activations)
+        self.assertListEqual(["linear"], exported.node_net.activations)
+        self.assertListEqual(["relu", "linear"], exported.head.activations)
+        self.assertEqual(5, exported.n_actions)
+
+    def test_save_and_load(self):
+        # Arrange
+        model = _model()
+        summaries, nodes = np.ones((1, 7)), np.ones((1, 4, 6))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fn = os.path.join(tmp_dir, "model.npz")
+
+            # Act
+            model.save(fn)
+            loaded = self._sut.load(fn)
+
+        # Assert
+        np.testing.assert_array_equal(
+            model.predict(summaries, nodes), loaded.predict(summaries, nodes)
+        )
+
+
+class TestNumpyDQNTargeted(unittest.TestCase):
+    _sut = NumpyDQNTargeted
+
+    @classmethod
+    def setUpClass(cls):
+        register_test_envs()
+
+    def test_selects_highest_value_valid_pairs(self):
+        # Arrange
+        agent = self._sut(_model(), actions_per_turn=3)
+        state = np.random.RandomState(2)
+        summaries = state.randint(0, 30, size=(4, 7))
+        nodes = state.randint(0, 2, size=(4, 20, 6))
+        nodes[..., COLUMNS["alive"]] = 1
+        nodes[..., COLUMNS["infected"]] = 1 - nodes[..., COLUMNS["clear"]]
+
+        # Act
+        actions_targets = agent.get_batch_actions(summaries, nodes)
+
+        # Assert
+        values = agent.model.predict(summaries, nodes)
+        for k, (actions, targets) in enumerate(actions_targets):
+            pairs = [
+                (values[k, t, agent.actions.index(a)], t, a)
+                for t in range(20)
+                for a in agent.actions
+                if _is_valid(nodes[k, t], a)
+            ]
+            best_per_node = {}
+            for value, t, a in sorted(pairs):
+                best_per_node[t] = (value, a)
+            expected = sorted(
+                best_per_node.items(), key=lambda kv: kv[1][0], reverse=True
+            )[0:3]
+            self.assertListEqual([t for t, _ in expected], targets)
+            self.assertListEqual([va[1] for _, va in expected], actions)
+
+    def test_nodes_without_valid_actions_not_targeted(self):
+        # Arrange
+        agent = self._sut(_model(n_actions=1), actions=(4,), actions_per_turn=5)
+        nodes = np.zeros((1, 6, 6))
+        nodes[0, [1, 4], COLUMNS["infected"]] = 1
+
+        # Act
+        ((actions, targets),) = agent.get_batch_actions(np.ones((1, 7)), nodes)
+
+        # Assert
+        self.assertListEqual([4, 4], actions)
+        self.assertListEqual([1, 4], sorted(targets))
+
+    def test_mismatched_actions_raises_error(self):
+        self.assertRaises(ValueError, lambda: self._sut(_model(), actions=(1, 2)))
+
+    def test_run_in_sim(self):
+        # Arrange
+        sim = Sim(
+            env_spec=gym.make("SDSTests-GymEnvFixedSeedFixture-v0").spec,
+            agent=self._sut(_model(), actions_per_turn=2),
+            n_steps=5,
+        )
+
+        # Act
+        history = sim.run()
+
+        # Assert
+        self.assertEqual(5, len(history["Turn score"]))
+
+
+def _is_valid(node: np.ndarray, action: int) -> bool:
+    status = {name: bool(node[i]) for name, i in COLUMNS.items()}
+    return {
+        1: status["clear"] and not status["immune"],
+        2: status["infected"] and not status["isolated"],
+        3: status["clear"] and status["isolated"],
+        4: status["infected"],
+        5: status["alive"] and not status["masked"],
+    }[action]
@@ -0,0 +1,209 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+from functools import partial
+from types import SimpleNamespace
+
+import gym
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.models.numpy_dense import NumpyDense
+from social_distancing_sim.agent.rl_agents.q_learning.numpy_dqn_untargeted import (
+    NumpyDQNUntargeted,
+)
+from social_distancing_sim.environment.gym.wrappers.flatten_obs_wrapper import (
+    FlattenObsWrapper,
+)
+from social_distancing_sim.environment.gym.wrappers.limit_obs_wrapper import (
+    LimitObsWrapper,
+)
+from tests.common.env_fixtures import register_test_envs
+
+
+def _layer(name: str, weights, activation: str = None) -> SimpleNamespace:
+    """Stand in for a Keras layer, with the methods used to export it."""
+    return SimpleNamespace(
+        name=name,
+        get_weights=lambda: weights,
+        get_config=lambda: {"name": name, "activation": activation},
+    )
+
+
+def _model(sizes=(180, 16, 8, 5), seed: int = 0) -> NumpyDense:
+    state = np.random.RandomState(seed)
+    return NumpyDense(
+        kernels=[state.normal(size=(i, o)) for i, o in zip(sizes[:-1], sizes[1:])],
+        biases=[state.normal(size=o) for o in sizes[1:]],
+        activations=["relu"] * (len(sizes) - 2) + ["linear"],
+    )
+
+
+class TestNumpyDense(unittest.TestCase):
+    _sut = NumpyDense
+
+    def test_from_keras_skips_layers_without_weights(self):
+        # Arrange
+        kernel, bias = np.ones((3, 2)), np.array([0.5, -10])
+        model = SimpleNamespace(
+            layers=[
+                _layer("input", []),
+                _layer("fc1", [kernel, bias], "relu"),
+                _layer("output", [kernel[0:2], bias], "linear"),
+            ]
+        )
+
+        # Act
+        dense = self._sut.from_keras(model)
+
+        # Assert
+        self.assertListEqual(["relu", "linear"], dense.activations)
+        np.testing.assert_allclose([[4, -6.5]], dense.predict([[1, 1, 1]]))
+
+    def test_from_keras_raises_error_on_non_dense_layer(self):
+        # Arrange
+        model = SimpleNamespace(layers=[_layer("conv", [np.ones((3, 3, 2)), 0])])
+
+        # Act/Assert
+        self.assertRaises(ValueError, lambda: self._sut.from_keras(model))
+
+    def test_predict_matches_manual_forward_pass(self):
+        # Arrange
+        dense = _model(sizes=(4, 3, 2))
+        x = np.random.RandomState(1).normal(size=(5, 4))
+
+        # Act
+        y = dense.predict(x)
+
+        # Assert
+        expected = (
+            np.maximum(x @ dense.kernels[0] + dense.biases[0], 0) @ dense.kernels[1]
+            + dense.biases[1]
+        )
+        self.assertEqual(np.float32, y.dtype)
+        np.testing.assert_allclose(expected, y, rtol=1e-5)
+
+    def test_save_and_load(self):
+        # Arrange
+        dense = _model()
+        x = np.random.RandomState(1).normal(size=(2, 180))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fn = os.path.join(tmp_dir, "model.npz")
+
+            # Act
+            dense.save(fn)
+            loaded = self._sut.load(fn)
+
+        # Assert
+        self.assertListEqual(dense.activations, loaded.activations)
+        np.testing.assert_array_equal(dense.predict(x), loaded.predict(x))
+
+    def test_unsupported_activation_raises_error(self):
+        self.assertRaises(
+            ValueError,
+            lambda: self._sut(kernels=[np.ones((2, 2))], biases=[0], activations=["x"]),
+        )
+
+
+class TestNumpyDQNUntargeted(unittest.TestCase):
+    _sut = NumpyDQNUntargeted
+    _env = "SDSTests-GymEnvFixedSeedFixture-v0"
+
+    @classmethod
+    def setUpClass(cls):
+        register_test_envs()
+
+    def _agent(self) -> NumpyDQNUntargeted:
+        return self._sut(
+            _model(),
+            env_wrappers=(partial(LimitObsWrapper, output=2), FlattenObsWrapper),
+            actions_per_turn=3,
+        )
+
+    def test_get_actions_repeats_best_action(self):
+        # Arrange
+        agent = self._agent()
+        state = np.random.RandomState(1).randint(0, 2, size=180)
+
+        # Act
+        actions, targets = agent.get_actions(state)
+
+        # Assert
+        best = int(agent.model.predict(state[None]).argmax())
+        self.assertListEqual([best] * 3, actions)
+        self.assertListEqual([], targets)
+        self.assertEqual(1, agent._step)
+
+    def test_attach_to_env_applies_wrappers(self):
+        # Arrange
+        agent = self._agent()
+
+        # Act
+        agent.attach_to_env(gym.make(self._env))
+
+        # Assert
+        self.assertIsInstance(agent.env, FlattenObsWrapper)
+        self.assertEqual((180,), agent.env.observation_space.shape)
+
+    def test_play_wrapped_env(self):
+        # Arrange
+        agent = self._agent()
+        agent.attach_to_env(gym.make(self._env))
+        state, _ = agent.env.reset()
+
+        # Act
+        for _ in range(3):
+            actions, targets = agent.get_actions(state)
+            state, *_ = agent.env.step((actions, targets))
+
+        # Assert
+        self.assertEqual((180,), state.shape)
+        self.assertEqual(3, len(agent.env.unwrapped.sds_env.history["Turn score"]))
+
+    def test_get_actions_without_state_uses_wrapped_env_state(self):
+        # Arrange
+        agent = self._agent()
+        # Always provide masks, which can target any alive node at the start
+        agent.model = _model(sizes=(180, 16, 8, 6))
+        agent.model.biases[-1] = np.array([0, 0, 0, 0, 0, 1e6])
+        agent.attach_to_env(gym.make(self._env))
+        _ = agent.env.reset()
+
+        # Act
+        actions, targets = agent.get_actions()
+
+        # Assert
+        self.assertListEqual([5, 5, 5], actions)
+        self.assertEqual(3, len(set(targets)))
+        self.assertEqual(1, agent._step)
+
+    def test_clone_is_small(self):
+        # Arrange
+        agent = self._agent()
+        agent.attach_to_env(gym.make(self._env))
+
+        # Act
+        clone = agent.clone()
+
+        # Assert
+        self.assertIsNone(clone.env)
+        self.assertLess(len(pickle.dumps(clone)), 100_000)
+
+    def test_import_doesnt_import_tensorflow(self):
+        # Act
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; "
+                "import social_distancing_sim.agent.rl_agents.q_learning.numpy_dqn_untargeted; "
+                "assert 'tensorflow' not in sys.modules",
+            ],
+            capture_output=True,
+        )
+
+        # Assert
+        self.assertEqual(0, result.returncode, result.stderr)
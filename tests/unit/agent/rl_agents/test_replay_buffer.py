@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.replay_buffer import ReplayBuffer
+
+
+class TestReplayBuffer(unittest.TestCase):
+    _sut = ReplayBuffer
+
+    @staticmethod
+    def _batch(start: int, n: int):
+        ids = np.arange(start, start + n)
+        return (
+            np.repeat(ids[:, None], 3, axis=1),
+            ids % 5,
+            ids.astype(float),
+            ids % 2 == 0,
+            np.repeat(ids[:, None] + 1, 3, axis=1),
+        )
+
+    def test_add_batches_wraps_around(self):
+        # Arrange
+        buffer = self._sut(capacity=5, obs_shape=(3,), obs_dtype=np.int16)
+
+        # Act
+        buffer.add(*self._batch(0, 3))
+        buffer.add(*self._batch(3, 4))
+
+        # Assert
+        self.assertEqual(5, len(buffer))
+        self.assertTrue(buffer.full)
+        np.testing.assert_array_equal([5, 6, 2, 3, 4], buffer.obs[:, 0])
+        np.testing.assert_array_equal([6, 7, 3, 4, 5], buffer.next_obs[:, 0])
+        np.testing.assert_array_equal([5, 6, 2, 3, 4], buffer.rewards)
+        self.assertEqual(np.int16, buffer.obs.dtype)
+
+    def test_add_batch_larger_than_capacity_keeps_latest(self):
+        # Arrange
+        buffer = self._sut(capacity=4, obs_shape=(3,))
+
+        # Act
+        buffer.add(*self._batch(0, 10))
+
+        # Assert
+        self.assertListEqual([6, 7, 8, 9], sorted(buffer.obs[:, 0].tolist()))
+
+    def test_sample_only_from_filled_transitions(self):
+        # Arrange
+        buffer = self._sut(capacity=100, obs_shape=(3,))
+        buffer.add(*self._batch(0, 4))
+
+        # Act
+        batch = buffer.sample(50, random_state=np.random.RandomState(0))
+
+        # Assert
+        self.assertEqual((50, 3), batch["obs"].shape)
+        self.assertTrue(set(batch["obs"][:, 0]).issubset({0, 1, 2, 3}))
+        np.testing.assert_array_equal(batch["obs"][:, 0] + 1, batch["next_obs"][:, 0])
+        np.testing.assert_array_equal(batch["obs"][:, 0] % 5, batch["actions"])
+
+    def test_sample_from_empty_buffer_raises_error(self):
+        self.assertRaises(
+            ValueError, lambda: self._sut(capacity=2, obs_shape=(1,)).sample(1)
+        )
+
+    def test_memmap_backed_arrays(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            buffer = self._sut(capacity=5, obs_shape=(3,), memmap_dir=tmp_dir)
+
+            # Act
+            buffer.add(*self._batch(0, 2))
+            buffer.obs.flush()
+
+            # Assert
+            self.assertIsInstance(buffer.obs, np.memmap)
+            np.testing.assert_array_equal(
+                buffer.obs, np.load(os.path.join(tmp_dir, "obs.npy"))
+            )
+            del buffer
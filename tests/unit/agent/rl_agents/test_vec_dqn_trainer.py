@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.agent.rl_agents.q_learning.vec_dqn_trainer import (
+    VecDQNTrainer,
+)
+from social_distancing_sim.environment.gym.vec_env import VecEnv
+from tests.common.env_fixtures import register_test_envs
+from tests.common.linear_model import LinearModel
+
+
+class TestVecDQNTrainer(unittest.TestCase):
+    _sut = VecDQNTrainer
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def _trainer(self, **kwargs) -> VecDQNTrainer:
+        vec_env = VecEnv(
+            "SDSTests-GymEnvFixedSeedFixture-v0",
+            n_envs=3,
+            n_steps=4,
+            include_graph=False,
+            seed=0,
+        )
+        n_inputs = vec_env.total_population * 6
+
+        return self._sut(
+            vec_env=vec_env,
+            model=LinearModel(n_inputs, 5),
+            target_model=LinearModel(n_inputs, 5),
+            buffer_size=20,
+            batch_size=8,
+            learning_starts=6,
+            target_update_every=2,
+            seed=0,
+            **kwargs,
+        )
+
+    def test_collects_from_all_envs_into_compact_buffer(self):
+        # Arrange
+        trainer = self._trainer()
+
+        # Act
+        history = trainer.train(n_steps=5)
+
+        # Assert
+        self.assertEqual(15, len(trainer.buffer))
+        self.assertEqual(np.int8, trainer.buffer.obs.dtype)
+        self.assertEqual(
+            (trainer.vec_env.total_population * 6,), trainer.buffer.obs_shape
+        )
+        # One batched prediction per step, and per update for the targets
+        self.assertEqual(
+            5 + len(history["losses"]), trainer.model.n_calls["predict_on_batch"]
+        )
+        # Each env finished one 4 step episode
+        self.assertEqual(3, len(history["episode_rewards"]))
+
+    def test_trains_after_learning_starts_and_updates_target(self):
+        # Arrange
+        trainer = self._trainer()
+
+        # Act
+        history = trainer.train(n_steps=6)
+
+        # Assert
+        # Learning starts on the second step (6 transitions)
+        self.assertEqual(5, len(history["losses"]))
+        self.assertEqual(5, trainer.model.n_calls["train_on_batch"])
+        self.assertFalse(np.allclose(0, trainer.model.w))
+        self.assertFalse(np.allclose(0, trainer.target_model.w))
+
+    def test_training_continues_across_calls(self):
+        # Arrange
+        trainer = self._trainer(eps_initial=1, eps_decay=0.5)
+
+        # Act
+        trainer.train(n_steps=2)
+        trainer.train(n_steps=2)
+
+        # Assert
+        self.assertEqual(12, len(trainer.buffer))
+        self.assertAlmostEqual(1 / 16, trainer.eps)
+
+    def test_reproducible_with_seed(self):
+        # Act
+        first = self._trainer().train(n_steps=6)
+        second = self._trainer().train(n_steps=6)
+
+        # Assert
+        self.assertDictEqual(first, second)
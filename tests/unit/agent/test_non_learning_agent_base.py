@@ -46,3 +46,21 @@ class TestAgentBase(unittest.TestCase):
         # Assert
         self.assertIsInstance(actions, dict)
         self.assertEqual(3, len(actions.keys()))
+
+    @patch.multiple(NonLearningAgentBase, __abstractmethods__=set())
+    def test_target_pool_built_once_per_step_and_shared(self):
+        # Arrange
+        self.mock_env.sds_env._step = 0
+        self.mock_env.sds_env.observation_space.target_pools = {}
+        agents = [NonLearningAgentBase(self.mock_env) for _ in range(2)]
+        build = MagicMock(return_value={3, 1})
+
+        # Act
+        pools = [agt._target_pool("pool", build) for agt in agents]
+        self.mock_env.sds_env._step = 1
+        agents[0]._target_pool("pool", build)
+
+        # Assert
+        self.assertIs(pools[0], pools[1])
+        self.assertListEqual([1, 3], sorted(pools[0]))
+        self.assertEqual(2, build.call_count)
@@ -8,6 +8,7 @@ from tests.common.env_fixtures import register_test_envs
 from tests.common.env_fixtures.env_template_random_seed_fixture import (
     EnvTemplateRandomSeedFixture,
 )
+from tests.common.env_fixtures.gym_env_fixed_seed_fixture import GymEnvFixedSeedFixture
 
 
 class TestGymEnv(unittest.TestCase):
@@ -52,15 +53,29 @@ class TestGymEnv(unittest.TestCase):
         # Act
         _ = self._run_for(env)
 
+    def test_observations_are_in_observation_space(self):
+        # Arrange
+        env = GymEnvFixedSeedFixture()
+        env.reset()
+
+        # Act
+        observations = [env.state] + [env.step(([1], []))[0] for _ in range(3)]
+
+        # Assert
+        for obs in observations:
+            self.assertIsInstance(obs, tuple)
+            self.assertTrue(env.observation_space.contains(obs))
+
     def test_state_tuple_is_expected_shape(self):
         # Arrange
         env = gym.make("SDSTests-GymEnvFixedSeedFixture-v0")
 
         # Act
-        obs = env.reset()
+        obs, info = env.reset()
 
         # Assert
         self.assertEqual(3, len(obs))
+        self.assertDictEqual({}, info)
 
     def test_agg_state_matches_internal_env(self):
         # Arrange
@@ -132,6 +147,52 @@ class TestGymEnv(unittest.TestCase):
         # on both test rate, and timeout of known infections. So Node status can be different from the currently
         # observed and the truth. (Status.state doesn't time out, it's only updated on retest).
 
+    def test_state_matches_declared_observation_space(self):
+        # Arrange
+        env = GymEnvFixedSeedFixture()
+        env.reset()
+
+        # Act
+        obs, _, _, _, _ = env.step(([], []))
+
+        # Assert
+        for component, space in zip(obs, env.observation_space):
+            self.assertEqual(space.dtype, component.dtype)
+            self.assertEqual(space.shape, component.shape)
+        self.assertTrue(env.observation_space.contains(tuple(obs)))
+
+    def test_reset_restores_initial_state(self):
+        # Arrange
+        env = GymEnvFixedSeedFixture()
+        env.reset()
+        env.sds_env._total_steps = 50
+        for _ in range(50):
+            env.step(([], []))
+
+        # Act
+        env.reset()
+
+        # Assert
+        self.assertEqual(0, env.sds_env._step)
+        self.assertEqual(0, env.sds_env.observation_space.graph.n_current_infected)
+        self.assertEqual(0, len(env.sds_env.observation_space.graph.current_dead_nodes))
+
+    def test_reset_with_seed_is_reproducible(self):
+        # Arrange
+        env = GymEnvFixedSeedFixture()
+
+        # Act
+        summaries = []
+        for seed in [1, 2, 1]:
+            env.reset(seed=seed)
+            for _ in range(10):
+                obs, _, _, _, _ = env.step(([], []))
+            summaries.append(list(env.sds_env.history["Total infections"]))
+
+        # Assert
+        self.assertListEqual(summaries[0], summaries[2])
+        self.assertTrue(env.fixed_graph)
+
 
 class _CustomEnv(GymEnv):
     template = EnvTemplateRandomSeedFixture
@@ -0,0 +1,160 @@
+import copy
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from social_distancing_sim.environment.gym.lazy_observation import LazyObservation
+from social_distancing_sim.environment.gym.wrappers.limit_obs_wrapper import (
+    LimitObsWrapper,
+)
+from social_distancing_sim.environment.gym.wrappers.summary_observation_wrapper import (
+    SummaryObservationWrapper,
+)
+from social_distancing_sim.environment.observation_space import ObservationSpace
+from tests.common.env_fixtures.gym_env_fixed_seed_fixture import GymEnvFixedSeedFixture
+
+
+class TestLazyObservation(unittest.TestCase):
+    _sut = LazyObservation
+
+    def setUp(self):
+        self._env = GymEnvFixedSeedFixture()
+        self._env.reset()
+
+    def test_components_match_observation_space_state(self):
+        # Arrange
+        expected = self._env.sds_env.observation_space.state
+
+        # Act
+        obs = self._sut(self._env.sds_env)
+
+        # Assert
+        self.assertEqual(3, len(obs))
+        for e, o in zip(expected, obs):
+            np.testing.assert_array_equal(e, o)
+        np.testing.assert_array_equal(expected[0], obs.summary)
+
+    def test_components_computed_on_access_only_once(self):
+        # Arrange
+        obs = self._sut(self._env.sds_env)
+
+        # Act
+        with patch.object(
+            ObservationSpace, "state_graph", return_value=np.zeros(1)
+        ) as mock_graph:
+            _ = obs[0]
+            _ = obs[2]
+            mock_graph.assert_not_called()
+            _ = obs[1]
+            _ = obs[1]
+
+        # Assert
+        mock_graph.assert_called_once()
+
+    def test_slice_returns_tuple(self):
+        # Act
+        summary_graph = self._sut(self._env.sds_env)[0:2]
+
+        # Assert
+        self.assertIsInstance(summary_graph, tuple)
+        self.assertEqual(2, len(summary_graph))
+
+    def test_iterating_only_builds_declared_components(self):
+        # Arrange
+        obs = self._sut(self._env.sds_env, components=(2,))
+
+        # Act
+        with patch.object(ObservationSpace, "state_graph") as mock_graph:
+            summary, graph, nodes = obs
+
+        # Assert
+        mock_graph.assert_not_called()
+        self.assertIsNone(summary)
+        self.assertIsNone(graph)
+        self.assertIsInstance(nodes, np.ndarray)
+
+    def test_observation_stays_valid_after_next_step(self):
+        # Arrange
+        obs = self._env.step(([], []))[0]
+        expected = self._env.sds_env.observation_space.state_graph()
+
+        # Act
+        for _ in range(3):
+            self._env.step(([1], []))
+
+        # Assert
+        self.assertIsInstance(obs, tuple)
+        np.testing.assert_array_equal(expected, obs[1])
+
+    def test_stale_undeclared_component_raises(self):
+        # Arrange
+        self._env.observation_components = (0,)
+        obs = self._env.step(([], []))[0]
+
+        # Act
+        self._env.step(([], []))
+
+        # Assert
+        self.assertIsInstance(obs[0], np.ndarray)
+        with self.assertRaises(RuntimeError):
+            _ = obs[1]
+
+    def test_is_tuple_of_declared_components(self):
+        # Act
+        obs = self._sut(self._env.sds_env, components=(0, 2))
+
+        # Assert
+        self.assertIsInstance(obs, tuple)
+        self.assertIsNone(tuple(obs)[1])
+        self.assertEqual(obs.materialise(), tuple(obs))
+
+    def test_copies_are_plain_tuples(self):
+        # Act
+        obs_copy = copy.deepcopy(self._sut(self._env.sds_env))
+
+        # Assert
+        self.assertIsInstance(obs_copy, tuple)
+        self.assertEqual(3, len(obs_copy))
+
+    def test_gym_env_caches_state_per_step(self):
+        # Act
+        obs, _, _, _, _ = self._env.step(([], []))
+
+        # Assert
+        self.assertIs(obs, self._env.state)
+        self.assertIsNot(obs, self._env.step(([], []))[0])
+
+
+class TestObservationWrapperComponents(unittest.TestCase):
+    def test_summary_wrapper_never_builds_graph(self):
+        # Arrange
+        env = SummaryObservationWrapper(GymEnvFixedSeedFixture())
+
+        # Act
+        with patch.object(ObservationSpace, "state_graph") as mock_graph:
+            env.unwrapped.reset()
+            obs, _, _, _, _ = env.step(([], []))
+
+        # Assert
+        mock_graph.assert_not_called()
+        self.assertEqual((7,), obs.shape)
+        self.assertTupleEqual((0,), env.unwrapped.observation_components)
+
+    def test_first_observation_uses_wrapper_declaration(self):
+        # Arrange
+        env = SummaryObservationWrapper(GymEnvFixedSeedFixture())
+
+        # Act
+        with patch.object(ObservationSpace, "state_graph") as mock_graph:
+            env.step(([], []))
+
+        # Assert
+        mock_graph.assert_not_called()
+
+    def test_innermost_wrapper_declaration_applies(self):
+        # Act
+        env = SummaryObservationWrapper(LimitObsWrapper(GymEnvFixedSeedFixture(), 2))
+
+        # Assert
+        self.assertTupleEqual((2,), env.unwrapped.observation_components)
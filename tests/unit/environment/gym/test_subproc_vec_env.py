@@ -0,0 +1,153 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.environment.gym.subproc_vec_env import SubprocVecEnv
+from tests.common.env_fixtures import register_test_envs
+from tests.common.env_fixtures.gym_env_fixed_seed_fixture import GymEnvFixedSeedFixture
+
+
+class TestSubprocVecEnv(unittest.TestCase):
+    _sut = SubprocVecEnv
+
+    @classmethod
+    def setUpClass(cls):
+        register_test_envs()
+
+    def setUp(self):
+        self._vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=3, n_workers=2)
+
+    def tearDown(self):
+        self._vec_env.close()
+
+    def test_sub_envs_split_over_workers(self):
+        # Assert
+        self.assertEqual(2, len(self._vec_env._processes))
+        self.assertListEqual([(0, 2), (2, 3)], self._vec_env._slices)
+
+    def test_reset_returns_views_of_shared_buffers(self):
+        # Arrange
+        n = self._vec_env.total_population
+
+        # Act
+        obs = self._vec_env.reset()
+
+        # Assert
+        self.assertEqual((3, 7), obs[0].shape)
+        self.assertIsNone(obs[1])
+        self.assertEqual((3, n, 6), obs[2].shape)
+        self.assertEqual(np.int8, obs[2].dtype)
+        # All alive and in population after reset
+        self.assertTrue((obs[0][:, 0] == n).all())
+        self.assertTrue(obs[2][:, :, 0].all())
+
+    def test_step_writes_observations_to_shared_buffers(self):
+        # Arrange
+        obs_1 = self._vec_env.reset()
+
+        # Act
+        obs_2, rewards, dones, _, infos = self._vec_env.step(np.array([0, 1, 4]))
+
+        # Assert
+        self.assertIs(obs_1[0], obs_2[0])
+        self.assertEqual((3,), rewards.shape)
+        self.assertEqual((3,), dones.shape)
+        self.assertEqual(3, len(infos))
+        self.assertTrue(np.isfinite(rewards).all())
+
+    def test_sub_envs_auto_reset_when_done(self):
+        # Arrange
+        self._vec_env.close()
+        self._vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=2, n_steps=3)
+        self._vec_env.reset()
+
+        # Act
+        all_dones = [self._vec_env.step(np.zeros(2, dtype=int))[2] for _ in range(4)]
+
+        # Assert
+        self.assertListEqual([False, False, True, False], [d[0] for d in all_dones])
+
+    def test_step_returns_sub_env_infos_with_final_observations(self):
+        # Arrange
+        self._vec_env.close()
+        self._vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=2, n_steps=3)
+        self._vec_env.reset()
+        n = self._vec_env.total_population
+
+        # Act
+        all_infos = [self._vec_env.step(np.zeros(2, dtype=int))[4] for _ in range(3)]
+
+        # Assert
+        self.assertIn("turn_score", all_infos[0][0])
+        self.assertNotIn("obs", all_infos[0][0])
+        self.assertNotIn("final_observation", all_infos[1][0])
+        summary, graph, nodes = all_infos[2][1]["final_observation"]
+        self.assertEqual((7,), summary.shape)
+        self.assertIsNone(graph)
+        self.assertEqual((n, 6), nodes.shape)
+
+    def test_worker_exception_is_raised_with_its_traceback(self):
+        # Arrange
+        self._vec_env.reset()
+
+        # Act
+        with self.assertRaisesRegex(RuntimeError, "KeyError: 99"):
+            self._vec_env.step(np.full(3, 99))
+
+        # Assert
+        self.assertListEqual([], self._vec_env._shms)
+        for process in self._vec_env._processes:
+            self.assertFalse(process.is_alive())
+
+    def test_seeded_runs_are_reproducible(self):
+        # Arrange
+        self._vec_env.close()
+        rewards = []
+        for _ in range(2):
+            vec_env = self._sut(
+                GymEnvFixedSeedFixture, n_envs=3, n_workers=2, n_steps=5, seed=123
+            )
+            vec_env.reset()
+
+            # Act
+            rewards.append(
+                [vec_env.step(np.zeros(3, dtype=int))[1].copy() for _ in range(8)]
+            )
+            vec_env.close()
+
+        # Assert
+        np.testing.assert_array_equal(rewards[0], rewards[1])
+
+    def test_build_from_registered_id_with_graph(self):
+        # Arrange
+        self._vec_env.close()
+        self._vec_env = self._sut(
+            "SDSTests-GymEnvFixedSeedFixture-v0",
+            n_envs=2,
+            include_graph=True,
+            start_method="spawn",
+        )
+        n = self._vec_env.total_population
+
+        # Act
+        obs = self._vec_env.reset()
+
+        # Assert
+        self.assertEqual((2, n, n), obs[1].shape)
+
+    def test_step_with_wrong_batch_size_raises(self):
+        # Arrange
+        self._vec_env.reset()
+
+        # Act/Assert
+        with self.assertRaises(ValueError):
+            self._vec_env.step(np.array([0, 0]))
+
+    def test_close_releases_shared_memory(self):
+        # Act
+        self._vec_env.close()
+
+        # Assert
+        self.assertListEqual([], self._vec_env._shms)
+        for process in self._vec_env._processes:
+            self.assertFalse(process.is_alive())
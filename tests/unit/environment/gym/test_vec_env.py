@@ -0,0 +1,193 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.environment.gym.gym_env import GymEnv
+from social_distancing_sim.environment.gym.vec_env import VecEnv
+from tests.common.env_fixtures import register_test_envs
+from tests.common.env_fixtures.gym_env_fixed_seed_fixture import GymEnvFixedSeedFixture
+
+
+class TestVecEnv(unittest.TestCase):
+    _sut = VecEnv
+
+    @classmethod
+    def setUpClass(cls):
+        register_test_envs()
+
+    def test_build_from_template_class(self):
+        # Act
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=3)
+
+        # Assert
+        self.assertEqual(3, len(vec_env.envs))
+        for env in vec_env.envs:
+            self.assertIsInstance(env, GymEnvFixedSeedFixture)
+
+    def test_build_from_registered_id_uses_spec_episode_length(self):
+        # Act
+        vec_env = self._sut("SDSTests-GymEnvFixedSeedFixture-v0", n_envs=2)
+
+        # Assert
+        self.assertIsInstance(vec_env.envs[0], GymEnv)
+        self.assertEqual(1000, vec_env.n_steps)
+
+    def test_sub_envs_share_graph_structure_with_fixed_graph_seed(self):
+        # Act
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=3)
+
+        # Assert
+        edges = [list(e.sds_env.observation_space.graph.g_.edges) for e in vec_env.envs]
+        self.assertListEqual(edges[0], edges[1])
+        self.assertListEqual(edges[0], edges[2])
+        self.assertIsNot(
+            vec_env.envs[0].sds_env.observation_space.graph,
+            vec_env.envs[1].sds_env.observation_space.graph,
+        )
+
+    def test_reset_returns_stacked_observations(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=4)
+        n = vec_env.total_population
+
+        # Act
+        obs = vec_env.reset()
+
+        # Assert
+        self.assertEqual(3, len(obs))
+        self.assertEqual((4, 7), obs[0].shape)
+        self.assertEqual((4, n, n), obs[1].shape)
+        self.assertEqual((4, n, 6), obs[2].shape)
+
+    def test_step_with_batch_of_single_actions(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=3)
+        vec_env.reset()
+
+        # Act
+        obs, rewards, dones, _, infos = vec_env.step(np.array([0, 1, 4]))
+
+        # Assert
+        self.assertEqual((3, 7), obs[0].shape)
+        self.assertEqual((3,), rewards.shape)
+        self.assertEqual((3,), dones.shape)
+        self.assertEqual(3, len(infos))
+        for k, env in enumerate(vec_env.envs):
+            self.assertEqual(1, env.sds_env._step)
+            self.assertEqual(
+                len(env.sds_env.observation_space.current_alive_nodes), obs[0][k, 0]
+            )
+
+    def test_step_with_actions_and_targets(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=2)
+        vec_env.reset()
+
+        # Act
+        _, _, _, _, infos = vec_env.step([([1, 1], [0, 1]), ([], [])])
+
+        # Assert
+        self.assertDictEqual({0: 1, 1: 1}, infos[0]["completed_actions"])
+        self.assertDictEqual({}, infos[1]["completed_actions"])
+
+    def test_step_with_wrong_batch_size_raises(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=2)
+        vec_env.reset()
+
+        # Act/Assert
+        with self.assertRaises(ValueError):
+            vec_env.step(np.array([0, 0, 0]))
+
+    def test_sub_envs_auto_reset_when_done(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=2, n_steps=3)
+        vec_env.reset()
+
+        # Act
+        all_dones = [vec_env.step(np.zeros(2, dtype=int))[2] for _ in range(4)]
+        _, _, _, _, infos = vec_env.step(np.zeros(2, dtype=int))
+
+        # Assert
+        self.assertListEqual([False, False, True, False], [d[0] for d in all_dones])
+        for env in vec_env.envs:
+            self.assertEqual(2, env.sds_env._step)
+        self.assertNotIn("final_observation", infos[0])
+
+    def test_without_copy_returns_same_buffers(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=2, copy=False)
+
+        # Act
+        obs_1 = vec_env.reset()
+        obs_2, _, _, _, _ = vec_env.step(np.zeros(2, dtype=int))
+
+        # Assert
+        self.assertIs(obs_1[0], obs_2[0])
+
+    def test_without_graph_returns_none(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=2, include_graph=False)
+
+        # Act
+        obs = vec_env.reset()
+
+        # Assert
+        self.assertIsNone(obs[1])
+        self.assertEqual((2, vec_env.total_population, 6), obs[2].shape)
+
+    def test_seeded_runs_are_reproducible(self):
+        # Arrange
+        vec_env_1 = self._sut(GymEnvFixedSeedFixture, n_envs=2, n_steps=5, seed=123)
+        vec_env_2 = self._sut(GymEnvFixedSeedFixture, n_envs=2, n_steps=5, seed=123)
+        vec_env_1.reset()
+        vec_env_2.reset()
+
+        # Act
+        rewards_1 = [vec_env_1.step(np.zeros(2, dtype=int))[1] for _ in range(8)]
+        rewards_2 = [vec_env_2.step(np.zeros(2, dtype=int))[1] for _ in range(8)]
+
+        # Assert
+        np.testing.assert_array_equal(rewards_1, rewards_2)
+        self.assertNotEqual(
+            vec_env_1.envs[0].sds_env.seed, vec_env_1.envs[1].sds_env.seed
+        )
+
+    def test_auto_reset_starts_from_initial_population(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=3, n_steps=6, seed=1)
+        vec_env.reset()
+        initial = [
+            len(e._initial_env.observation_space.graph.current_infected_nodes)
+            for e in vec_env.envs
+        ]
+
+        # Act
+        for _ in range(6):
+            obs, _, dones, _, _ = vec_env.step(np.zeros(3, dtype=int))
+
+        # Assert
+        self.assertTrue(dones.all())
+        for k, env in enumerate(vec_env.envs):
+            graph = env.sds_env.observation_space.graph
+            self.assertEqual(0, env.sds_env._step)
+            self.assertEqual(initial[k], len(graph.current_infected_nodes))
+            self.assertEqual(0, len(graph.current_dead_nodes))
+            self.assertEqual(len(graph.current_alive_nodes), obs[0][k, 0])
+
+    def test_sub_envs_have_independent_random_streams(self):
+        # Arrange
+        vec_env = self._sut(GymEnvFixedSeedFixture, n_envs=3, seed=1)
+
+        # Act
+        vec_env.reset()
+
+        # Assert
+        for name, stream in [
+            ("graph", lambda e: e.sds_env.observation_space.graph._random_state),
+            ("disease", lambda e: e.sds_env.disease.state),
+            ("action_space", lambda e: e.sds_env.action_space.state),
+        ]:
+            states = [stream(e).get_state()[1] for e in vec_env.envs]
+            self.assertFalse(np.array_equal(states[0], states[1]), name)
+            self.assertFalse(np.array_equal(states[1], states[2]), name)
@@ -0,0 +1,36 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.environment.gym.wrappers.flatten_obs_wrapper import (
+    FlattenObsWrapper,
+)
+from social_distancing_sim.environment.gym.wrappers.limit_obs_wrapper import (
+    LimitObsWrapper,
+)
+from tests.common.env_fixtures.gym_env_fixed_seed_fixture import GymEnvFixedSeedFixture
+
+
+class TestFlattenObsWrapper(unittest.TestCase):
+    _sut = FlattenObsWrapper
+
+    def setUp(self):
+        self._env = self._sut(LimitObsWrapper(GymEnvFixedSeedFixture(), output=2))
+        self._env.unwrapped.reset()
+
+    def test_observation_space_is_set(self):
+        # Arrange
+        n = self._env.unwrapped.sds_env.total_population
+
+        # Assert
+        self.assertEqual((n * 6,), self._env.observation_space.shape)
+        self.assertEqual(np.int8, self._env.observation_space.dtype)
+
+    def test_observation_is_view_of_unwrapped_state(self):
+        # Act
+        obs, _, _, _, _ = self._env.step(([], []))
+
+        # Assert
+        self.assertEqual(np.int8, obs.dtype)
+        self.assertTrue(np.shares_memory(obs, self._env.unwrapped.state[2]))
+        self.assertTrue(self._env.observation_space.contains(obs))
@@ -0,0 +1,37 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.environment.gym.wrappers.limit_obs_wrapper import (
+    LimitObsWrapper,
+)
+from tests.common.env_fixtures.gym_env_fixed_seed_fixture import GymEnvFixedSeedFixture
+
+
+class TestLimitObsWrapper(unittest.TestCase):
+    _sut = LimitObsWrapper
+
+    def test_observation_keeps_compact_dtype(self):
+        # Arrange
+        env = self._sut(GymEnvFixedSeedFixture(), output=2)
+        env.unwrapped.reset()
+
+        # Act
+        obs, _, _, _, _ = env.step(([], []))
+
+        # Assert
+        self.assertEqual(np.int8, obs.dtype)
+        self.assertEqual(env.observation_space.shape, obs.shape)
+        self.assertTrue(env.observation_space.contains(obs))
+
+    def test_summary_output(self):
+        # Arrange
+        env = self._sut(GymEnvFixedSeedFixture(), output=0)
+        env.unwrapped.reset()
+
+        # Act
+        obs, _, _, _, _ = env.step(([], []))
+
+        # Assert
+        self.assertEqual(np.int16, obs.dtype)
+        self.assertTrue(env.observation_space.contains(obs))
@@ -0,0 +1,108 @@
+import unittest
+
+import networkx as nx
+import numpy as np
+
+from social_distancing_sim.environment.centrality import CentralityIndex
+
+
+class TestCentralityIndex(unittest.TestCase):
+    _sut = CentralityIndex
+
+    def setUp(self):
+        self._g = nx.random_partition_graph([20, 20, 20], 0.3, 0.02, seed=1)
+
+    def _assert_matches_networkx(self, index: CentralityIndex, g: nx.Graph) -> None:
+        nodes = sorted(g.nodes)
+        np.testing.assert_array_equal(
+            np.array([d for _, d in sorted(g.degree)]), index.degree
+        )
+        expected_bc = nx.betweenness_centrality(g, normalized=True)
+        np.testing.assert_allclose(
+            [expected_bc[n] for n in nodes], index.betweenness, atol=1e-12
+        )
+        expected_ec = nx.eigenvector_centrality(g, max_iter=1000, tol=1e-9)
+        np.testing.assert_allclose(
+            [expected_ec[n] for n in nodes], index.eigenvector, atol=1e-4
+        )
+
+    def test_exact_measures_match_networkx(self):
+        # Arrange
+        index = self._sut.from_graph(
+            self._g, betweenness_samples=60, max_iter=1000, tol=1e-9
+        )
+
+        # Assert
+        self._assert_matches_networkx(index, self._g)
+
+    def test_measures_match_networkx_after_edges_removed_and_added(self):
+        # Arrange
+        index = self._sut.from_graph(
+            self._g,
+            betweenness_samples=60,
+            refresh_fraction=0,
+            max_iter=1000,
+            tol=1e-9,
+        )
+        _ = index.betweenness, index.eigenvector
+        removed = list(self._g.edges(5)) + list(self._g.edges(30))
+        added = [(0, 59), (1, 58)]
+
+        # Act
+        index.remove_edges(removed)
+        index.add_edges(added)
+        self._g.remove_edges_from(removed)
+        self._g.add_edges_from(added)
+
+        # Assert
+        self.assertEqual(self._g.number_of_edges(), index.n_edges)
+        self._assert_matches_networkx(index, self._g)
+
+    def test_removing_missing_or_inactive_edges_is_ignored(self):
+        # Arrange
+        index = self._sut(n_nodes=3, edges=np.array([[0, 1]]))
+
+        # Act
+        index.remove_edges([(1, 0), (0, 1), (1, 2)])
+        index.add_edges([(0, 1), (1, 0)])
+
+        # Assert
+        np.testing.assert_array_equal([1, 1, 0], index.degree)
+        self.assertEqual(1, index.n_edges)
+
+    def test_approximate_measures_only_refreshed_when_enough_edges_change(self):
+        # Arrange
+        index = self._sut.from_graph(self._g, refresh_fraction=0.5)
+        before = index.eigenvector
+
+        # Act
+        index.remove_edges(list(self._g.edges(0)))
+        cached = index.eigenvector
+        index.remove_edges(list(self._g.edges)[0 : self._g.number_of_edges() // 2])
+        refreshed = index.eigenvector
+
+        # Assert
+        self.assertIs(before, cached)
+        self.assertIsNot(before, refreshed)
+
+    def test_top_k_with_mask(self):
+        # Arrange
+        index = self._sut(
+            n_nodes=5, edges=np.array([[0, 1], [0, 2], [0, 3], [1, 2], [3, 4]])
+        )
+        mask = np.array([False, True, True, True, True])
+
+        # Act
+        top = index.top_k(2, mask=mask)
+        top_all = index.top_k(10)
+
+        # Assert
+        np.testing.assert_array_equal([1, 2], top)
+        np.testing.assert_array_equal([0, 1, 2, 3, 4], top_all)
+
+    def test_unknown_measure_raises_error(self):
+        # Arrange
+        index = self._sut.from_graph(self._g)
+
+        # Act/Assert
+        self.assertRaises(ValueError, lambda: index.scores("closeness"))
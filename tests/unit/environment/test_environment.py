@@ -4,6 +4,9 @@ from unittest import mock
 from social_distancing_sim.environment.action_space import ActionSpace
 from social_distancing_sim.environment.environment import Environment
 from social_distancing_sim.environment.observation_space import ObservationSpace
+from tests.common.env_fixtures.env_template_fixed_seed_fixture import (
+    EnvTemplateFixedSeedFixture,
+)
 
 
 class TestEnvironment(unittest.TestCase):
@@ -59,3 +62,62 @@ class TestEnvironment(unittest.TestCase):
         self.assertGreater(len([v for v in actions_dict.values() if v == 4]), 2)
         self.assertNotIn(0, actions_dict.keys())
         self.assertNotIn(-1, actions_dict.keys())
+
+
+class TestEnvironmentReseed(unittest.TestCase):
+    def _run(self, seed: int, regenerate_graph: bool = False, n_steps: int = 20):
+        env = EnvTemplateFixedSeedFixture.build()
+        env.reseed(seed, regenerate_graph=regenerate_graph)
+        env._total_steps = n_steps
+        for _ in range(n_steps):
+            env.step(actions=[])
+
+        return env
+
+    def test_same_seed_is_reproducible(self):
+        # Act
+        env_1 = self._run(123)
+        env_2 = self._run(123)
+
+        # Assert
+        self.assertListEqual(
+            env_1.history["Total infections"], env_2.history["Total infections"]
+        )
+
+    def test_component_seeds_are_derived_and_independent(self):
+        # Arrange
+        env = EnvTemplateFixedSeedFixture.build()
+
+        # Act
+        env.reseed(123)
+
+        # Assert
+        seeds = [
+            env.seed,
+            env.disease.seed,
+            env.action_space.seed,
+            env.observation_space.seed,
+        ]
+        self.assertEqual(4, len(set(seeds)))
+        self.assertNotEqual(444, env.seed)
+
+    def test_graph_kept_unless_regenerated(self):
+        # Arrange
+        edges = list(
+            EnvTemplateFixedSeedFixture.build().observation_space.graph.g_.edges
+        )
+
+        # Act
+        kept = self._run(123, n_steps=0)
+        regenerated_1 = self._run(123, regenerate_graph=True, n_steps=0)
+        regenerated_2 = self._run(123, regenerate_graph=True, n_steps=0)
+
+        # Assert
+        self.assertListEqual(edges, list(kept.observation_space.graph.g_.edges))
+        self.assertNotEqual(edges, list(regenerated_1.observation_space.graph.g_.edges))
+        self.assertListEqual(
+            list(regenerated_1.observation_space.graph.g_.edges),
+            list(regenerated_2.observation_space.graph.g_.edges),
+        )
+        for _, nv in regenerated_1.observation_space.graph.g_.nodes.data():
+            self.assertIn("status", nv)
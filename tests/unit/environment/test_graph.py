@@ -94,3 +94,21 @@ class TestGraph(unittest.TestCase):
         for edge in current_connections:
             self.assertIn(edge, list(g.g_.edges(0)))
         self.assertListEqual([], list(g.g_.nodes[0]["_edges"]))
+
+    def test_centrality_kept_in_sync_with_isolation_and_reconnection(self):
+        # Arrange
+        g = self._sut(community_n=3, community_size_mean=20, seed=1)
+        centrality = g.centrality
+
+        # Act
+        g.isolate_node(0, effectiveness=0.5)
+        g.isolate_node(1, effectiveness=1)
+        isolated_degree = centrality.degree.copy()
+        g.reconnect_node(1, effectiveness=1)
+
+        # Assert
+        self.assertEqual(0, isolated_degree[1])
+        np.testing.assert_array_equal(
+            [d for _, d in sorted(g.g_.degree)], centrality.degree
+        )
+        self.assertEqual(g.g_.number_of_edges(), centrality.n_edges)
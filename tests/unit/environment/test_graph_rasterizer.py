@@ -0,0 +1,102 @@
+import unittest
+
+import matplotlib
+from matplotlib.colors import to_rgb
+
+from social_distancing_sim.environment.environment_plotting import EnvironmentPlotting
+from social_distancing_sim.environment.graph import Graph
+from social_distancing_sim.environment.graph_rasterizer import GraphRasterizer
+from social_distancing_sim.environment.observation_space import ObservationSpace
+
+matplotlib.use("Agg")
+
+
+class TestGraphRasterizer(unittest.TestCase):
+    _sut = GraphRasterizer
+
+    def setUp(self):
+        self._obs = ObservationSpace(
+            graph=Graph(community_n=10, community_size_mean=10, seed=123),
+            test_rate=0.5,
+            seed=123,
+        )
+
+    def test_rasterize_returns_fixed_size_rgb_buffer(self):
+        # Arrange
+        rasterizer = self._sut(resolution=64)
+
+        # Act
+        image = rasterizer.rasterize(self._obs)
+
+        # Assert
+        self.assertEqual((64, 64, 3), image.shape)
+        self.assertGreaterEqual(image.min(), 0)
+        self.assertLessEqual(image.max(), 1)
+
+    def test_rasterize_observed_graph(self):
+        # Act
+        image = self._sut(resolution=64).rasterize(self._obs, god_mode=False)
+
+        # Assert
+        self.assertEqual((64, 64, 3), image.shape)
+
+    def test_layout_is_cached_on_graph(self):
+        # Arrange
+        rasterizer = self._sut(resolution=32)
+
+        # Act
+        rasterizer.rasterize(self._obs)
+        pos = self._obs.graph.g_pos_
+        rasterizer.rasterize(self._obs)
+
+        # Assert
+        self.assertIs(pos, self._obs.graph.g_pos_)
+        self.assertEqual(self._obs.graph.total_population, len(pos))
+
+    def test_edges_are_shaded(self):
+        # Arrange
+        no_edges = Graph(community_n=2, community_size_mean=5, seed=1)
+        no_edges.g_.remove_edges_from(list(no_edges.g_.edges))
+
+        # Act
+        image = self._sut(resolution=32, node_radius=0).rasterize(self._obs)
+        image_no_edges = self._sut(resolution=32, node_radius=0).rasterize(
+            ObservationSpace(graph=no_edges)
+        )
+
+        # Assert
+        self.assertLess(image.min(), 1)
+        # Only nodes are drawn, everything else is background
+        self.assertGreaterEqual(
+            (image_no_edges == 1).all(axis=2).sum(),
+            32 * 32 - no_edges.total_population,
+        )
+
+    def test_dead_nodes_drawn_on_top(self):
+        # Arrange
+        self._obs.graph.g_.nodes[0]["alive"] = False
+        rasterizer = self._sut(resolution=128, node_radius=0)
+        coords, index = rasterizer._pixel_coords(self._obs.graph)
+
+        # Act
+        image = rasterizer.rasterize(self._obs)
+
+        # Assert
+        x, y = coords[index[0]]
+        self.assertListEqual(list(to_rgb("k")), list(image[y, x]))
+
+    def test_environment_plotting_raster_mode(self):
+        # Arrange
+        plotting = EnvironmentPlotting(render_mode="raster", raster_resolution=64)
+        plotting._prepare_figure(test_rate=self._obs.test_rate)
+
+        # Act
+        plotting.plot_graphs(self._obs, title="test")
+
+        # Assert
+        self.assertEqual(1, len(plotting._graph_ax[0].get_images()))
+        self.assertEqual(1, len(plotting._graph_ax[1].get_images()))
+
+    def test_environment_plotting_invalid_mode_raises(self):
+        with self.assertRaises(ValueError):
+            EnvironmentPlotting(render_mode="vector")
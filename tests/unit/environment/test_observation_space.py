@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from social_distancing_sim.environment.observation_space import ObservationSpace
 from social_distancing_sim.environment.status import Status
@@ -11,7 +11,9 @@ class TestObservationSpace(unittest.TestCase):
 
     def setUp(self):
         # ObservationSpace sets status of nodes in graph to Status() on init, turn this off for these tests.
-        self._sut._attach_status_to_graph = lambda x: x
+        patcher = patch.object(self._sut, "_attach_status_to_graph", lambda x: x)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_init_with_defaults(self):
         obs = self._sut(graph=self._mock_graph)
@@ -0,0 +1,36 @@
+import unittest
+
+from social_distancing_sim.environment.seeding import derive_named_seeds, derive_seeds
+
+
+class TestSeeding(unittest.TestCase):
+    def test_derive_seeds_is_deterministic_given_seed(self):
+        # Act
+        seeds_1 = derive_seeds(123, 5)
+        seeds_2 = derive_seeds(123, 5)
+
+        # Assert
+        self.assertListEqual(seeds_1, seeds_2)
+        self.assertEqual(5, len(set(seeds_1)))
+        self.assertTrue(all(isinstance(s, int) for s in seeds_1))
+
+    def test_derive_seeds_is_prefix_stable(self):
+        # Act
+        seeds_short = derive_seeds(123, 3)
+        seeds_long = derive_seeds(123, 10)
+
+        # Assert
+        self.assertListEqual(seeds_short, seeds_long[0:3])
+
+    def test_derive_seeds_without_seed_uses_fresh_entropy(self):
+        self.assertNotEqual(derive_seeds(None, 2), derive_seeds(None, 2))
+
+    def test_derive_named_seeds_assigns_by_position(self):
+        # Act
+        seeds = derive_named_seeds(123, ("a", "b"))
+
+        # Assert
+        self.assertDictEqual(
+            {"a": derive_seeds(123, 2)[0], "b": derive_seeds(123, 2)[1]}, seeds
+        )
+        self.assertEqual(seeds["a"], derive_named_seeds(123, ("a", "b", "c"))["a"])
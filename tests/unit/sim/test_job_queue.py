@@ -0,0 +1,199 @@
+import os
+import tempfile
+import time
+import unittest
+
+import gym
+
+import social_distancing_sim.environment as env
+from social_distancing_sim.agent.basic_agents.dummy_agent import DummyAgent
+from social_distancing_sim.sim.job_queue import JobQueue
+from social_distancing_sim.sim.multi_sim import MultiSim
+from social_distancing_sim.sim.sim import Sim
+from social_distancing_sim.sim.sweep import environment_spec
+from tests.common.env_fixtures import register_test_envs
+
+
+class TestJobQueue(unittest.TestCase):
+    _sut = JobQueue
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        register_test_envs()
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._tmp_dir.name, "queue.db")
+        self._ms = MultiSim(
+            Sim(
+                env_spec=gym.make("SDSTests-GymEnvRandomSeedFixture-v0").spec,
+                agent=DummyAgent(),
+                n_steps=5,
+            ),
+            n_reps=4,
+            chunk_size=2,
+            seed=123,
+        )
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_submit_adds_job_per_task_once(self):
+        # Arrange
+        queue = self._sut(path=self._path)
+
+        # Act
+        n_first = queue.submit(self._ms)
+        n_second = queue.submit(self._ms)
+
+        # Assert
+        self.assertEqual(2, n_first)
+        self.assertEqual(0, n_second)
+        self.assertDictEqual({"pending": 2}, queue.counts(self._ms))
+
+    def test_multi_sims_of_differently_configured_envs_get_own_jobs(self):
+        # Arrange
+        queue = self._sut(path=self._path)
+
+        def multi_sim(virulence: float) -> MultiSim:
+            environment = env.Environment(
+                name="queue_test",
+                disease=env.Disease(virulence=virulence),
+                observation_space=env.ObservationSpace(
+                    graph=env.Graph(community_n=3, community_size_mean=5, seed=222)
+                ),
+            )
+            return MultiSim(
+                Sim(env_spec=environment_spec(environment), agent=DummyAgent()),
+                n_reps=4,
+                chunk_size=2,
+                seed=123,
+            )
+
+        # Act
+        n_added = [queue.submit(multi_sim(0.01)), queue.submit(multi_sim(0.5))]
+
+        # Assert
+        self.assertListEqual([2, 2], n_added)
+        self.assertDictEqual({"pending": 2}, queue.counts(multi_sim(0.5)))
+
+    def test_submit_without_seed_raises(self):
+        # Arrange
+        queue = self._sut(path=self._path)
+        self._ms.seed = None
+
+        # Act/Assert
+        self.assertRaises(ValueError, queue.submit, self._ms)
+
+    def test_results_in_rep_order_once_all_jobs_done(self):
+        # Arrange
+        queue = self._sut(path=self._path)
+        queue.submit(self._ms)
+        first = queue.claim("a")
+        second = queue.claim("b")
+
+        # Act
+        queue.complete(second, "b", [{"rep": 2}, {"rep": 3}])
+        partial = queue.results(self._ms)
+        queue.complete(first, "a", [{"rep": 0}, {"rep": 1}])
+
+        # Assert
+        self.assertIsNone(partial)
+        self.assertIsNone(queue.claim("c"))
+        self.assertListEqual(self._ms._rep_seeds()[0:2], first.seeds)
+        self.assertListEqual([{"rep": i} for i in range(4)], queue.results(self._ms))
+
+    def test_expired_lease_is_claimed_by_another_worker(self):
+        # Arrange
+        queue = self._sut(path=self._path, lease_seconds=0.01)
+        self._ms.chunk_size = 4
+        queue.submit(self._ms)
+        job = queue.claim("a")
+        time.sleep(0.05)
+
+        # Act
+        reclaimed = queue.claim("b")
+
+        # Assert
+        self.assertEqual(job.job_id, reclaimed.job_id)
+        self.assertFalse(queue.extend_lease(job, "a"))
+        self.assertTrue(queue.extend_lease(reclaimed, "b"))
+
+    def test_failed_jobs_are_retried_up_to_max_attempts(self):
+        # Arrange
+        queue = self._sut(path=self._path, max_attempts=2)
+        self._ms.chunk_size = 4
+        queue.submit(self._ms)
+
+        # Act
+        queue.fail(queue.claim("a"), "a", "error")
+        retried = queue.counts(self._ms)
+        queue.fail(queue.claim("a"), "a", "error")
+
+        # Assert
+        self.assertDictEqual({"pending": 1}, retried)
+        self.assertDictEqual({"failed": 1}, queue.counts(self._ms))
+        self.assertRaises(RuntimeError, queue.wait, [self._ms], poll_interval=0)
+
+    def test_workers_use_stored_max_attempts(self):
+        # Arrange
+        self._sut(path=self._path, max_attempts=1).submit(self._ms)
+        worker_queue = self._sut(path=self._path)
+
+        # Act
+        worker_queue.fail(worker_queue.claim("a"), "a", "error")
+
+        # Assert
+        self.assertEqual(1, worker_queue.counts(self._ms)["failed"])
+
+    def test_job_whose_lease_keeps_expiring_fails_after_max_attempts(self):
+        # Arrange
+        queue = self._sut(path=self._path, lease_seconds=0.01, max_attempts=2)
+        self._ms.chunk_size = 4
+        queue.submit(self._ms)
+
+        # Act
+        claims = []
+        for worker in ["a", "b", "c"]:
+            claims.append(queue.claim(worker))
+            time.sleep(0.05)
+
+        # Assert
+        self.assertIsNotNone(claims[0])
+        self.assertIsNotNone(claims[1])
+        self.assertIsNone(claims[2])
+        self.assertDictEqual({"failed": 1}, queue.counts(self._ms))
+
+    def test_stale_worker_cant_fail_job_claimed_by_another(self):
+        # Arrange
+        queue = self._sut(path=self._path, lease_seconds=0.01)
+        self._ms.chunk_size = 4
+        queue.submit(self._ms)
+        job = queue.claim("a")
+        time.sleep(0.05)
+        queue.claim("b")
+
+        # Act
+        queue.fail(job, "a", "error")
+
+        # Assert
+        self.assertDictEqual({"leased": 1}, queue.counts(self._ms))
+        self.assertTrue(queue.extend_lease(job, "b"))
+
+    def test_stale_worker_cant_complete_job_claimed_by_another(self):
+        # Arrange
+        queue = self._sut(path=self._path, lease_seconds=0.01)
+        self._ms.chunk_size = 4
+        queue.submit(self._ms)
+        job = queue.claim("a")
+        time.sleep(0.05)
+        queue.claim("b")
+
+        # Act
+        stale = queue.complete(job, "a", [{"rep": i} for i in range(4)])
+        current = queue.complete(job, "b", [{"rep": -i} for i in range(4)])
+
+        # Assert
+        self.assertFalse(stale)
+        self.assertTrue(current)
+        self.assertListEqual([{"rep": -i} for i in range(4)], queue.results(self._ms))
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.environment.history import History
+from social_distancing_sim.sim.reducers import (
+    FinalValues,
+    Quantiles,
+    StepStatistics,
+    TimeSeries,
+)
+
+
+class TestReducers(unittest.TestCase):
+    def setUp(self):
+        self._history = History(
+            {"Total deaths": [0, 1, 3, 6], "Overall score": [1.0, 2.0, 3.0, 4.0]}
+        )
+
+    def test_final_values_all_fields(self):
+        # Act
+        reduced = FinalValues().reduce(self._history)
+
+        # Assert
+        self.assertDictEqual({"Total deaths": 6, "Overall score": 4.0}, reduced)
+
+    def test_final_values_selected_fields(self):
+        # Act
+        reduced = FinalValues(fields=["Total deaths"]).reduce(self._history)
+
+        # Assert
+        self.assertDictEqual({"Total deaths": 6}, reduced)
+
+    def test_time_series(self):
+        # Act
+        reduced = TimeSeries(fields=["Total deaths"]).reduce(self._history)
+
+        # Assert
+        self.assertListEqual(["Total deaths"], list(reduced.keys()))
+        self.assertEqual(np.float32, reduced["Total deaths"].dtype)
+        np.testing.assert_array_equal([0, 1, 3, 6], reduced["Total deaths"])
+
+    def test_quantiles(self):
+        # Act
+        reduced = Quantiles(fields=["Overall score"], q=(0, 0.5, 1)).reduce(
+            self._history
+        )
+
+        # Assert
+        self.assertDictEqual(
+            {
+                "Overall score__q0": 1.0,
+                "Overall score__q0.5": 2.5,
+                "Overall score__q1": 4.0,
+            },
+            reduced,
+        )
+
+    def test_step_statistics_merge(self):
+        # Arrange
+        reducer = StepStatistics(fields=["Total deaths"])
+        other = History({"Total deaths": [0, 3, 5, 8]})
+
+        # Act
+        merged = reducer.merge(
+            reducer.merge(None, reducer.reduce(self._history)), reducer.reduce(other)
+        )
+
+        # Assert
+        self.assertTrue(reducer.streamed)
+        self.assertEqual(np.float32, reducer.reduce(other)["Total deaths"].dtype)
+        self.assertListEqual(["Total deaths"], list(merged.keys()))
+        np.testing.assert_allclose([0, 2, 4, 7], merged["Total deaths"].mean)
+        np.testing.assert_allclose([0, 2, 4, 7], merged["Total deaths"].quantile(0.5))
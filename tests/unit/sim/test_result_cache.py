@@ -0,0 +1,120 @@
+import unittest
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+
+from social_distancing_sim.sim.result_cache import (
+    ResultCache,
+    config_hash,
+    init_params,
+)
+
+
+@dataclass
+class _Params:
+    a: int
+    weights: np.ndarray
+
+
+class _Base:
+    def __init__(self, seed: int = 0, start: int = 0) -> None:
+        self.seed = seed
+        self.start = start
+        self.last = None
+
+
+class _Child(_Base):
+    def __init__(self, *args, children=(), **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.children = children
+
+
+class TestConfigHash(unittest.TestCase):
+    def test_hash_ignores_key_order(self):
+        self.assertEqual(config_hash({"a": 1, "b": 2}), config_hash({"b": 2, "a": 1}))
+
+    def test_hash_handles_numpy_values(self):
+        self.assertEqual(config_hash({"a": 1}), config_hash({"a": np.int64(1)}))
+
+    def test_hash_differs_with_values(self):
+        self.assertNotEqual(config_hash({"a": 1}), config_hash({"a": 2}))
+
+
+class TestInitParams(unittest.TestCase):
+    def test_dataclasses_described_by_init_fields(self):
+        # Act
+        params = init_params(_Params(a=1, weights=np.ones(2)))
+
+        # Assert
+        self.assertEqual(f"{__name__}._Params", params["type"])
+        self.assertEqual(1, params["a"])
+        self.assertListEqual([2], params["weights"]["shape"])
+        self.assertNotEqual(
+            params["weights"]["sha1"],
+            init_params(_Params(a=1, weights=np.zeros(2)))["weights"]["sha1"],
+        )
+
+    def test_objects_described_by_init_params_of_mro(self):
+        # Arrange
+        obj = _Child(start=3, children=[_Child(start=4)], seed=1)
+        obj.last = 10
+
+        # Act
+        params = init_params(obj)
+
+        # Assert
+        self.assertDictEqual(
+            {
+                "type": f"{__name__}._Child",
+                "children": [
+                    {"type": f"{__name__}._Child", "children": [], "start": 4}
+                ],
+                "start": 3,
+            },
+            params,
+        )
+
+    def test_partials_and_classes_described_by_name(self):
+        # Act
+        params = init_params(partial(_Params, a=1))
+
+        # Assert
+        self.assertDictEqual(
+            {"func": f"{__name__}._Params", "args": [], "keywords": {"a": 1}}, params
+        )
+
+
+class TestResultCache(unittest.TestCase):
+    _sut = ResultCache
+
+    def setUp(self):
+        self._cache = self._sut(path=":memory:")
+
+    def tearDown(self):
+        self._cache.close()
+
+    def test_get_returns_only_stored_requested_seeds(self):
+        # Arrange
+        self._cache.put(
+            "abc", {"a": 1}, {1: {"final": {"x": 1}}, 2: {"final": {"x": 2}}}
+        )
+
+        # Act
+        cached = self._cache.get("abc", [2, 3])
+
+        # Assert
+        self.assertDictEqual({2: {"final": {"x": 2}}}, cached)
+        self.assertDictEqual({}, self._cache.get("def", [1, 2]))
+        self.assertEqual(2, len(self._cache))
+
+    def test_put_replaces_existing_points(self):
+        # Arrange
+        self._cache.put("abc", {"a": 1}, {1: {"final": {"x": 1}}})
+
+        # Act
+        self._cache.put("abc", {"a": 1}, {1: {"final": {"x": 2}}})
+
+        # Assert
+        self.assertDictEqual({1: {"final": {"x": 2}}}, self._cache.get("abc", [1]))
+        self.assertEqual(1, len(self._cache))
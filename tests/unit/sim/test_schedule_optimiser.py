@@ -0,0 +1,62 @@
+import unittest
+
+from social_distancing_sim.sim.schedule_optimiser import (
+    ScheduleOptimiser,
+    policy_schedule,
+)
+
+
+class TestPolicySchedule(unittest.TestCase):
+    _sut = staticmethod(policy_schedule)
+
+    def test_durations_are_added_to_starts(self):
+        # Act
+        kwargs = self._sut(
+            isolate_start=10,
+            isolate_duration=20,
+            reconnect_start=40,
+            reconnect_end=45,
+            actions_per_turn=3,
+        )
+
+        # Assert
+        self.assertDictEqual(
+            {
+                "start_step": {"isolate": 10, "reconnect": 40},
+                "end_step": {"isolate": 30, "reconnect": 45},
+                "actions_per_turn": 3,
+            },
+            kwargs,
+        )
+
+    def test_action_names_with_underscores(self):
+        # Act
+        kwargs = self._sut(provide_mask_duration=5, provide_mask_start=2)
+
+        # Assert
+        self.assertDictEqual({"provide_mask": 2}, kwargs["start_step"])
+        self.assertDictEqual({"provide_mask": 7}, kwargs["end_step"])
+
+    def test_unknown_parameter_raises(self):
+        with self.assertRaises(ValueError):
+            self._sut(isolate_begin=3)
+
+
+class TestScheduleOptimiser(unittest.TestCase):
+    _sut = ScheduleOptimiser
+
+    def test_candidates_sampled_from_bounds(self):
+        # Act
+        optimiser = self._sut(
+            factory=dict,
+            bounds={"isolate_start": (0, 10), "actions_per_turn": (1, 5)},
+            n_candidates=6,
+        )
+
+        # Assert
+        self.assertEqual(6, len(optimiser.design))
+        self.assertTrue(all(0 <= c["isolate_start"] <= 10 for c in optimiser.design))
+
+    def test_needs_bounds_or_design(self):
+        with self.assertRaises(ValueError):
+            self._sut(factory=dict)
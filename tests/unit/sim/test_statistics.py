@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.sim.statistics import RunningStats, StepStats
+
+
+class TestRunningStats(unittest.TestCase):
+    _sut = RunningStats
+
+    def setUp(self):
+        self._values = np.random.RandomState(0).normal(10, 3, size=50)
+
+    def test_matches_numpy(self):
+        # Arrange
+        stats = self._sut()
+
+        # Act
+        stats.update_many(self._values)
+
+        # Assert
+        self.assertEqual(50, stats.n)
+        self.assertAlmostEqual(np.mean(self._values), stats.mean)
+        self.assertAlmostEqual(np.var(self._values, ddof=1), stats.var)
+        self.assertAlmostEqual(
+            1.96 * np.std(self._values, ddof=1) / np.sqrt(50), stats.ci_half_width()
+        )
+
+    def test_merge_matches_single_stream(self):
+        # Arrange
+        stats_1, stats_2, expected = self._sut(), self._sut(), self._sut()
+        stats_1.update_many(self._values[0:20])
+        stats_2.update_many(self._values[20:])
+        expected.update_many(self._values)
+
+        # Act
+        merged = stats_1.merge(stats_2)
+
+        # Assert
+        self.assertEqual(expected.n, merged.n)
+        self.assertAlmostEqual(expected.mean, merged.mean)
+        self.assertAlmostEqual(expected.var, merged.var)
+
+    def test_nans_are_ignored(self):
+        # Arrange
+        stats = self._sut()
+
+        # Act
+        stats.update_many([1.0, np.nan, 3.0])
+
+        # Assert
+        self.assertEqual(2, stats.n)
+        self.assertAlmostEqual(2.0, stats.mean)
+
+    def test_ci_undefined_with_fewer_than_two_values(self):
+        # Arrange
+        stats = self._sut()
+
+        # Act
+        stats.update(1.0)
+
+        # Assert
+        self.assertTrue(np.isnan(stats.ci_half_width()))
+
+
+class TestStepStats(unittest.TestCase):
+    _sut = StepStats
+
+    def setUp(self):
+        self._series = np.random.RandomState(0).normal(10, 3, size=(500, 4))
+
+    def _merged(self, sketch_size: int) -> StepStats:
+        stats = self._sut.from_series(self._series[0], sketch_size=sketch_size)
+        for x in self._series[1:]:
+            stats = stats.merge(self._sut.from_series(x, sketch_size=sketch_size))
+
+        return stats
+
+    def test_mean_and_var_match_numpy(self):
+        # Act
+        stats = self._merged(sketch_size=50)
+
+        # Assert
+        np.testing.assert_array_equal(500, stats.n)
+        np.testing.assert_allclose(self._series.mean(axis=0), stats.mean)
+        np.testing.assert_allclose(self._series.var(axis=0, ddof=1), stats.var)
+
+    def test_quantiles_exact_within_sketch_size(self):
+        # Act
+        stats = self._merged(sketch_size=500)
+
+        # Assert
+        np.testing.assert_allclose(
+            np.quantile(self._series, [0.05, 0.5, 0.95], axis=0).T,
+            stats.quantile([0.05, 0.5, 0.95]),
+            atol=0.05,
+        )
+
+    def test_quantiles_approximate_with_constant_size_sketch(self):
+        # Act
+        stats = self._merged(sketch_size=50)
+
+        # Assert
+        self.assertEqual((4, 50), stats.values.shape)
+        self.assertEqual((4,), stats.quantile(0.5).shape)
+        np.testing.assert_allclose(
+            np.quantile(self._series, [0.05, 0.5, 0.95], axis=0).T,
+            stats.quantile([0.05, 0.5, 0.95]),
+            atol=0.3,
+        )
+
+    def test_merge_series_of_different_lengths_ignoring_nans(self):
+        # Act
+        stats = self._sut.from_series([1.0, 2.0, np.nan]).merge(
+            self._sut.from_series([3.0, 4.0, 5.0, 6.0])
+        )
+
+        # Assert
+        np.testing.assert_array_equal([2, 2, 1, 1], stats.n)
+        np.testing.assert_allclose([2.0, 3.0, 5.0, 6.0], stats.mean)
+        np.testing.assert_allclose([2.0, 2.0], stats.var[0:2])
+        self.assertTrue(np.isnan(stats.var[2]))
+        np.testing.assert_allclose([2.0, 3.0, 5.0, 6.0], stats.quantile(0.5))
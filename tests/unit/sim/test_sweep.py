@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from social_distancing_sim.sim.sweep import grid, latin_hypercube
+
+
+class TestDesigns(unittest.TestCase):
+    def test_grid_is_full_factorial(self):
+        # Act
+        design = grid(a=[1, 2], b=["x", "y", "z"])
+
+        # Assert
+        self.assertEqual(6, len(design))
+        self.assertDictEqual({"a": 1, "b": "x"}, design[0])
+        self.assertDictEqual({"a": 1, "b": "y"}, design[1])
+        self.assertDictEqual({"a": 2, "b": "z"}, design[-1])
+
+    def test_latin_hypercube_samples_each_stratum_once(self):
+        # Act
+        design = latin_hypercube(10, seed=1, a=(0.0, 1.0), b=(-5.0, 5.0))
+
+        # Assert
+        self.assertEqual(10, len(design))
+        for name, lo in [("a", 0.0), ("b", -5.0)]:
+            strata = np.floor(
+                [(c[name] - lo) / (1.0 if name == "a" else 10.0) * 10 for c in design]
+            )
+            self.assertListEqual(list(range(10)), sorted(strata.astype(int)))
+
+    def test_latin_hypercube_int_bounds_give_ints(self):
+        # Act
+        design = latin_hypercube(8, seed=1, n=(1, 4))
+
+        # Assert
+        values = [c["n"] for c in design]
+        self.assertTrue(all(isinstance(v, int) for v in values))
+        self.assertListEqual([1, 2, 3, 4], sorted(set(values)))
+
+    def test_latin_hypercube_is_deterministic_given_seed(self):
+        self.assertListEqual(
+            latin_hypercube(5, seed=1, a=(0.0, 1.0)),
+            latin_hypercube(5, seed=1, a=(0.0, 1.0)),
+        )
@@ -0,0 +1,116 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from social_distancing_sim.sim.tracking import JsonlTracker, MlflowTracker, NoOpTracker
+
+
+class TestJsonlTracker(unittest.TestCase):
+    _sut = JsonlTracker
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._tmp_dir.name, "logs", "runs.jsonl")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_runs_written_in_batches(self):
+        # Arrange
+        tracker = self._sut(batch_size=2, path=self._path)
+
+        # Act
+        tracker.log_run("exp", {"a": 1}, {"score": 1.0})
+        written_after_one = os.path.exists(self._path)
+        tracker.log_run("exp", {"a": 2}, {"score": np.float64(2.0)})
+
+        # Assert
+        self.assertFalse(written_after_one)
+        runs = pd.read_json(self._path, lines=True)
+        self.assertEqual(2, len(runs))
+        self.assertListEqual([{"score": 1.0}, {"score": 2.0}], list(runs["metrics"]))
+
+    def test_flush_writes_remaining_runs_and_appends(self):
+        # Arrange
+        tracker = self._sut(path=self._path)
+        tracker.log_run("exp", {"a": 1}, {"score": 1.0})
+        tracker.flush()
+        tracker.log_run("exp", {"a": NotImplemented}, {"score": 2.0})
+
+        # Act
+        tracker.flush()
+        tracker.flush()
+
+        # Assert
+        runs = pd.read_json(self._path, lines=True)
+        self.assertEqual(2, len(runs))
+        self.assertEqual("NotImplemented", runs["params"][1]["a"])
+
+    def test_numpy_scalars_and_types_serialised_as_for_config_hashes(self):
+        # Arrange
+        tracker = self._sut(batch_size=1, path=self._path)
+
+        # Act
+        tracker.log_run("exp", {"agent": JsonlTracker, "n": np.int64(3)}, {})
+
+        # Assert
+        runs = pd.read_json(self._path, lines=True)
+        self.assertDictEqual({"agent": "JsonlTracker", "n": 3}, runs["params"][0])
+
+    def test_pickled_tracker_has_empty_buffer(self):
+        # Arrange
+        tracker = self._sut(path=self._path)
+        tracker.log_run("exp", {}, {"score": 1.0})
+
+        # Act
+        unpickled = pickle.loads(pickle.dumps(tracker))
+
+        # Assert
+        self.assertListEqual([], unpickled._buffer)
+        self.assertEqual(1, len(tracker._buffer))
+
+
+class TestNoOpTracker(unittest.TestCase):
+    def test_discards_runs(self):
+        # Arrange
+        tracker = NoOpTracker(batch_size=1)
+
+        # Act
+        tracker.log_run("exp", {"a": 1}, {"score": 1.0})
+        tracker.flush()
+
+        # Assert
+        self.assertListEqual([], tracker._buffer)
+
+
+class TestMlflowTracker(unittest.TestCase):
+    _sut = MlflowTracker
+
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._uri = f"sqlite:///{os.path.join(self._tmp_dir.name, 'mlflow.db')}"
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_flush_logs_one_run_per_logged_run(self):
+        # Arrange
+        from mlflow.tracking import MlflowClient
+
+        tracker = self._sut(tracking_uri=self._uri)
+        tracker.log_run("exp", {"a": 1}, {"score": 1.0})
+        tracker.log_run("exp", {"a": 2}, {"score": 2.0})
+
+        # Act
+        tracker.flush()
+
+        # Assert
+        client = MlflowClient(tracking_uri=self._uri)
+        runs = client.search_runs([client.get_experiment_by_name("exp").experiment_id])
+        self.assertEqual(2, len(runs))
+        self.assertSetEqual({1.0, 2.0}, {r.data.metrics["score"] for r in runs})
+        self.assertSetEqual({"1", "2"}, {r.data.params["a"] for r in runs})